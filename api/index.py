@@ -6,5 +6,9 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app import create_app
+import db_engine
 
 app = create_app()
+
+# Open the first pooled connection during the cold start, not the first request
+db_engine.warm_up(app)
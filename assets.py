@@ -0,0 +1,182 @@
+"""
+Fingerprinted, precompressed static assets.
+
+scripts/build_assets.py copies every file under static/ to
+static/dist/<dir>/<name>.<content hash>.<ext>, writes .gz (and .br when the
+Brotli package is installed) siblings for text assets, and records the
+mapping in static/dist/manifest.json.
+
+At startup init_app() loads the manifest and makes url_for('static',
+filename='css/style.css') resolve to the fingerprinted copy. The manifest is
+trusted as built, so startup hashes nothing; static/dist is build output
+(not committed) and is regenerated by the deploy step. stale() lists sources
+changed since the last build, for `build_assets.py --check`.
+
+Fingerprinted files, and poster uploads that are already named by content
+hash, are served with a one-year immutable Cache-Control; the precompressed
+sibling is picked from Accept-Encoding.
+"""
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import shutil
+from functools import wraps
+
+from flask import request, send_from_directory
+
+try:
+    import brotli
+except ImportError:  # optional: only needed at build time for .br files
+    brotli = None
+
+DIST_DIR = 'dist'
+MANIFEST_NAME = 'manifest.json'
+
+# Poster variants, already content-addressed (see posters.py): never copied, but cached forever
+HASHED_PREFIXES = ('images/posters/',)
+# Variant manifests posters.py writes next to a poster (<poster>.json); not assets
+POSTER_MANIFEST_SUFFIXES = ('.png.json', '.jpg.json', '.jpeg.json', '.webp.json')
+
+COMPRESSIBLE = {'.css', '.js', '.svg', '.json', '.txt', '.html', '.map'}
+IMMUTABLE_MAX_AGE = 31536000
+
+# encoding -> file suffix, in order of preference
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+
+def _digest(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _source_files(static_folder):
+    for root, dirs, files in os.walk(static_folder):
+        rel_root = os.path.relpath(root, static_folder).replace(os.sep, '/')
+        if rel_root == DIST_DIR or rel_root.startswith(DIST_DIR + '/'):
+            continue
+        for name in files:
+            rel = name if rel_root == '.' else f"{rel_root}/{name}"
+            if rel.startswith(HASHED_PREFIXES) or rel.lower().endswith(POSTER_MANIFEST_SUFFIXES):
+                continue
+            yield rel
+
+
+def build(static_folder):
+    """Write fingerprinted + compressed copies and the manifest; returns the manifest."""
+    dist = os.path.join(static_folder, DIST_DIR)
+    if os.path.isdir(dist):
+        shutil.rmtree(dist)
+
+    files = {}
+    for rel in sorted(_source_files(static_folder)):
+        source = os.path.join(static_folder, rel)
+        digest = _digest(source)
+        stem, ext = os.path.splitext(rel)
+        target = f"{DIST_DIR}/{stem}.{digest[:12]}{ext}"
+        target_path = os.path.join(static_folder, target)
+        os.makedirs(os.path.dirname(target_path), exist_ok=True)
+        shutil.copyfile(source, target_path)
+
+        if ext.lower() in COMPRESSIBLE:
+            with open(source, 'rb') as f:
+                data = f.read()
+            with open(target_path + '.gz', 'wb') as f:
+                f.write(gzip.compress(data, compresslevel=9, mtime=0))
+            if brotli is not None:
+                with open(target_path + '.br', 'wb') as f:
+                    f.write(brotli.compress(data, quality=11))
+        stat = os.stat(source)
+        files[rel] = {'path': target, 'sha256': digest, 'size': stat.st_size, 'mtime': stat.st_mtime}
+
+    manifest = {'files': files}
+    with open(os.path.join(dist, MANIFEST_NAME), 'w') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    return manifest
+
+
+def _read_manifest(static_folder):
+    try:
+        with open(os.path.join(static_folder, DIST_DIR, MANIFEST_NAME)) as f:
+            return json.load(f)['files']
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def load_manifest(static_folder):
+    """{source name: fingerprinted name} for every entry whose built copy exists."""
+    files = _read_manifest(static_folder) or {}
+    return {rel: entry['path'] for rel, entry in files.items()
+            if os.path.exists(os.path.join(static_folder, entry['path']))}
+
+
+def stale(static_folder):
+    """
+    Source files that differ from the last build, or were never built (all
+    of them if there is no manifest). A source is only hashed when its size
+    or mtime no longer matches the manifest.
+    """
+    files = _read_manifest(static_folder)
+    if files is None:
+        return sorted(_source_files(static_folder))
+    changed = []
+    for rel in sorted(_source_files(static_folder)):
+        entry = files.get(rel)
+        if entry is None:
+            changed.append(rel)
+            continue
+        stat = os.stat(os.path.join(static_folder, rel))
+        if (stat.st_size, stat.st_mtime) == (entry.get('size'), entry.get('mtime')):
+            continue
+        if _digest(os.path.join(static_folder, rel)) != entry['sha256']:
+            changed.append(rel)
+    return changed
+
+
+def _is_immutable(filename):
+    return filename.startswith(DIST_DIR + '/') or filename.startswith(HASHED_PREFIXES)
+
+
+def _send_immutable(static_folder, filename):
+    mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    encoding = None
+    for name, suffix in ENCODINGS:
+        if name in request.accept_encodings and os.path.isfile(os.path.join(static_folder, filename + suffix)):
+            encoding = name
+            filename += suffix
+            break
+
+    response = send_from_directory(static_folder, filename, mimetype=mimetype, max_age=IMMUTABLE_MAX_AGE)
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    if encoding:
+        response.content_encoding = encoding
+    response.vary.add('Accept-Encoding')
+    return response
+
+
+def init_app(app):
+    """Resolve url_for('static') through the manifest and serve hashed files immutably."""
+    manifest = {}
+    if app.config.get('ASSET_FINGERPRINTING', True):
+        manifest = load_manifest(app.static_folder)
+    app.extensions['asset_manifest'] = manifest
+
+    @app.url_defaults
+    def fingerprint_static_url(endpoint, values):
+        if endpoint == 'static' and 'filename' in values:
+            values['filename'] = manifest.get(values['filename'], values['filename'])
+
+    static_view = app.view_functions['static']
+
+    @wraps(static_view)
+    def static(filename):
+        if _is_immutable(filename):
+            return _send_immutable(app.static_folder, filename)
+        return static_view(filename=filename)
+
+    app.view_functions['static'] = static
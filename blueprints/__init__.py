@@ -0,0 +1,12 @@
+"""
+Route blueprints. Endpoints are namespaced by blueprint, e.g.
+url_for('events.events') or url_for('auth.login').
+"""
+from blueprints import admin, auth, events, forum, leaderboard, main, messaging, teams
+
+BLUEPRINTS = (main, auth, events, teams, forum, messaging, leaderboard, admin)
+
+
+def register_blueprints(app):
+    for module in BLUEPRINTS:
+        app.register_blueprint(module.bp)
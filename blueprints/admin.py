@@ -0,0 +1,500 @@
+"""Admin dashboard, user management, exports, forum moderation and calendar management."""
+import csv
+import io
+from datetime import datetime, timedelta
+
+from flask import (
+    Blueprint, render_template, redirect, url_for, request, flash, current_app, abort,
+    Response, stream_with_context
+)
+from flask_login import current_user
+from werkzeug.security import generate_password_hash
+
+import db_engine
+import posters
+import query_stats
+from helpers import PASSWORD_RE, admin_required, staff_required
+from models import db, User, Event, Team, ForumPost, EntityStats, UserDeletionJob
+
+bp = Blueprint('admin', __name__)
+
+# Columns available to /export_users, in output order
+EXPORT_USER_FIELDS = [
+    'id','username','name','email','mobile','roll_number',
+    'codechef','hackerrank','leetcode',
+    'college','branch','year','skills',
+    'resume_filename','certificates_filename','created_at'
+]
+
+
+@bp.route('/admin')
+@admin_required
+def admin_dashboard():
+    # one row of precomputed counters instead of a COUNT(*) per table
+    stats = EntityStats.get(max_age=current_app.config.get('STATS_RECONCILE_SECONDS', 3600))
+    users = User.query.order_by(User.created_at.desc()).limit(10).all()
+    return render_template('admin/admin_dashboard.html', stats=stats, recent_users=users)
+
+
+@bp.route('/admin/queries')
+@admin_required
+def admin_queries():
+    """Routes ranked by total DB time in this worker, with likely N+1 patterns."""
+    return render_template('admin/admin_queries.html',
+                           routes=query_stats.routes.worst(),
+                           connections=db_engine.stats.snapshot(),
+                           threshold=current_app.config.get('N_PLUS_ONE_THRESHOLD', 5))
+
+
+@bp.route('/admin/queries/reset', methods=['POST'])
+@admin_required
+def admin_reset_queries():
+    query_stats.routes.reset()
+    db_engine.stats.reset()
+    flash('Query stats reset.', 'success')
+    return redirect(url_for('admin.admin_queries'))
+
+
+@bp.route('/admin/import', methods=['GET', 'POST'])
+@admin_required
+def admin_import():
+    """Upload a clubs/chapters/users CSV; rows are upserted and bad ones listed (see bulk_import.py)."""
+    # imported here rather than at module level: only this admin page needs the
+    # importers, and every cold start would pay for them otherwise
+    import bulk_import
+    report = None
+    if request.method == 'POST':
+        kind = request.form.get('kind')
+        upload = request.files.get('csv_file')
+        if kind not in bulk_import.IMPORTERS:
+            flash('Choose what the file contains.', 'danger')
+        elif not upload or not upload.filename:
+            flash('Choose a CSV file to import.', 'danger')
+        else:
+            options = {}
+            if kind == 'users':
+                options['default_password'] = request.form.get('default_password') or None
+            try:
+                report = bulk_import.import_upload(kind, upload, **options)
+            except ValueError as e:
+                flash(str(e), 'danger')
+            except UnicodeDecodeError:
+                flash('The file is not UTF-8 text; export it from your spreadsheet as CSV (UTF-8).', 'danger')
+    return render_template('admin/admin_import.html', report=report)
+
+
+@bp.route('/admin/users')
+@admin_required
+def admin_list_users():
+    users = User.query.order_by(User.created_at.desc()).all()
+    return render_template('admin/admin_users.html', users=users)
+
+
+@bp.route('/admin/user/<int:user_id>/delete', methods=['POST'])
+@admin_required
+def admin_delete_user(user_id):
+    if user_id == current_user.id:
+        flash('You cannot delete your own account.', 'danger')
+        return redirect(url_for('admin.admin_list_users'))
+    
+    user = User.query.get_or_404(user_id)
+    username = user.username
+
+    import user_deletion  # on first use, like bulk_import above
+    counts = user_deletion.footprint(user_id)
+    if sum(counts.values()) > current_app.config.get('USER_DELETE_SYNC_LIMIT', 2000):
+        # too much content to delete inside one request without holding locks for seconds
+        user_deletion.start_job(user, current_user.id, counts)
+        flash(f'User {username} is locked and being deleted in the background.', 'info')
+        return redirect(url_for('admin.admin_deletion_jobs'))
+
+    purge = user_deletion.delete_user(user_id)
+    db.session.commit()
+    purge.committed()
+
+    flash(f'User {username} has been deleted.', 'success')
+    return redirect(url_for('admin.admin_list_users'))
+
+
+@bp.route('/admin/deletions')
+@admin_required
+def admin_deletion_jobs():
+    jobs = UserDeletionJob.query.order_by(UserDeletionJob.created_at.desc()).limit(50).all()
+    return render_template('admin/admin_deletions.html', jobs=jobs)
+
+
+@bp.route('/admin/deletions/<int:job_id>/resume', methods=['POST'])
+@admin_required
+def admin_resume_deletion(job_id):
+    job = UserDeletionJob.query.get_or_404(job_id)
+    if job.resumable:
+        import user_deletion
+        user_deletion.submit(job.id)
+        flash(f'Resumed deleting {job.username}.', 'info')
+    return redirect(url_for('admin.admin_deletion_jobs'))
+
+
+@bp.route('/admin/user/<int:user_id>/edit', methods=['GET', 'POST'])
+@admin_required
+def admin_edit_user(user_id):
+    user = User.query.get_or_404(user_id)
+    
+    if request.method == 'POST':
+        user.name = request.form.get('name', user.name)
+        user.email = request.form.get('email', user.email)
+        user.username = request.form.get('username', user.username)
+        user.mobile = request.form.get('mobile', user.mobile)
+        user.roll_number = request.form.get('roll_number', user.roll_number)
+        user.college = request.form.get('college', user.college)
+        user.branch = request.form.get('branch', user.branch)
+        user.year = request.form.get('year', user.year)
+        user.skills = request.form.get('skills', user.skills)
+        user.codechef = request.form.get('codechef', user.codechef)
+        user.hackerrank = request.form.get('hackerrank', user.hackerrank)
+        user.leetcode = request.form.get('leetcode', user.leetcode)
+        
+        # Update admin status
+        is_admin = request.form.get('is_admin') == 'on'
+        if user_id != current_user.id:  # Prevent self-demotion
+            user.is_admin = is_admin
+        
+        # Update privilege level
+        privilege_level = request.form.get('privilege_level', type=int)
+        if privilege_level and privilege_level in [1, 2, 3, 4]:
+            if user_id != current_user.id or privilege_level == 1:  # Can't demote self unless to admin
+                user.privilege_level = privilege_level
+                # Sync admin status with privilege level
+                if privilege_level == 1:
+                    user.is_admin = True
+                elif privilege_level > 1 and not current_user.is_admin:
+                    user.is_admin = False
+        
+        # Update password if provided
+        new_password = request.form.get('password', '').strip()
+        if new_password:
+            if PASSWORD_RE.match(new_password):
+                user.password_hash = generate_password_hash(new_password)
+            else:
+                flash('Password must be at least 8 chars incl. upper, lower, number & special char.', 'danger')
+                return redirect(url_for('admin.admin_edit_user', user_id=user_id))
+        
+        db.session.commit()
+        flash('User updated successfully!', 'success')
+        return redirect(url_for('admin.admin_list_users'))
+    
+    return render_template('admin/admin_edit_user.html', user=user)
+
+
+@bp.route('/admin/team/<int:team_id>/kick/<int:user_id>', methods=['POST'])
+@admin_required
+def admin_kick_user_from_team(team_id, user_id):
+    team = Team.query.get_or_404(team_id)
+    user = User.query.get_or_404(user_id)
+    
+    if user not in team.members:
+        flash('User is not a member of this team.', 'warning')
+        return redirect(url_for('teams.view_team', team_id=team_id))
+    
+    # Don't allow kicking team leader
+    if team.leader_id == user_id:
+        flash('Cannot kick team leader. Assign a new leader first.', 'danger')
+        return redirect(url_for('teams.view_team', team_id=team_id))
+    
+    team.members.remove(user)
+    db.session.commit()
+    
+    flash(f'{user.username} has been removed from {team.name}.', 'success')
+    return redirect(url_for('teams.view_team', team_id=team_id))
+
+
+@bp.route('/export_users')
+@admin_required
+def export_users():
+    """
+    Stream users as CSV. Optional query args: columns (repeated or comma
+    separated, output in the order given; unknown names are a 400), branch, year,
+    created_from / created_to (YYYY-MM-DD, inclusive).
+    """
+    requested = [c.strip() for arg in request.args.getlist('columns') for c in arg.split(',') if c.strip()]
+    if set(requested) - set(EXPORT_USER_FIELDS):
+        abort(400)
+    fieldnames = list(dict.fromkeys(requested)) or EXPORT_USER_FIELDS
+
+    stmt = db.select(*[getattr(User, f) for f in fieldnames]).order_by(User.id)
+    branch = request.args.get('branch', '').strip()
+    year = request.args.get('year', '').strip()
+    if branch:
+        stmt = stmt.where(User.branch == branch)
+    if year:
+        stmt = stmt.where(User.year == year)
+    try:
+        created_from = request.args.get('created_from', '').strip()
+        created_to = request.args.get('created_to', '').strip()
+        if created_from:
+            stmt = stmt.where(User.created_at >= datetime.strptime(created_from, '%Y-%m-%d'))
+        if created_to:
+            stmt = stmt.where(User.created_at < datetime.strptime(created_to, '%Y-%m-%d') + timedelta(days=1))
+    except ValueError:
+        abort(400)
+
+    def generate(batch_size=1000):
+        si = io.StringIO()
+        writer = csv.writer(si)
+        writer.writerow(fieldnames)
+        # server-side cursor on PostgreSQL; rows are fetched and written in batches
+        result = db.session.execute(stmt.execution_options(stream_results=True, yield_per=batch_size))
+        for rows in result.partitions():
+            for row in rows:
+                writer.writerow([
+                    value.isoformat() if isinstance(value, datetime) else ('' if value is None else value)
+                    for value in row
+                ])
+            yield si.getvalue()
+            si.seek(0)
+            si.truncate(0)
+        yield si.getvalue()
+
+    output = Response(stream_with_context(generate()), mimetype='text/csv')
+    output.headers["Content-Disposition"] = "attachment; filename=cloudroom_users.csv"
+    return output
+
+
+@bp.route('/admin/forum/users')
+@admin_required
+def admin_forum_users():
+    users = User.query.order_by(User.username).all()
+    return render_template('admin/admin_forum_users.html', users=users)
+
+
+@bp.route('/admin/forum/user/<int:user_id>/ban', methods=['POST'])
+@admin_required
+def admin_ban_user(user_id):
+    user = User.query.get_or_404(user_id)
+    if user_id == current_user.id:
+        flash('You cannot ban yourself.', 'danger')
+        return redirect(url_for('admin.admin_forum_users'))
+    
+    user.is_banned = True
+    db.session.commit()
+    flash(f'User {user.username} has been banned from the forum.', 'success')
+    return redirect(url_for('admin.admin_forum_users'))
+
+
+@bp.route('/admin/forum/user/<int:user_id>/unban', methods=['POST'])
+@admin_required
+def admin_unban_user(user_id):
+    user = User.query.get_or_404(user_id)
+    user.is_banned = False
+    db.session.commit()
+    flash(f'User {user.username} has been unbanned.', 'success')
+    return redirect(url_for('admin.admin_forum_users'))
+
+
+@bp.route('/admin/forum/user/<int:user_id>/silence', methods=['POST'])
+@admin_required
+def admin_silence_user(user_id):
+    user = User.query.get_or_404(user_id)
+    if user_id == current_user.id:
+        flash('You cannot silence yourself.', 'danger')
+        return redirect(url_for('admin.admin_forum_users'))
+    
+    days = request.form.get('days', type=int) or 0
+    if days > 0:
+        user.silence_until = datetime.utcnow() + timedelta(days=days)
+        user.is_silenced = True
+    else:
+        # Permanent silence
+        user.is_silenced = True
+        user.silence_until = None
+    
+    db.session.commit()
+    if days > 0:
+        flash(f'User {user.username} silenced for {days} days.', 'success')
+    else:
+        flash(f'User {user.username} permanently silenced.', 'success')
+    return redirect(url_for('admin.admin_forum_users'))
+
+
+@bp.route('/admin/forum/user/<int:user_id>/unsilence', methods=['POST'])
+@admin_required
+def admin_unsilence_user(user_id):
+    user = User.query.get_or_404(user_id)
+    user.is_silenced = False
+    user.silence_until = None
+    db.session.commit()
+    flash(f'User {user.username} unsilenced.', 'success')
+    return redirect(url_for('admin.admin_forum_users'))
+
+
+@bp.route('/admin/forum/post/<int:post_id>/lock', methods=['POST'])
+@admin_required
+def admin_lock_post(post_id):
+    post = ForumPost.query.get_or_404(post_id)
+    post.is_locked = True
+    db.session.commit()
+    flash('Post locked.', 'success')
+    return redirect(url_for('forum.view_post', post_id=post_id))
+
+
+@bp.route('/admin/forum/post/<int:post_id>/unlock', methods=['POST'])
+@admin_required
+def admin_unlock_post(post_id):
+    post = ForumPost.query.get_or_404(post_id)
+    post.is_locked = False
+    db.session.commit()
+    flash('Post unlocked.', 'success')
+    return redirect(url_for('forum.view_post', post_id=post_id))
+
+
+@bp.route('/admin/forum/post/<int:post_id>/pin', methods=['POST'])
+@admin_required
+def admin_pin_post(post_id):
+    post = ForumPost.query.get_or_404(post_id)
+    post.is_pinned = True
+    db.session.commit()
+    flash('Post pinned.', 'success')
+    return redirect(url_for('forum.forum'))
+
+
+@bp.route('/admin/forum/post/<int:post_id>/unpin', methods=['POST'])
+@admin_required
+def admin_unpin_post(post_id):
+    post = ForumPost.query.get_or_404(post_id)
+    post.is_pinned = False
+    db.session.commit()
+    flash('Post unpinned.', 'success')
+    return redirect(url_for('forum.forum'))
+
+
+@bp.route('/admin/calendar')
+@staff_required
+def admin_calendar():
+    """Level 2+ (Staff, Admin) can access calendar management"""
+    page = request.args.get('page', 1, type=int)
+    events = Event.query.order_by(Event.date.desc()).paginate(page=page, per_page=50, error_out=False)
+    return render_template('admin/admin_calendar.html', events=events.items, pagination=events)
+
+
+def event_span_ok(date, end_date):
+    """The calendar feed (/api/events) relies on no event lasting longer than EVENT_MAX_DAYS."""
+    return end_date is None or (end_date - date).days <= current_app.config['EVENT_MAX_DAYS']
+
+
+@bp.route('/admin/calendar/event/create', methods=['GET', 'POST'])
+@staff_required
+def admin_create_event():
+    """Level 2+ (Staff, Admin) can create calendar events"""
+    if request.method == 'POST':
+        title = request.form.get('title', '').strip()
+        description = request.form.get('description', '').strip()
+        date_str = request.form.get('date', '').strip()
+        end_date_str = request.form.get('end_date', '').strip()
+        location = request.form.get('location', '').strip()
+        register_url = request.form.get('register_url', '').strip()
+        event_type = request.form.get('event_type', 'general').strip()
+        color = request.form.get('color', '#007bff').strip()
+        
+        if not title or not date_str:
+            flash('Title and date are required.', 'danger')
+            return redirect(url_for('admin.admin_create_event'))
+        
+        try:
+            date = datetime.strptime(date_str, '%Y-%m-%d')
+            end_date = None
+            if end_date_str:
+                end_date = datetime.strptime(end_date_str, '%Y-%m-%d')
+        except ValueError:
+            flash('Invalid date format.', 'danger')
+            return redirect(url_for('admin.admin_create_event'))
+        if not event_span_ok(date, end_date):
+            flash(f"Events can't last longer than {current_app.config['EVENT_MAX_DAYS']} days.", 'danger')
+            return redirect(url_for('admin.admin_create_event'))
+        
+        # Handle image upload: stored by content hash, resized variants built in the background
+        poster_filename = None
+        poster_file = request.files.get('poster')
+        if poster_file and poster_file.filename:
+            try:
+                poster_filename = posters.save_poster(poster_file)
+            except posters.PosterError as e:
+                flash(str(e), 'danger')
+                return redirect(url_for('admin.admin_create_event'))
+        
+        event = Event(
+            title=title,
+            description=description,
+            date=date,
+            end_date=end_date,
+            location=location,
+            poster=poster_filename,
+            register_url=register_url if register_url else None,
+            event_type=event_type,
+            color=color,
+            created_by=current_user.id
+        )
+        db.session.add(event)
+        db.session.commit()
+        flash('Event created successfully!', 'success')
+        return redirect(url_for('admin.admin_calendar'))
+    
+    return render_template('admin/admin_create_event.html')
+
+
+@bp.route('/admin/calendar/event/<int:event_id>/edit', methods=['GET', 'POST'])
+@staff_required
+def admin_edit_event(event_id):
+    event = Event.query.get_or_404(event_id)
+    
+    if request.method == 'POST':
+        event.title = request.form.get('title', event.title).strip()
+        event.description = request.form.get('description', event.description).strip()
+        date_str = request.form.get('date', '').strip()
+        end_date_str = request.form.get('end_date', '').strip()
+        event.location = request.form.get('location', event.location).strip()
+        event.register_url = request.form.get('register_url', event.register_url or '').strip() or None
+        event.event_type = request.form.get('event_type', event.event_type).strip()
+        event.color = request.form.get('color', event.color).strip()
+        
+        if date_str:
+            try:
+                event.date = datetime.strptime(date_str, '%Y-%m-%d')
+            except ValueError:
+                flash('Invalid date format.', 'danger')
+                return redirect(url_for('admin.admin_edit_event', event_id=event_id))
+        
+        if end_date_str:
+            try:
+                event.end_date = datetime.strptime(end_date_str, '%Y-%m-%d')
+            except ValueError:
+                event.end_date = None
+        else:
+            event.end_date = None
+        if not event_span_ok(event.date, event.end_date):
+            db.session.rollback()
+            flash(f"Events can't last longer than {current_app.config['EVENT_MAX_DAYS']} days.", 'danger')
+            return redirect(url_for('admin.admin_edit_event', event_id=event_id))
+        
+        # Handle image upload: stored by content hash, resized variants built in the background
+        poster_file = request.files.get('poster')
+        if poster_file and poster_file.filename:
+            try:
+                event.poster = posters.save_poster(poster_file)
+            except posters.PosterError as e:
+                flash(str(e), 'danger')
+                return redirect(url_for('admin.admin_edit_event', event_id=event_id))
+        
+        db.session.commit()
+        flash('Event updated successfully!', 'success')
+        return redirect(url_for('admin.admin_calendar'))
+    
+    return render_template('admin/admin_edit_event.html', event=event)
+
+
+@bp.route('/admin/calendar/event/<int:event_id>/delete', methods=['POST'])
+@staff_required
+def admin_delete_event(event_id):
+    event = Event.query.get_or_404(event_id)
+    db.session.delete(event)
+    db.session.commit()
+    flash('Event deleted successfully!', 'success')
+    return redirect(url_for('admin.admin_calendar'))
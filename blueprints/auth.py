@@ -0,0 +1,167 @@
+"""Login, signup, logout and first-time profile setup."""
+from flask import Blueprint, render_template, redirect, url_for, request, flash, current_app
+from flask_login import login_user, logout_user, login_required, current_user
+from werkzeug.security import generate_password_hash, check_password_hash
+
+import storage
+from helpers import EMAIL_RE, PASSWORD_RE, MOBILE_RE, allowed_file
+from models import db, User
+
+bp = Blueprint('auth', __name__)
+
+
+@bp.route('/login', methods=['GET', 'POST'])
+def login():
+    if request.method == 'GET':
+        return render_template('auth/login.html')
+
+    username_or_email = request.form.get('username', '').strip()
+    password = request.form.get('password', '')
+
+    if not username_or_email or not password:
+        flash('Please enter username/email and password', 'warning')
+        return redirect(url_for('auth.login'))
+
+    user = User.query.filter(
+        (User.username == username_or_email) | (User.email == username_or_email)
+    ).first()
+
+    if not user or not check_password_hash(user.password_hash, password):
+        flash('Invalid username/email or password', 'danger')
+        return redirect(url_for('auth.login'))
+
+    login_user(user)
+    flash('Logged in successfully', 'success')
+    next_page = request.args.get('next')
+    return redirect(next_page or url_for('main.profile'))
+
+
+@bp.route('/admin/login', methods=['GET', 'POST'])
+def admin_login():
+    if request.method == 'GET':
+        return render_template('admin/admin_login.html')
+    
+    username_or_email = request.form.get('username', '').strip()
+    password = request.form.get('password', '')
+    
+    if not username_or_email or not password:
+        flash('Please enter username/email and password', 'warning')
+        return redirect(url_for('auth.admin_login'))
+    
+    user = User.query.filter(
+        (User.username == username_or_email) | (User.email == username_or_email)
+    ).first()
+    
+    if not user or not check_password_hash(user.password_hash, password):
+        flash('Invalid credentials', 'danger')
+        return redirect(url_for('auth.admin_login'))
+    
+    if not user.is_admin:
+        flash('Access denied. Admin privileges required.', 'danger')
+        return redirect(url_for('auth.admin_login'))
+    
+    login_user(user)
+    flash('Admin login successful', 'success')
+    return redirect(url_for('admin.admin_dashboard'))
+
+
+@bp.route('/logout')
+@login_required
+def logout():
+    logout_user()
+    flash('Logged out successfully.', 'info')
+    return redirect(url_for('main.index'))
+
+
+@bp.route('/signup', methods=['GET', 'POST'])
+def signup():
+    if request.method == 'POST':
+        name = request.form.get('name', '').strip()
+        mobile = request.form.get('mobile', '').strip()
+        email = request.form.get('email', '').strip()
+        username = request.form.get('username', '').strip()
+        password = request.form.get('password', '')
+
+        if not all([name, mobile, email, username, password]):
+            flash('Please fill all required fields.', 'danger')
+            return redirect(url_for('auth.signup'))
+
+        if not MOBILE_RE.match(mobile):
+            flash('Mobile must be exactly 10 digits.', 'danger')
+            return redirect(url_for('auth.signup'))
+
+        if not EMAIL_RE.match(email):
+            flash('Invalid email address.', 'danger')
+            return redirect(url_for('auth.signup'))
+
+        if not PASSWORD_RE.match(password):
+            flash('Password must be at least 8 chars incl. upper, lower, number & special char.', 'danger')
+            return redirect(url_for('auth.signup'))
+
+        if User.query.filter_by(email=email).first():
+            flash('Email already registered.', 'danger')
+            return redirect(url_for('auth.signup'))
+        if User.query.filter_by(username=username).first():
+            flash('Username already taken.', 'danger')
+            return redirect(url_for('auth.signup'))
+
+        user = User(name=name, mobile=mobile, email=email, username=username)
+        user.password_hash = generate_password_hash(password)
+        db.session.add(user)
+        db.session.commit()
+
+        login_user(user)
+        flash('Account created and logged in. Welcome!', 'success')
+        try:
+            return redirect(url_for('auth.profile_setup', user_id=user.id))
+        except Exception:
+            return redirect(url_for('main.profile'))
+
+    return render_template('auth/signup.html')
+
+
+@bp.route('/profile_setup', methods=['GET', 'POST'])
+@login_required
+def profile_setup():
+    user = current_user
+
+    if request.method == 'POST':
+        college = request.form.get('college', '').strip()
+        branch = request.form.get('branch', '').strip()
+        year = request.form.get('year', '').strip()
+        skills = request.form.get('skills', '').strip()
+
+        if not all([college, branch, year, skills]):
+            flash('Please fill all profile fields.', 'danger')
+            return redirect(url_for('auth.profile_setup'))
+
+        resume = request.files.get('resume')
+        certs = request.files.get('certificates')
+
+        if resume and resume.filename and not allowed_file(resume.filename):
+            flash('Resume must be a PDF or image.', 'danger')
+            return redirect(url_for('auth.profile_setup'))
+        if certs and certs.filename and not allowed_file(certs.filename):
+            flash('Certificates must be pdf/images.', 'danger')
+            return redirect(url_for('auth.profile_setup'))
+
+        # Streamed into the configured backend under their content hash
+        try:
+            if resume and resume.filename:
+                user.resume_filename = storage.store_upload(storage.get_storage(), resume)
+            if certs and certs.filename:
+                user.certificates_filename = storage.store_upload(storage.get_storage(), certs)
+        except storage.StorageError:
+            current_app.logger.exception("Upload storage failed")
+            flash('Could not save your files right now. Please try again.', 'danger')
+            return redirect(url_for('auth.profile_setup'))
+
+        user.college = college
+        user.branch = branch
+        user.year = year
+        user.skills = skills
+        db.session.commit()
+        flash('Profile setup complete! Welcome to CloudRoom 🎉', 'success')
+        return redirect(url_for('main.profile'))
+
+    return render_template('auth/profile_setup.html', user=user)
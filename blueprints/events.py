@@ -0,0 +1,257 @@
+"""Events, registrations, hackathons and the public calendar feed."""
+from datetime import datetime, timedelta
+
+from flask import Blueprint, render_template, redirect, url_for, request, flash, current_app, abort, jsonify
+from flask_login import login_required, current_user
+from sqlalchemy import tuple_
+
+import posters
+from helpers import coordinator_required, encode_cursor, decode_cursor
+from page_cache import cached_page
+from models import db, Event, Registration
+
+bp = Blueprint('events', __name__)
+
+
+def paginate_events(query, cursor=None, limit=12, descending=False):
+    """
+    Keyset-paginate events on (date, id): ascending for upcoming events,
+    descending for past ones. Returns (events, next_cursor or None).
+    """
+    key = tuple_(Event.date, Event.id)
+    if cursor:
+        date, event_id = decode_cursor(cursor)
+        query = query.filter(key < tuple_(date, event_id) if descending else key > tuple_(date, event_id))
+    order = (Event.date.desc(), Event.id.desc()) if descending else (Event.date, Event.id)
+    rows = query.order_by(*order).limit(limit + 1).all()
+    next_cursor = encode_cursor(rows[limit - 1].date, rows[limit - 1].id) if len(rows) > limit else None
+    return rows[:limit], next_cursor
+
+
+@bp.route('/events')
+def events():
+    # Two bounded keyset-paginated sections: ?after= pages upcoming, ?before= pages past
+    per_page = current_app.config['EVENTS_PAGE_SIZE']
+    today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    after = request.args.get('after')
+    before = request.args.get('before')
+    upcoming, next_upcoming = paginate_events(
+        Event.query.filter(Event.date >= today), cursor=after, limit=per_page
+    )
+    past, next_past = paginate_events(
+        Event.query.filter(Event.date < today), cursor=before, limit=per_page, descending=True
+    )
+
+    # Registration counts for the events on screen in one aggregate query
+    event_ids = [ev.id for ev in upcoming + past]
+    registration_counts = {}
+    if event_ids:
+        registration_counts = dict(
+            db.session.query(Registration.event_id, db.func.count(Registration.id))
+            .filter(Registration.event_id.in_(event_ids))
+            .group_by(Registration.event_id).all()
+        )
+    return render_template('events/events.html', upcoming=upcoming, past=past,
+                           next_upcoming=next_upcoming, next_past=next_past,
+                           after=after, before=before,
+                           registration_counts=registration_counts)
+
+
+@bp.route('/events/create', methods=['GET', 'POST'])
+@coordinator_required
+def create_event():
+    """Level 3+ (Coordinators, Staff, Admin) can create events"""
+    if request.method == 'POST':
+        title = request.form.get('title', '').strip()
+        description = request.form.get('description', '').strip()
+        date_str = request.form.get('date', '').strip()
+        location = request.form.get('location', '').strip()
+        register_url = request.form.get('register_url', '').strip()
+        
+        if not title or not date_str:
+            flash('Title and date are required.', 'danger')
+            return redirect(url_for('events.create_event'))
+        
+        try:
+            date = datetime.strptime(date_str, '%Y-%m-%d')
+        except ValueError:
+            flash('Invalid date format.', 'danger')
+            return redirect(url_for('events.create_event'))
+        
+        # Handle image upload: stored by content hash, resized variants built in the background
+        poster_filename = None
+        poster_file = request.files.get('poster')
+        if poster_file and poster_file.filename:
+            try:
+                poster_filename = posters.save_poster(poster_file)
+            except posters.PosterError as e:
+                flash(str(e), 'danger')
+                return redirect(url_for('events.create_event'))
+        
+        event = Event(
+            title=title,
+            description=description,
+            date=date,
+            location=location,
+            poster=poster_filename,
+            register_url=register_url if register_url else None,
+            event_type='general',
+            color='#007bff',
+            created_by=current_user.id
+        )
+        db.session.add(event)
+        db.session.commit()
+        flash('Event created successfully!', 'success')
+        return redirect(url_for('events.events'))
+    
+    return render_template('events/create_event.html')
+
+
+@bp.route('/my_registrations')
+@login_required
+def my_registrations():
+    try:
+        regs = current_user.registrations.order_by(Registration.created_at.desc()).all()
+    except Exception:
+        regs = []
+    return render_template('events/my_registrations.html', registrations=regs)
+
+
+@bp.route('/register_event/<int:event_id>', methods=['POST'])
+@login_required
+def register_event(event_id):
+    ev = Event.query.get_or_404(event_id)
+    existing = Registration.query.filter_by(user_id=current_user.id, event_id=ev.id).first()
+    if existing:
+        flash('You have already registered for this event.', 'info')
+        return redirect(url_for('events.my_registrations'))
+    reg = Registration(user_id=current_user.id, event_id=ev.id)
+    db.session.add(reg)
+    db.session.commit()
+    flash('Registration saved. Redirecting to event form...', 'success')
+    if getattr(ev, 'register_url', None):
+        return redirect(ev.register_url)
+    return redirect(url_for('events.my_registrations'))
+
+
+@bp.route('/events/<int:event_id>/edit', methods=['GET', 'POST'])
+@coordinator_required
+def edit_event(event_id):
+    """Level 3+ can edit events. Level 3 only their own; Level 2+ any event."""
+    event = Event.query.get_or_404(event_id)
+
+    # Level 3 (Coordinator) can only edit their own events
+    if current_user.privilege_level == 3 and event.created_by != current_user.id:
+        flash('You can only edit events you created.', 'danger')
+        return redirect(url_for('events.events'))
+
+    if request.method == 'POST':
+        event.title = request.form.get('title', event.title).strip()
+        event.description = request.form.get('description', event.description or '').strip()
+        date_str = request.form.get('date', '').strip()
+        event.location = request.form.get('location', event.location or '').strip()
+        event.register_url = request.form.get('register_url', event.register_url or '').strip() or None
+
+        if date_str:
+            try:
+                event.date = datetime.strptime(date_str, '%Y-%m-%d')
+            except ValueError:
+                flash('Invalid date format.', 'danger')
+                return redirect(url_for('events.edit_event', event_id=event_id))
+
+        # Handle image upload: stored by content hash, resized variants built in the background
+        poster_file = request.files.get('poster')
+        if poster_file and poster_file.filename:
+            try:
+                event.poster = posters.save_poster(poster_file)
+            except posters.PosterError as e:
+                flash(str(e), 'danger')
+                return redirect(url_for('events.edit_event', event_id=event_id))
+
+        db.session.commit()
+        flash('Event updated successfully!', 'success')
+        return redirect(url_for('events.events'))
+
+    return render_template('events/edit_event.html', event=event)
+
+
+@bp.route('/events/<int:event_id>/delete', methods=['POST'])
+@coordinator_required
+def delete_event(event_id):
+    """Level 3+ can delete events. Level 3 only their own; Level 2+ any event."""
+    event = Event.query.get_or_404(event_id)
+
+    # Level 3 (Coordinator) can only delete their own events
+    if current_user.privilege_level == 3 and event.created_by != current_user.id:
+        flash('You can only delete events you created.', 'danger')
+        return redirect(url_for('events.events'))
+
+    # Delete associated registrations first
+    Registration.query.filter_by(event_id=event_id).delete()
+    db.session.delete(event)
+    db.session.commit()
+    flash('Event deleted successfully!', 'success')
+    return redirect(url_for('events.events'))
+
+
+@bp.route('/hackathons')
+@cached_page()
+def hackathons():
+    """Render the hackathons page."""
+    return render_template('events/hackathons.html')
+
+
+@bp.route('/calendar')
+def calendar():
+    # The calendar grid pulls its events from /api/events; only the list below is rendered here
+    today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    events = Event.query.filter(Event.date >= today).order_by(Event.date).limit(10).all()
+    return render_template('events/calendar.html', events=events)
+
+
+def parse_feed_datetime(value):
+    """FullCalendar sends ISO 8601 dates, possibly with a time and UTC offset."""
+    parsed = datetime.fromisoformat(value.strip().replace('Z', '+00:00').replace(' ', '+'))
+    return parsed.replace(tzinfo=None)
+
+
+@bp.route('/api/events')
+def api_events():
+    """
+    JSON event feed for FullCalendar: events overlapping [start, end).
+    Responses carry an ETag, so an unchanged window is answered with 304.
+    """
+    try:
+        start = parse_feed_datetime(request.args['start'])
+        end = parse_feed_datetime(request.args['end'])
+    except (KeyError, ValueError):
+        abort(400)
+    if end <= start or (end - start).days > current_app.config['CALENDAR_FEED_MAX_DAYS']:
+        abort(400)
+
+    # bounded on both sides of the leading date column, so the scan doesn't grow with history;
+    # nothing that starts earlier can still be running (event spans are capped at EVENT_MAX_DAYS)
+    events = Event.query.filter(
+        Event.date >= start - timedelta(days=current_app.config['EVENT_MAX_DAYS']),
+        Event.date < end,
+        (Event.end_date >= start) | ((Event.end_date == None) & (Event.date >= start))  # noqa: E711
+    ).order_by(Event.date, Event.id).all()
+
+    feed = []
+    for event in events:
+        item = {
+            'id': event.id,
+            'title': event.title,
+            'start': event.date.strftime('%Y-%m-%d'),
+            'color': event.color,
+            'description': event.description or '',
+            'location': event.location or ''
+        }
+        if event.end_date:
+            item['end'] = event.end_date.strftime('%Y-%m-%d')
+        feed.append(item)
+
+    response = jsonify(feed)
+    response.add_etag()
+    response.headers['Cache-Control'] = 'no-cache'
+    return response.make_conditional(request)
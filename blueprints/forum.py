@@ -0,0 +1,249 @@
+"""Reddit-style forum: posts, threaded comments, votes and search."""
+from datetime import datetime
+
+from flask import Blueprint, render_template, redirect, url_for, request, flash, current_app, abort
+from flask_login import login_required, current_user
+from sqlalchemy.orm import joinedload
+
+import forum_search
+from models import db, ForumPost, ForumComment, ForumVote, ForumCategory
+
+bp = Blueprint('forum', __name__)
+
+
+# -------------------------
+# Forum helpers
+# -------------------------
+def build_comment_tree(comments, root_id=None, max_depth=5, max_replies=10):
+    """
+    Assemble a flat list of comments into a nested tree in O(n).
+
+    `comments` must already be sorted in display order (score desc, created_at);
+    each level keeps that order. Returns a list of nodes, each a dict with
+    'comment', 'replies', 'depth' and 'more' (number of replies cut off by
+    max_depth / max_replies, which the template turns into a "load more" link).
+    When root_id is given, the tree starts at that comment instead of the post.
+    """
+    children = {}
+    for c in comments:
+        children.setdefault(c.parent_id, []).append(c)
+
+    def build(parent_id, depth):
+        kids = children.get(parent_id, [])
+        nodes = []
+        # top-level comments, and a thread's own replies (reached through "load more"), are never cut
+        for c in kids if parent_id in (None, root_id) else kids[:max_replies]:
+            node = {'comment': c, 'replies': [], 'depth': depth, 'more': 0}
+            if c.id in children:
+                if depth + 1 < max_depth:
+                    node['replies'], node['more'] = build(c.id, depth + 1)
+                else:
+                    node['more'] = len(children[c.id])
+            nodes.append(node)
+        hidden = len(kids) - len(nodes)
+        return nodes, hidden
+
+    if root_id is None:
+        return build(None, 0)[0]
+
+    root = next((c for c in comments if c.id == root_id), None)
+    if root is None:
+        return []
+    node = {'comment': root, 'replies': [], 'depth': 0, 'more': 0}
+    node['replies'], node['more'] = build(root.id, 1)
+    return [node]
+
+
+@bp.route('/forum')
+def forum():
+    category_id = request.args.get('category', type=int)
+    search_query = request.args.get('search', '').strip()
+    
+    if search_query:
+        # Full-text index, ranked by relevance blended with vote score
+        posts = forum_search.search_posts(search_query, category_id=category_id)
+    else:
+        # author and category are joined in so the listing doesn't lazy-load per post
+        query = ForumPost.query.options(
+            joinedload(ForumPost.author),
+            joinedload(ForumPost.category)
+        )
+        if category_id:
+            query = query.filter_by(category_id=category_id)
+        posts = query.order_by(ForumPost.score.desc(), ForumPost.created_at.desc()).limit(50).all()
+    categories = ForumCategory.query.order_by(ForumCategory.name).all()
+    
+    return render_template('forum/forum.html', posts=posts, categories=categories, 
+                         selected_category=category_id, search_query=search_query)
+
+
+@bp.route('/forum/post/<int:post_id>')
+def view_post(post_id):
+    post = ForumPost.query.options(
+        joinedload(ForumPost.author),
+        joinedload(ForumPost.category)
+    ).get_or_404(post_id)
+    # ?thread=<comment_id> shows the subtree under one comment ("load more replies")
+    thread_id = request.args.get('thread', type=int)
+    # One query for every comment of the post; the tree is assembled in memory
+    all_comments = ForumComment.query.options(joinedload(ForumComment.author))\
+        .filter_by(post_id=post_id)\
+        .order_by(ForumComment.score.desc(), ForumComment.created_at).all()
+    comments = build_comment_tree(
+        all_comments,
+        root_id=thread_id,
+        max_depth=current_app.config['COMMENT_TREE_MAX_DEPTH'],
+        max_replies=current_app.config['COMMENT_TREE_MAX_REPLIES']
+    )
+    return render_template('forum/forum_post.html', post=post, comments=comments,
+                           thread_id=thread_id, comment_total=len(all_comments))
+
+
+@bp.route('/forum/create', methods=['GET', 'POST'])
+@login_required
+def create_post():
+    if current_user.is_banned:
+        flash('You are banned from the forum.', 'danger')
+        return redirect(url_for('forum.forum'))
+    
+    if current_user.is_silenced:
+        if current_user.silence_until and current_user.silence_until > datetime.utcnow():
+            flash('You are silenced from posting until ' + current_user.silence_until.strftime('%Y-%m-%d %H:%M'), 'danger')
+            return redirect(url_for('forum.forum'))
+        elif not current_user.silence_until:
+            flash('You are permanently silenced from posting.', 'danger')
+            return redirect(url_for('forum.forum'))
+        else:
+            # Silence expired
+            current_user.is_silenced = False
+            current_user.silence_until = None
+            db.session.commit()
+    
+    if request.method == 'POST':
+        title = request.form.get('title', '').strip()
+        content = request.form.get('content', '').strip()
+        category_id = request.form.get('category_id', type=int) or None
+        
+        if not title or not content:
+            flash('Title and content are required.', 'danger')
+            return redirect(url_for('forum.create_post'))
+        
+        # Level 4 users (students) can only post in Questions, Study, or Doubts categories
+        if current_user.privilege_level == 4:
+            if category_id:
+                category = ForumCategory.query.get(category_id)
+                allowed_categories = ['questions', 'study', 'doubts']
+                if category and category.name.lower() not in allowed_categories:
+                    flash('Students can only post in Questions, Study, or Doubts categories.', 'danger')
+                    return redirect(url_for('forum.create_post'))
+            else:
+                flash('Students must select a category (Questions, Study, or Doubts).', 'danger')
+                return redirect(url_for('forum.create_post'))
+        
+        # Level 2+ users can post in Announcements category (forum-wide announcements)
+        if current_user.privilege_level <= 2 and category_id:
+            category = ForumCategory.query.get(category_id)
+            if category and category.name.lower() == 'announcements':
+                # Staff and Admin can post announcements
+                pass  # Allow it
+        
+        post = ForumPost(
+            title=title,
+            content=content,
+            author_id=current_user.id,
+            category_id=category_id
+        )
+        db.session.add(post)
+        db.session.commit()
+        flash('Post created successfully!', 'success')
+        return redirect(url_for('forum.view_post', post_id=post.id))
+    
+    # Filter categories based on privilege level
+    all_categories = ForumCategory.query.order_by(ForumCategory.name).all()
+    if current_user.privilege_level == 4:
+        # Level 4 can only see Questions, Study, Doubts
+        categories = [c for c in all_categories if c.name.lower() in ['questions', 'study', 'doubts']]
+    elif current_user.privilege_level == 3:
+        # Level 3 can see all except Announcements
+        categories = [c for c in all_categories if c.name.lower() != 'announcements']
+    else:
+        # Level 1 and 2 can see all categories (including Announcements)
+        categories = all_categories
+    
+    return render_template('forum/create_post.html', categories=categories, user_level=current_user.privilege_level)
+
+
+@bp.route('/forum/post/<int:post_id>/comment', methods=['POST'])
+@login_required
+def add_comment(post_id):
+    if current_user.is_banned:
+        flash('You are banned from the forum.', 'danger')
+        return redirect(url_for('forum.view_post', post_id=post_id))
+    
+    if current_user.is_silenced:
+        if current_user.silence_until and current_user.silence_until > datetime.utcnow():
+            flash('You are silenced from commenting.', 'danger')
+            return redirect(url_for('forum.view_post', post_id=post_id))
+        elif not current_user.silence_until:
+            flash('You are permanently silenced from commenting.', 'danger')
+            return redirect(url_for('forum.view_post', post_id=post_id))
+        else:
+            current_user.is_silenced = False
+            current_user.silence_until = None
+            db.session.commit()
+    
+    post = ForumPost.query.get_or_404(post_id)
+    if post.is_locked:
+        flash('This post is locked.', 'danger')
+        return redirect(url_for('forum.view_post', post_id=post_id))
+    
+    content = request.form.get('content', '').strip()
+    parent_id = request.form.get('parent_id', type=int) or None
+    
+    if not content:
+        flash('Comment cannot be empty.', 'danger')
+        return redirect(url_for('forum.view_post', post_id=post_id))
+    
+    comment = ForumComment(
+        content=content,
+        author_id=current_user.id,
+        post_id=post_id,
+        parent_id=parent_id
+    )
+    db.session.add(comment)
+    # Bump the denormalized counter in the same transaction as the insert
+    ForumPost.query.filter_by(id=post_id).update(
+        {ForumPost.comment_count: ForumPost.comment_count + 1},
+        synchronize_session=False
+    )
+    db.session.commit()
+    flash('Comment added!', 'success')
+    return redirect(url_for('forum.view_post', post_id=post_id))
+
+
+@bp.route('/forum/post/<int:post_id>/vote', methods=['POST'])
+@login_required
+def vote_post(post_id):
+    vote_type = request.form.get('vote_type')  # 'upvote' or 'downvote'
+    if vote_type not in ForumVote.VOTE_TYPES:
+        abort(400)
+    ForumPost.query.get_or_404(post_id)
+    
+    # Atomic vote-row change + counter increment; no read-modify-write
+    ForumVote.apply(current_user.id, vote_type, post_id=post_id)
+    db.session.commit()
+    return redirect(url_for('forum.view_post', post_id=post_id))
+
+
+@bp.route('/forum/comment/<int:comment_id>/vote', methods=['POST'])
+@login_required
+def vote_comment(comment_id):
+    vote_type = request.form.get('vote_type')
+    if vote_type not in ForumVote.VOTE_TYPES:
+        abort(400)
+    comment = ForumComment.query.get_or_404(comment_id)
+    post_id = comment.post_id
+    
+    ForumVote.apply(current_user.id, vote_type, comment_id=comment_id)
+    db.session.commit()
+    return redirect(url_for('forum.view_post', post_id=post_id))
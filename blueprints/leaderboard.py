@@ -0,0 +1,22 @@
+"""Coding leaderboard."""
+from flask import Blueprint, render_template, request, current_app
+from sqlalchemy.orm import contains_eager
+
+from models import LeaderboardEntry
+
+bp = Blueprint('leaderboard', __name__)
+
+
+@bp.route("/leaderboard")
+def leaderboard():
+    # Reads precomputed ranks from the materialized leaderboard table; names
+    # come from the joined user so renames are never stale
+    per_page = current_app.config['LEADERBOARD_PAGE_SIZE']
+    page = max(request.args.get('page', 1, type=int), 1)
+    rows = LeaderboardEntry.query.join(LeaderboardEntry.user)\
+        .options(contains_eager(LeaderboardEntry.user))\
+        .order_by(LeaderboardEntry.rank, LeaderboardEntry.user_id)\
+        .offset((page - 1) * per_page).limit(per_page + 1).all()
+    has_next = len(rows) > per_page
+    return render_template("leaderboard/leaderboard.html", rows=rows[:per_page],
+                           page=page, has_next=has_next)
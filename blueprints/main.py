@@ -0,0 +1,193 @@
+"""Home, projects, profiles, clubs/chapters directory, user search and uploaded files."""
+from flask import Blueprint, render_template, redirect, url_for, request, flash, abort
+from flask_login import login_required, current_user
+from sqlalchemy.orm import joinedload
+
+import people_search
+import storage
+from directory import get_directory
+from helpers import admin_required
+from page_cache import bump_with, cached_page
+from models import db, User, Project, Event, Club, StudentChapter
+
+bp = Blueprint('main', __name__)
+
+# The project lists show owner names, but are keyed on Project alone: the user
+# table is written on every DM (unread counts) and login, which would evict them
+# constantly. Renaming a user bumps the project pages instead.
+bump_with(User.name, Project)
+
+
+@bp.route('/')
+@cached_page(Project, Event)
+def index():
+    projects = Project.query.order_by(Project.created_at.desc()).limit(6).all()
+    events = Event.query.order_by(Event.date).limit(5).all()
+    return render_template('index.html', projects=projects, events=events)
+
+
+@bp.route('/projects')
+@cached_page(Project)
+def projects():
+    all_projects = Project.query.options(joinedload(Project.owner)).order_by(Project.created_at.desc()).all()
+    return render_template('projects/projects.html', projects=all_projects)
+
+
+@bp.route('/project/<int:project_id>')
+def view_project(project_id):
+    p = Project.query.get_or_404(project_id)
+    return render_template('projects/project_detail.html', p=p)
+
+
+@bp.route('/profile')
+@bp.route('/profile/<int:user_id>')
+def profile(user_id=None):
+    if user_id is None:
+        if not current_user.is_authenticated:
+            return redirect(url_for('auth.login'))
+        user = current_user
+    else:
+        user = User.query.get_or_404(user_id)
+    return render_template('user/profile.html', user=user)
+
+
+@bp.route('/user/<int:user_id>')
+def view_user(user_id):
+    user = User.query.get_or_404(user_id)
+    return render_template('user/view_user.html', user=user)
+
+
+@bp.route('/user/<int:user_id>/edit', methods=['GET', 'POST'])
+def edit_user(user_id):
+    user = User.query.get_or_404(user_id)
+    if request.method == 'POST':
+        user.name = request.form.get('name')
+        user.email = request.form.get('email')
+        user.mobile = request.form.get('mobile')
+        user.roll_number = request.form.get('roll_number')
+        user.college = request.form.get('college')
+        user.branch = request.form.get('branch')
+        user.year = request.form.get('year')
+        user.skills = request.form.get('skills')
+        user.codechef = request.form.get('codechef')
+        user.hackerrank = request.form.get('hackerrank')
+        user.leetcode = request.form.get('leetcode')
+        db.session.commit()
+        flash('User details updated successfully!', 'success')
+        return redirect(url_for('main.view_user', user_id=user.id))
+    return render_template('user/edit_user.html', user=user)
+
+
+@bp.route('/clubs')
+@cached_page(Club)
+def clubs():
+    return render_template('community/clubs.html', clubs=get_directory().clubs)
+
+
+@bp.route('/clubs/<int:club_id>')
+def club_detail(club_id):
+    club = get_directory().clubs_by_id.get(club_id)
+    if not club:
+        abort(404)
+    return render_template('community/club_detail.html', club=club)
+
+
+@bp.route('/chapters')
+@cached_page(StudentChapter)
+def chapters():
+    return render_template('community/chapters.html', chapters=get_directory().chapters)
+
+
+@bp.route('/chapters/<int:chapter_id>')
+def chapter_detail(chapter_id):
+    chapter = get_directory().chapters_by_id.get(chapter_id)
+    if not chapter:
+        abort(404)
+    return render_template('community/chapter_detail.html', chapter=chapter)
+
+
+@bp.route('/projecthub')
+@cached_page(Project)
+def projecthub():
+    all_projects = Project.query.options(joinedload(Project.owner)).order_by(Project.created_at.desc()).all()
+    return render_template('projects/projecthub.html', projects=all_projects)
+
+
+@bp.route('/create_project', methods=['GET', 'POST'])
+def create_project():
+    if request.method == 'POST':
+        title = request.form.get('title')
+        description = request.form.get('description')
+        github = request.form.get('github')
+        owner_email = request.form.get('owner_email')
+
+        owner = User.query.filter_by(email=owner_email).first()
+        if not owner:
+            owner = User(name=owner_email.split('@')[0], email=owner_email)
+            db.session.add(owner)
+            db.session.commit()
+
+        p = Project(title=title, description=description, github=github, owner=owner)
+        db.session.add(p)
+        db.session.commit()
+        flash('Project created', 'success')
+        return redirect(url_for('main.projects'))
+
+    return render_template('projects/create_project.html')
+
+
+@bp.route('/upload_project', methods=['GET', 'POST'])
+@login_required
+def upload_project():
+    if request.method == 'POST':
+        title = request.form.get('title')
+        idea = request.form.get('idea')
+        tech = request.form.get('tech')
+        github = request.form.get('github')
+        demo = request.form.get('demo')
+
+        if not title or not idea:
+            flash("Project title and idea are required.", "danger")
+            return redirect(url_for('main.upload_project'))
+
+        p = Project(
+            title=title,
+            description=idea + (f"\n\nTech Stack: {tech}" if tech else ""),
+            github=github,
+            owner=current_user
+        )
+        if demo:
+            p.description += f"\n\nDemo Video: {demo}"
+
+        db.session.add(p)
+        db.session.commit()
+        flash("Project uploaded successfully!", "success")
+        return redirect(url_for('main.projecthub'))
+
+    return render_template('projects/upload_project.html')
+
+
+@bp.route('/uploads/<path:filename>')
+def uploaded_file(filename):
+    """Serve (local) or redirect to (S3) an uploaded blob."""
+    try:
+        return storage.storage_for(filename).response(filename)
+    except storage.StorageError:
+        abort(404)
+
+
+@bp.route('/search')
+def search_users():
+    q = request.args.get('q', '').strip()
+    results = []
+    if q:
+        # Exact skill matches + indexed name/username lookups, best match first
+        results = people_search.search_users(q, limit=50)
+    return render_template('user/search_results.html', query=q, results=results)
+
+
+@bp.route('/users')
+@admin_required
+def list_users():
+    users = User.query.order_by(User.created_at.desc()).all()
+    return render_template('user/users.html', users=users)
@@ -0,0 +1,140 @@
+"""Direct messages between users and the unread badge."""
+from flask import Blueprint, render_template, redirect, url_for, request, flash, current_app, jsonify
+from flask_login import login_required, current_user
+from sqlalchemy.orm import joinedload
+
+from helpers import paginate_messages
+from models import db, User, DirectMessage, Conversation
+
+bp = Blueprint('messaging', __name__)
+
+
+@bp.app_context_processor
+def inject_unread_count():
+    """Make unread message count available in all templates."""
+    if hasattr(current_user, 'is_authenticated') and current_user.is_authenticated:
+        # The counter column is loaded with current_user on every request: no extra query,
+        # and never stale across workers
+        return {'unread_msg_count': max(current_user.unread_msg_count or 0, 0)}
+    return {'unread_msg_count': 0}
+
+
+def conversation_query(user_id, other_id):
+    """All direct messages between two users, in either direction."""
+    return DirectMessage.query.filter(
+        ((DirectMessage.sender_id == user_id) & (DirectMessage.receiver_id == other_id)) |
+        ((DirectMessage.sender_id == other_id) & (DirectMessage.receiver_id == user_id))
+    )
+
+
+@bp.route('/messages')
+@login_required
+def inbox():
+    """Show all conversations grouped by the other user."""
+    # One indexed query over the conversation summaries, partners joined in
+    rows = Conversation.for_user(current_user.id).options(
+        joinedload(Conversation.user_a),
+        joinedload(Conversation.user_b)
+    ).all()
+
+    conversations = []
+    for convo in rows:
+        conversations.append({
+            'partner': convo.partner_of(current_user.id),
+            'last_time': convo.last_message_at,
+            'unread': convo.unread_for(current_user.id),
+            'last_message': convo.last_message_preview or ''
+        })
+
+    return render_template('messaging/inbox.html', conversations=conversations)
+
+
+@bp.route('/messages/<int:user_id>', methods=['GET', 'POST'])
+@login_required
+def conversation(user_id):
+    """View conversation with a specific user and send messages."""
+    other_user = User.query.get_or_404(user_id)
+    if other_user.id == current_user.id:
+        flash("You can't message yourself.", 'warning')
+        return redirect(url_for('messaging.inbox'))
+
+    if request.method == 'POST':
+        content = request.form.get('content', '').strip()
+        if content:
+            msg = DirectMessage(
+                sender_id=current_user.id,
+                receiver_id=other_user.id,
+                content=content
+            )
+            db.session.add(msg)
+            db.session.flush()
+            Conversation.record_message(msg)
+            db.session.commit()
+        return redirect(url_for('messaging.conversation', user_id=user_id))
+
+    # Mark incoming messages as read
+    newly_read = DirectMessage.query.filter_by(
+        sender_id=other_user.id, receiver_id=current_user.id, is_read=False
+    ).update({'is_read': True})
+    Conversation.mark_read(current_user.id, other_user.id, newly_read)
+    db.session.commit()
+
+    # Latest page of messages between these two users; older pages come from conversation_history
+    messages, next_cursor = paginate_messages(
+        conversation_query(current_user.id, other_user.id),
+        DirectMessage,
+        limit=current_app.config['CHAT_PAGE_SIZE']
+    )
+
+    return render_template('messaging/conversation.html', other_user=other_user, messages=messages,
+                           next_cursor=next_cursor)
+
+
+@bp.route('/messages/<int:user_id>/history')
+@login_required
+def conversation_history(user_id):
+    """JSON page of older direct messages, for scroll-up loading."""
+    other_user = User.query.get_or_404(user_id)
+    messages, next_cursor = paginate_messages(
+        conversation_query(current_user.id, other_user.id),
+        DirectMessage,
+        cursor=request.args.get('before'),
+        limit=current_app.config['CHAT_PAGE_SIZE']
+    )
+    return jsonify({
+        'messages': [{
+            'id': m.id,
+            'sender_id': m.sender_id,
+            'content': m.content,
+            'created_at': m.created_at.isoformat(),
+            'time': m.created_at.strftime('%d %b, %H:%M'),
+        } for m in messages],
+        'next_cursor': next_cursor
+    })
+
+
+@bp.route('/messages/<int:user_id>/send', methods=['POST'])
+@login_required
+def send_message(user_id):
+    """Quick send message from another page (e.g. user profile)."""
+    other_user = User.query.get_or_404(user_id)
+    if other_user.id == current_user.id:
+        flash("You can't message yourself.", 'warning')
+        return redirect(url_for('messaging.inbox'))
+
+    content = request.form.get('content', '').strip()
+    if not content:
+        flash('Message cannot be empty.', 'danger')
+        return redirect(url_for('messaging.conversation', user_id=user_id))
+
+    msg = DirectMessage(
+        sender_id=current_user.id,
+        receiver_id=other_user.id,
+        content=content
+    )
+    db.session.add(msg)
+    db.session.flush()
+    Conversation.record_message(msg)
+    db.session.commit()
+    flash('Message sent!', 'success')
+    return redirect(url_for('messaging.conversation', user_id=user_id))
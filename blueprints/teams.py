@@ -0,0 +1,240 @@
+"""TeamUp: teams, team chat, invitations and join requests."""
+from datetime import datetime
+
+from flask import Blueprint, render_template, redirect, url_for, request, flash, current_app, abort, jsonify
+from flask_login import login_required, current_user
+from sqlalchemy.orm import joinedload, selectinload
+
+from helpers import paginate_messages
+from models import db, User, Event, Team, TeamJoinRequest, TeamInvite, TeamMessage
+
+bp = Blueprint('teams', __name__)
+
+
+@bp.route('/teamup')
+def teamup():
+    # members and event in two batched queries instead of one per team card
+    teams = Team.query.options(selectinload(Team.members), joinedload(Team.event))\
+        .order_by(Team.id.desc()).all()
+    return render_template('teams/teamup.html', teams=teams)
+
+
+@bp.route('/team/create', methods=['GET', 'POST'])
+@login_required
+def team_create():
+    if request.method == 'POST':
+        name = request.form['name'].strip()
+        description = request.form.get('description', '').strip()
+        size_limit = int(request.form.get('size_limit', '4'))
+        event_id = request.form.get('event_id', '').strip()
+
+        if not name:
+            flash("Team name is required.", "danger")
+            return redirect(url_for('teams.team_create'))
+
+        team = Team(
+            name=name,
+            description=description,
+            leader_id=current_user.id,
+            size_limit=size_limit,
+            event_id=int(event_id) if event_id else None
+        )
+        # creator joins as first member
+        team.members.append(current_user)
+
+        db.session.add(team)
+        db.session.commit()
+        flash("Team created successfully!", "success")
+        return redirect(url_for('teams.teamup'))
+
+    # Fetch upcoming/ongoing events for dropdown
+    upcoming_events = Event.query.filter(Event.date >= datetime.utcnow()).order_by(Event.date).all()
+    return render_template('teams/create_team.html', events=upcoming_events)
+
+
+@bp.route('/teamup/<int:team_id>')
+def view_team(team_id):
+    team = Team.query.get_or_404(team_id)
+    # pending join requests for this team (leader will see controls on page)
+    pending_requests = TeamJoinRequest.query.filter_by(team_id=team.id, status='pending').all()
+    return render_template('teams/view_team.html', team=team, pending_requests=pending_requests)
+
+
+@bp.route('/teamup/<int:team_id>/chat', methods=['GET', 'POST'])
+@login_required
+def team_chat(team_id):
+    team = Team.query.get_or_404(team_id)
+    # Only team members can access the chat
+    if current_user not in team.members:
+        flash("You must be a team member to access the group chat.", "warning")
+        return redirect(url_for('teams.view_team', team_id=team_id))
+
+    if request.method == 'POST':
+        content = request.form.get('content', '').strip()
+        if content:
+            msg = TeamMessage(
+                team_id=team.id,
+                sender_id=current_user.id,
+                content=content
+            )
+            db.session.add(msg)
+            db.session.commit()
+        return redirect(url_for('teams.team_chat', team_id=team_id))
+
+    messages, next_cursor = paginate_messages(
+        TeamMessage.query.options(joinedload(TeamMessage.sender)).filter_by(team_id=team.id),
+        TeamMessage,
+        limit=current_app.config['CHAT_PAGE_SIZE']
+    )
+    return render_template('teams/team_chat.html', team=team, messages=messages,
+                           next_cursor=next_cursor)
+
+
+@bp.route('/teamup/<int:team_id>/chat/history')
+@login_required
+def team_chat_history(team_id):
+    """JSON page of older team messages, for scroll-up loading."""
+    team = Team.query.get_or_404(team_id)
+    if current_user not in team.members:
+        abort(403)
+    messages, next_cursor = paginate_messages(
+        TeamMessage.query.options(joinedload(TeamMessage.sender)).filter_by(team_id=team.id),
+        TeamMessage,
+        cursor=request.args.get('before'),
+        limit=current_app.config['CHAT_PAGE_SIZE']
+    )
+    return jsonify({
+        'messages': [{
+            'id': m.id,
+            'sender_id': m.sender_id,
+            'sender_name': m.sender.name or m.sender.username,
+            'content': m.content,
+            'created_at': m.created_at.isoformat(),
+            'time': m.created_at.strftime('%b %d, %I:%M %p'),
+        } for m in messages],
+        'next_cursor': next_cursor
+    })
+
+
+@bp.route('/teamup/<int:team_id>/invite', methods=['POST'])
+@login_required
+def invite_user(team_id):
+    team = Team.query.get_or_404(team_id)
+
+    # only leader can invite (optional; remove if not required)
+    if current_user.id != team.leader_id:
+        abort(403)
+
+    username = request.form.get("username", "").strip()
+    user = User.query.filter_by(username=username).first()
+    if not user:
+        flash("User not found.", "danger")
+        return redirect(url_for('teams.view_team', team_id=team_id))
+
+    if user in team.members:
+        flash("User is already in the team.", "info")
+        return redirect(url_for('teams.view_team', team_id=team_id))
+
+    existing = TeamInvite.query.filter_by(team_id=team.id, user_id=user.id).first()
+    if existing:
+        flash("User already invited.", "warning")
+        return redirect(url_for('teams.view_team', team_id=team_id))
+
+    invite = TeamInvite(team_id=team.id, user_id=user.id, sender_id=current_user.id)
+    db.session.add(invite)
+    db.session.commit()
+    flash("Invitation sent.", "success")
+    return redirect(url_for('teams.view_team', team_id=team_id))
+
+
+@bp.route('/teamup/invitations')
+@login_required
+def team_invitations():
+    invites = TeamInvite.query.filter_by(user_id=current_user.id).all()
+    return render_template('teams/team_invitations.html', invites=invites)
+
+
+@bp.route('/teamup/invite/<int:invite_id>/accept')
+@login_required
+def accept_invite(invite_id):
+    invite = TeamInvite.query.get_or_404(invite_id)
+    team = invite.team
+    # size limit check
+    if len(team.members) >= team.size_limit:
+        flash("Team is full!", "danger")
+        return redirect(url_for('teams.team_invitations'))
+    team.members.append(current_user)
+    db.session.delete(invite)
+    db.session.commit()
+    flash("You joined the team!", "success")
+    return redirect(url_for('teams.teamup'))
+
+
+@bp.route('/teamup/invite/<int:invite_id>/reject')
+@login_required
+def reject_invite(invite_id):
+    invite = TeamInvite.query.get_or_404(invite_id)
+    db.session.delete(invite)
+    db.session.commit()
+    flash("Invitation rejected.", "info")
+    return redirect(url_for('teams.team_invitations'))
+
+
+@bp.route('/team/<int:team_id>/join', methods=['POST'])
+@login_required
+def request_join(team_id):
+    team = Team.query.get_or_404(team_id)
+
+    if current_user in team.members:
+        flash("You are already in this team!", "info")
+        return redirect(url_for('teams.view_team', team_id=team_id))
+
+    if len(team.members) >= team.size_limit:
+        flash("Team is full!", "danger")
+        return redirect(url_for('teams.view_team', team_id=team_id))
+
+    existing = TeamJoinRequest.query.filter_by(
+        team_id=team_id, sender_id=current_user.id, status='pending'
+    ).first()
+    if existing:
+        flash("Join request already sent!", "warning")
+        return redirect(url_for('teams.view_team', team_id=team_id))
+
+    req = TeamJoinRequest(team_id=team_id, sender_id=current_user.id, status='pending')
+    db.session.add(req)
+    db.session.commit()
+    flash("Join request sent!", "success")
+    return redirect(url_for('teams.view_team', team_id=team_id))
+
+
+@bp.route('/team/join/<int:req_id>/accept')
+@login_required
+def accept_join(req_id):
+    req = TeamJoinRequest.query.get_or_404(req_id)
+    team = req.team
+
+    if current_user.id != team.leader_id:
+        abort(403)
+
+    if len(team.members) >= team.size_limit:
+        flash("Cannot accept — team is full!", "danger")
+        return redirect(url_for('teams.view_team', team_id=team.id))
+
+    team.members.append(req.sender)
+    req.status = "accepted"
+    db.session.commit()
+    flash("Member added!", "success")
+    return redirect(url_for('teams.view_team', team_id=team.id))
+
+
+@bp.route('/team/join/<int:req_id>/reject')
+@login_required
+def reject_join(req_id):
+    req = TeamJoinRequest.query.get_or_404(req_id)
+    team = req.team
+    if current_user.id != team.leader_id:
+        abort(403)
+    req.status = "rejected"
+    db.session.commit()
+    flash("Request rejected.", "info")
+    return redirect(url_for('teams.view_team', team_id=team.id))
@@ -0,0 +1,482 @@
+"""
+Batched, idempotent CSV import for clubs, student chapters and users.
+
+The CSV is read as a stream and handled BATCH_SIZE rows at a time:
+- each row is validated on its own; a bad row is recorded in the report with
+  its line number and skipped, the rest of the file still imports;
+- the batch's keys (club/chapter name, user email) are looked up in one
+  query, and rows are split into new, changed and unchanged;
+- new and changed rows are written with one INSERT ... ON CONFLICT DO UPDATE
+  per batch (SQLite and PostgreSQL), unchanged rows are not written at all;
+- each batch commits on its own, so an interrupted import can simply be run
+  again.
+
+Re-running the same file is a no-op. A user's password is only set when the
+account is created and never overwritten by a later import, so students who
+changed theirs keep it. New accounts' passwords, the import's default
+password included, are hashed with their own salt in a thread pool
+(hashlib's PBKDF2 releases the GIL) at Werkzeug's default cost. That is
+about a quarter second per hash per core, so hashing dominates a roster
+import: 10k new accounts take about 40 minutes on one core and 10 on four.
+Raise hash_workers (import_csv.py --workers) to the number of cores.
+
+Core inserts skip the session hooks in models.py, so the importers derive
+club/chapter link columns and users' skill tags themselves.
+"""
+import abc
+import csv
+import io
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from sqlalchemy import select, delete, insert as core_insert
+from sqlalchemy.exc import SQLAlchemyError
+from werkzeug.security import generate_password_hash
+
+import page_cache
+from helpers import EMAIL_RE, MOBILE_RE, PASSWORD_RE
+from models import db, upsert_insert, Club, StudentChapter, User, Skill, user_skills, EntityStats
+
+BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 1000
+
+
+class RowError(ValueError):
+    """A CSV row that can't be imported; the message is shown to the admin."""
+
+
+class ImportReport:
+    """Counts and per-row errors for one import run."""
+
+    def __init__(self, kind):
+        self.kind = kind
+        self.inserted = 0
+        self.updated = 0
+        self.unchanged = 0
+        self.failed = 0
+        self.errors = []  # (line number, message), first MAX_REPORTED_ERRORS only
+
+    def error(self, line, message):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((line, message))
+
+    @property
+    def rows(self):
+        return self.inserted + self.updated + self.unchanged + self.failed
+
+    def as_dict(self):
+        return {
+            'kind': self.kind,
+            'rows': self.rows,
+            'inserted': self.inserted,
+            'updated': self.updated,
+            'unchanged': self.unchanged,
+            'failed': self.failed,
+            'errors': [{'line': line, 'error': message} for line, message in self.errors],
+        }
+
+
+def normalize_header(name):
+    """'CLUBS NAMES ' / 'faculty_incharge' -> 'clubs names' / 'faculty incharge'."""
+    return ' '.join((name or '').replace('_', ' ').lower().split())
+
+
+def _upsert(model, key, rows, update_columns):
+    """INSERT ... ON CONFLICT (<key>) DO UPDATE for a list of row dicts with the same keys."""
+    insert = upsert_insert()
+    if insert is None:
+        raise RuntimeError(f"Bulk import needs SQLite or PostgreSQL, not {db.session.get_bind().dialect.name}")
+    stmt = insert(model.__table__)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[key],
+        set_={column: stmt.excluded[column] for column in update_columns},
+    )
+    db.session.execute(stmt, rows)
+
+
+class Importer(abc.ABC):
+    """
+    One importable model. Subclasses set `model`, `key` (the unique column
+    rows are matched on), `aliases` (column -> accepted CSV headers), `fields`
+    (columns compared and written on update) and `insert_only` (columns
+    written only when a row is created), and implement
+    clean(row) -> dict of column values or raise RowError.
+    """
+    model = None
+    kind = None
+    key = 'name'
+    aliases = {}
+    fields = ()
+    insert_only = ()
+
+    def __init__(self):
+        self.header_map = {}
+
+    def map_headers(self, fieldnames):
+        """CSV header -> column name for the headers we recognise; other columns are ignored."""
+        accepted = {alias: column for column, names in self.aliases.items() for alias in names}
+        self.header_map = {}
+        for header in fieldnames or []:
+            column = accepted.get(normalize_header(header))
+            if column and column not in self.header_map.values():
+                self.header_map[header] = column
+        key = self.key
+        if key not in self.header_map.values():
+            names = ', '.join(repr(n) for n in self.aliases[key])
+            raise RowError(f"No {key} column (expected one of {names})")
+
+    def values(self, row):
+        """Row values by column name, stripped; only for columns present in the file."""
+        return {column: (row.get(header) or '').strip() for header, column in self.header_map.items()}
+
+    def managed(self):
+        """Columns this file sets: the ones in its header plus anything derived from them."""
+        return set(self.header_map.values()) & set(self.fields)
+
+    @abc.abstractmethod
+    def clean(self, row):
+        """Column values for one CSV row; raises RowError if it can't be imported."""
+
+    def existing(self, keys):
+        """key -> {column: value} for rows already in the database."""
+        key_column = getattr(self.model, self.key)
+        columns = [getattr(self.model, c) for c in self.lookup_columns()]
+        result = db.session.execute(select(*columns).where(key_column.in_(keys)))
+        return {row._mapping[self.key]: dict(row._mapping) for row in result}
+
+    def lookup_columns(self):
+        return ('id', self.key) + tuple(c for c in self.fields if c != self.key)
+
+    def check_batch(self, batch, existing, report):
+        """Checks across rows or against the database (e.g. unique usernames); returns the rows that pass."""
+        return batch
+
+    def prepare_new(self, rows):
+        """Fill in insert-only columns (e.g. password hashes) for rows being created."""
+
+    def after_write(self, rows):
+        """Maintain data the Core insert skipped (e.g. skill tags) for rows just written."""
+
+
+class ClubImporter(Importer):
+    model = Club
+    kind = 'clubs'
+    aliases = {
+        'name': ('name', 'club', 'club name', 'clubs names'),
+        'description': ('description', 'desc'),
+        'contact': ('contact',),
+        'instagram': ('instagram', 'instagram link', 'insta'),
+        'youtube': ('youtube', 'youtube link', 'yt'),
+        'faculty_incharge': ('faculty incharge', 'faculty'),
+        'website': ('website', 'site'),
+    }
+    fields = ('name', 'description', 'contact', 'faculty_incharge', 'website',
+              'instagram_url', 'youtube_url', 'contact_url', 'website_url')
+
+    def managed(self):
+        columns = set(self.header_map.values())
+        managed = columns & set(self.fields)
+        if columns & {'contact', 'instagram', 'youtube'}:
+            managed |= {'contact', 'instagram_url', 'youtube_url', 'contact_url'}
+        if 'website' in columns:
+            managed.add('website_url')
+        return managed
+
+    def clean(self, row):
+        values = self.values(row)
+        if not values.get('name'):
+            raise RowError("Missing club name")
+        if len(values['name']) > 250:
+            raise RowError("Club name is longer than 250 characters")
+        instagram, youtube = values.pop('instagram', None), values.pop('youtube', None)
+        if instagram is not None or youtube is not None:
+            # Same 'Instagram: <url> | Youtube: <url>' text the club pages have always shown
+            socials = [f"{label}: {url}" for label, url in (('Instagram', instagram), ('Youtube', youtube)) if url]
+            values['contact'] = ' | '.join(socials) or values.get('contact', '')
+        for column in ('contact', 'faculty_incharge'):
+            if len(values.get(column) or '') > 200:
+                raise RowError(f"{column} is longer than 200 characters")
+        if len(values.get('website') or '') > 300:
+            raise RowError("website is longer than 300 characters")
+        club = Club(contact=values.get('contact'), website=values.get('website'))
+        club.normalize_links()
+        values.update(instagram_url=club.instagram_url, youtube_url=club.youtube_url,
+                      contact_url=club.contact_url, website_url=club.website_url)
+        return {c: (v if v != '' else None) for c, v in values.items()}
+
+
+class ChapterImporter(Importer):
+    model = StudentChapter
+    kind = 'chapters'
+    aliases = {
+        'name': ('name', 'chapter', 'chapter name', 'proffesional student chapters',
+                 'professional student chapters'),
+        'description': ('description', 'desc'),
+        'contact': ('contact', 'instagram', 'instagram link', 'insta'),
+        'associated_club': ('associated club', 'club'),
+        'student_lead': ('student lead', 'lead'),
+    }
+    fields = ('name', 'description', 'contact', 'associated_club', 'student_lead', 'contact_url')
+
+    def managed(self):
+        managed = super().managed()
+        if 'contact' in managed:
+            managed.add('contact_url')
+        return managed
+
+    def clean(self, row):
+        values = self.values(row)
+        if not values.get('name'):
+            raise RowError("Missing chapter name")
+        for column, limit in (('name', 250), ('associated_club', 250), ('contact', 200), ('student_lead', 200)):
+            if len(values.get(column) or '') > limit:
+                raise RowError(f"{column} is longer than {limit} characters")
+        chapter = StudentChapter(contact=values.get('contact'))
+        chapter.normalize_links()
+        values['contact_url'] = chapter.contact_url
+        return {c: (v if v != '' else None) for c, v in values.items()}
+
+
+class UserImporter(Importer):
+    """
+    Student roster import. Email is the key; username defaults to the part of
+    the email before '@' and is only changed by a later import if the file has
+    a username column. Rows without a password get default_password.
+    """
+    model = User
+    kind = 'users'
+    key = 'email'
+    aliases = {
+        'email': ('email', 'email id', 'email address', 'mail'),
+        'name': ('name', 'full name', 'student name'),
+        'username': ('username', 'user name'),
+        'password': ('password',),
+        'mobile': ('mobile', 'phone', 'mobile number', 'phone number'),
+        'roll_number': ('roll number', 'roll no', 'roll no.', 'roll'),
+        'college': ('college',),
+        'branch': ('branch', 'department'),
+        'year': ('year',),
+        'skills': ('skills',),
+        'codechef': ('codechef',),
+        'hackerrank': ('hackerrank',),
+        'leetcode': ('leetcode',),
+    }
+    fields = ('email', 'name', 'username', 'mobile', 'roll_number', 'college', 'branch', 'year',
+              'skills', 'codechef', 'hackerrank', 'leetcode')
+    insert_only = ('username', 'password_hash')
+    limits = {'name': 120, 'email': 200, 'username': 100, 'mobile': 20, 'roll_number': 100,
+              'college': 200, 'branch': 200, 'year': 50, 'skills': 500,
+              'codechef': 100, 'hackerrank': 100, 'leetcode': 100}
+
+    def __init__(self, default_password=None, hash_workers=None):
+        super().__init__()
+        if default_password and not PASSWORD_RE.match(default_password):
+            raise ValueError("The default password doesn't meet the password rules")
+        self.default_password = default_password
+        self.hash_workers = hash_workers
+
+    def map_headers(self, fieldnames):
+        super().map_headers(fieldnames)
+        if 'name' not in self.header_map.values():
+            raise RowError("No name column")
+
+    def clean(self, row):
+        values = self.values(row)
+        email = values['email']
+        if not EMAIL_RE.match(email):
+            raise RowError(f"Invalid email {email!r}")
+        if not values.get('name'):
+            raise RowError("Missing name")
+        if not values.get('username'):
+            values['username'] = email.split('@', 1)[0]
+        if values.get('mobile') and not MOBILE_RE.match(values['mobile']):
+            raise RowError("Mobile number must be 10 digits")
+        password = values.pop('password', '') or self.default_password
+        if password and not PASSWORD_RE.match(password):
+            raise RowError("Password must be 8+ characters with upper, lower, digit and symbol")
+        for column, limit in self.limits.items():
+            if len(values.get(column) or '') > limit:
+                raise RowError(f"{column} is longer than {limit} characters")
+        values = {c: (v if v != '' else None) for c, v in values.items()}
+        values['_password'] = password
+        return values
+
+    def lookup_columns(self):
+        return super().lookup_columns() + ('password_hash',)
+
+    def check_batch(self, batch, existing, report):
+        """Drop rows that would give a username to a second account, in the file or the database."""
+        writes_username = 'username' in self.managed()
+        claims = [(line, values) for line, values in batch
+                  if writes_username or values['email'] not in existing]
+        taken = dict(db.session.execute(
+            select(User.username, User.email).where(User.username.in_({v['username'] for _, v in claims}))
+        ).all())
+        rejected = set()
+        for line, values in claims:
+            owner = taken.setdefault(values['username'], values['email'])
+            if owner != values['email']:
+                report.error(line, f"Username {values['username']!r} is already taken by another account")
+                rejected.add(line)
+        return [(line, values) for line, values in batch if line not in rejected]
+
+    def prepare_new(self, rows):
+        """
+        Hash new accounts' passwords in parallel, the default password too: each
+        account gets its own salt, so the table doesn't show who still uses it.
+        Rows with no password get an '_error'.
+        """
+        todo = []
+        for values in rows:
+            if not values['_password']:
+                values['_error'] = "No password for a new account (add a password column or a default password)"
+            elif 'password_hash' not in values:
+                todo.append(values)
+        if not todo:
+            return
+        with ThreadPoolExecutor(max_workers=self.hash_workers) as pool:
+            hashes = pool.map(generate_password_hash, [values['_password'] for values in todo])
+            for values, password_hash in zip(todo, hashes):
+                values['password_hash'] = password_hash
+
+    def after_write(self, rows):
+        """Rebuild user_skills for the written rows from their skills text."""
+        if 'skills' not in self.managed():
+            return
+        ids = dict(db.session.execute(
+            select(User.email, User.id).where(User.email.in_([values['email'] for values in rows]))
+        ).all())
+        wanted = {ids[values['email']]: Skill.normalize(values.get('skills')) for values in rows}
+        names = sorted({name for skill_names in wanted.values() for name in skill_names})
+        skills = {skill.name: skill for skill in Skill.get_or_create_all(names)}
+        db.session.flush()
+        db.session.execute(delete(user_skills).where(user_skills.c.user_id.in_(list(wanted))))
+        links = [{'user_id': user_id, 'skill_id': skills[name].id}
+                 for user_id, skill_names in wanted.items() for name in skill_names]
+        if links:
+            db.session.execute(core_insert(user_skills), links)
+
+
+IMPORTERS = {importer.kind: importer for importer in (ClubImporter, ChapterImporter, UserImporter)}
+
+
+def _write_batch(importer, batch, report):
+    """Classify, write and commit one batch of (line, values) rows."""
+    model, key = importer.model, importer.key
+    existing = importer.existing([values[key] for _, values in batch])
+    batch = importer.check_batch(batch, existing, report)
+    managed = importer.managed()
+    timestamps = ['created_at'] + (['updated_at'] if hasattr(model, 'updated_at') else [])
+
+    new, changed = [], []
+    for line, values in batch:
+        current = existing.get(values[key])
+        if current is None:
+            new.append((line, values))
+        elif any(values.get(c) != current.get(c) for c in managed):
+            changed.append((line, values, current))
+        else:
+            report.unchanged += 1
+    importer.prepare_new([values for _, values in new])
+
+    # One statement for the batch, so every row carries the same columns. For
+    # changed rows the insert-only ones hold the current values; they'd only be
+    # used if the row disappeared since the lookup.
+    now = datetime.utcnow()
+    rows, written = [], []
+    for line, values in new:
+        if values.get('_error'):
+            report.error(line, values['_error'])
+            continue
+        row = {c: values.get(c) for c in managed | set(importer.insert_only)}
+        rows.append(dict(row, **{c: now for c in timestamps}))
+        written.append((line, values, 'inserted'))
+    for line, values, current in changed:
+        row = {c: current.get(c) for c in importer.insert_only}
+        row.update({c: values.get(c) for c in managed})
+        rows.append(dict(row, **{c: now for c in timestamps}))
+        written.append((line, values, 'updated'))
+    if not rows:
+        return
+
+    update_columns = sorted(managed - {key}) + timestamps[1:]
+    inserted = sum(1 for _, _, outcome in written if outcome == 'inserted')
+    counter = EntityStats.counter_for(model)
+    try:
+        _upsert(model, key, rows, update_columns)
+        importer.after_write([values for _, values, _ in written])
+        if inserted and counter:
+            # Core inserts skip the flush hook that keeps the dashboard counters
+            EntityStats.add({counter: (inserted, inserted if counter in EntityStats.WEEKLY else 0)})
+        db.session.commit()
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        if len(written) == 1:
+            report.error(written[0][0], f"Database rejected the row: {getattr(e, 'orig', e)}")
+            return
+        # Something only the database caught (a concurrent write, a constraint
+        # we don't check): redo the batch row by row so only those rows fail
+        for line, values, _ in written:
+            _write_batch(importer, [(line, values)], report)
+        return
+    for _, _, outcome in written:
+        setattr(report, outcome, getattr(report, outcome) + 1)
+
+
+def import_csv(importer, stream, batch_size=BATCH_SIZE):
+    """
+    Import a text CSV stream with the given importer; returns an ImportReport.
+    A file without the key column is reported as a single error on line 1.
+    """
+    report = ImportReport(importer.kind)
+    reader = csv.DictReader(stream)
+    try:
+        importer.map_headers(reader.fieldnames)
+    except RowError as e:
+        report.error(1, str(e))
+        return report
+
+    key = importer.key
+    seen = {}  # key -> first line, for duplicates within the file
+    batch = []
+    for row in reader:
+        line = reader.line_num
+        if not any(isinstance(v, str) and v.strip() for v in row.values()):
+            continue
+        try:
+            values = importer.clean(row)
+        except RowError as e:
+            report.error(line, str(e))
+            continue
+        first = seen.setdefault(values[key], line)
+        if first != line:
+            report.error(line, f"Duplicate {key} {values[key]!r} (first on line {first})")
+            continue
+        batch.append((line, values))
+        if len(batch) >= batch_size:
+            _write_batch(importer, batch, report)
+            batch = []
+    if batch:
+        _write_batch(importer, batch, report)
+
+    if report.inserted or report.updated:
+        tables = [importer.model.__tablename__]
+        if importer.model is User:
+            tables.append(user_skills.name)
+        page_cache.bump(*tables)
+    return report
+
+
+def import_file(kind, path, batch_size=BATCH_SIZE, **options):
+    """Import a CSV file from disk (a UTF-8 BOM is fine)."""
+    importer = IMPORTERS[kind](**options)
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        return import_csv(importer, f, batch_size)
+
+
+def import_upload(kind, file_storage, batch_size=BATCH_SIZE, **options):
+    """Import an uploaded CSV (werkzeug FileStorage) without reading it all into memory."""
+    importer = IMPORTERS[kind](**options)
+    stream = io.TextIOWrapper(file_storage.stream, encoding='utf-8-sig', newline='')
+    return import_csv(importer, stream, batch_size)
@@ -15,6 +15,69 @@ class Config:
 
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+    # Engine/pool profile (db_engine.py): 'serverless', 'serverless-nopool' or 'server'.
+    # Defaults to 'serverless' on Vercel and 'server' (gunicorn/dev) elsewhere.
+    DEPLOY_PROFILE = os.environ.get('DEPLOY_PROFILE') or ('serverless' if os.environ.get('VERCEL') else 'server')
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 5))        # per gunicorn worker
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 10))
+    DB_CONNECT_TIMEOUT = 5    # seconds
+    DB_SLOW_ACQUIRE_MS = 200  # log connection acquisitions slower than this
+
+    # Per-request query counts/DB time (query_stats.py): Server-Timing, log line, /admin/queries
+    QUERY_STATS_ENABLED = os.environ.get('QUERY_STATS_ENABLED', '1') != '0'
+    N_PLUS_ONE_THRESHOLD = 5  # same statement shape this many times in one request = likely N+1
+
     UPLOAD_FOLDER = os.path.join(basedir, "instances", "uploads")
+    # Raw event poster uploads (posters.py); never served, only their re-encoded variants are
+    POSTER_ORIGINALS_FOLDER = os.path.join(basedir, "instances", "posters")
     MAX_CONTENT_LENGTH = 8 * 1024 * 1024  # 8 MB limit
     ALLOWED_EXTENSIONS = {'pdf', 'png', 'jpg', 'jpeg'}
+
+    # Forum comment tree cut-offs (deeper/wider threads get a "load more" link)
+    COMMENT_TREE_MAX_DEPTH = 5
+    COMMENT_TREE_MAX_REPLIES = 10
+
+    # Messages per page in DMs and team chat (older pages load on scroll)
+    CHAT_PAGE_SIZE = 50
+
+    # Rows per leaderboard page
+    LEADERBOARD_PAGE_SIZE = 100
+
+    # Forum search: 'auto' picks Postgres tsvector / SQLite FTS5 by database, 'like' forces a plain scan
+    FORUM_SEARCH_BACKEND = os.environ.get("FORUM_SEARCH_BACKEND", "auto")
+    # Weight of log(vote score) blended into text relevance (normalized to 0..1)
+    FORUM_SEARCH_SCORE_WEIGHT = 0.1
+
+    # Widest date window /api/events will serve in one request
+    CALENDAR_FEED_MAX_DAYS = 400
+    # Longest multi-day event (end_date - date); the feed only scans events starting this long before its window
+    EVENT_MAX_DAYS = 366
+
+    # Events per section (upcoming / past) on one page of /events
+    EVENTS_PAGE_SIZE = 12
+
+    # Rendered-page cache for anonymous visitors on public pages (page_cache.py)
+    PAGE_CACHE_ENABLED = os.environ.get('PAGE_CACHE_ENABLED', '1') != '0'
+    PAGE_CACHE_TTL = 60  # seconds; bounds staleness across worker processes
+
+    # How often the in-memory clubs/chapters directory checks the DB for outside writes
+    DIRECTORY_CHECK_SECONDS = 60
+
+    # Serve static files through static/dist/manifest.json (scripts/build_assets.py)
+    ASSET_FINGERPRINTING = os.environ.get('ASSET_FINGERPRINTING', '1') != '0'
+
+    # Upload storage backend for resumes/certificates: 'local' (UPLOAD_FOLDER) or 's3' (needs boto3)
+    UPLOAD_STORAGE = os.environ.get('UPLOAD_STORAGE', 'local')
+    UPLOAD_S3_BUCKET = os.environ.get('UPLOAD_S3_BUCKET')
+    UPLOAD_S3_ENDPOINT_URL = os.environ.get('UPLOAD_S3_ENDPOINT_URL')  # R2/MinIO; unset for AWS
+    UPLOAD_S3_REGION = os.environ.get('UPLOAD_S3_REGION')
+    UPLOAD_S3_PREFIX = os.environ.get('UPLOAD_S3_PREFIX', 'uploads/')
+    UPLOAD_URL_EXPIRES = 300  # seconds a presigned download link stays valid
+
+    # Admin dashboard counters (EntityStats) are recounted from the tables at most this often
+    STATS_RECONCILE_SECONDS = 3600
+
+    # Users with more rows of content than this are deleted by a background job (user_deletion.py),
+    # USER_DELETE_CHUNK_SIZE rows per transaction
+    USER_DELETE_SYNC_LIMIT = 2000
+    USER_DELETE_CHUNK_SIZE = 500
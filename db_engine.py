@@ -0,0 +1,185 @@
+"""
+Database engine profiles.
+
+DEPLOY_PROFILE picks the SQLAlchemy engine options for where the app runs:
+
+- 'serverless' (default on Vercel): one pooled connection per instance plus a
+  little overflow, pre-pinged before use and recycled before Neon drops idle
+  connections, with a short connect timeout. Warm invocations reuse the
+  connection instead of paying TLS setup again.
+- 'serverless-nopool': NullPool, a fresh connection per checkout. For
+  platforms that freeze instances between requests for long stretches.
+- 'server' (default elsewhere, e.g. gunicorn): a QueuePool per worker sized by
+  DB_POOL_SIZE / DB_MAX_OVERFLOW, LIFO so spare connections can idle out.
+
+Pool options only apply to network databases; SQLite keeps Flask-SQLAlchemy's
+defaults.
+
+Every pool is wrapped to time connection acquisition (waiting for a pooled
+connection, pre-ping and any new connect). Totals are in `stats`, each
+request reports its own as a `Server-Timing: db-acquire` entry, and slow
+acquisitions are logged. warm_up() opens the first connection at import time
+so a cold start pays for it before the first request.
+"""
+import threading
+import time
+
+from flask import g, has_request_context
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import NullPool, QueuePool
+
+from models import db
+
+
+class ConnectionStats:
+    """Process-wide connection acquire/connect timings."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.acquires = 0
+            self.acquire_ms = 0.0
+            self.max_acquire_ms = 0.0
+            self.connects = 0
+            self.connect_ms = 0.0
+
+    def record_acquire(self, ms):
+        with self._lock:
+            self.acquires += 1
+            self.acquire_ms += ms
+            self.max_acquire_ms = max(self.max_acquire_ms, ms)
+
+    def record_connect(self, ms):
+        with self._lock:
+            self.connects += 1
+            self.connect_ms += ms
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'acquires': self.acquires,
+                'avg_acquire_ms': round(self.acquire_ms / self.acquires, 2) if self.acquires else 0.0,
+                'max_acquire_ms': round(self.max_acquire_ms, 2),
+                'connects': self.connects,
+                'avg_connect_ms': round(self.connect_ms / self.connects, 2) if self.connects else 0.0,
+            }
+
+
+stats = ConnectionStats()
+
+
+class TimedPoolMixin:
+    """Times Pool.connect(): queue wait + pre-ping + any new connection."""
+    slow_acquire_ms = None
+    logger = None
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            ms = (time.perf_counter() - start) * 1000
+            stats.record_acquire(ms)
+            if has_request_context():
+                g.db_acquire_ms = g.get('db_acquire_ms', 0.0) + ms
+            if self.slow_acquire_ms is not None and ms > self.slow_acquire_ms and self.logger:
+                self.logger.warning("Slow DB connection acquire: %.1f ms (%s)", ms, self.status())
+
+
+class TimedQueuePool(TimedPoolMixin, QueuePool):
+    pass
+
+
+class TimedNullPool(TimedPoolMixin, NullPool):
+    pass
+
+
+def engine_options(config):
+    """SQLALCHEMY_ENGINE_OPTIONS for the configured DEPLOY_PROFILE and database."""
+    uri = config['SQLALCHEMY_DATABASE_URI']
+    if uri.startswith('sqlite'):
+        return {}
+
+    profile = config.get('DEPLOY_PROFILE', 'server')
+    connect_args = {}
+    if uri.startswith('postgresql'):
+        connect_args = {
+            'connect_timeout': config.get('DB_CONNECT_TIMEOUT', 5),
+            # notice dead peers (Neon scale-to-zero) instead of hanging on them
+            'keepalives': 1,
+            'keepalives_idle': 30,
+            'keepalives_interval': 10,
+            'keepalives_count': 3,
+        }
+
+    if profile == 'serverless-nopool':
+        return {'poolclass': TimedNullPool, 'connect_args': connect_args}
+    if profile == 'serverless':
+        return {
+            'poolclass': TimedQueuePool,
+            'pool_size': 1,
+            'max_overflow': 2,
+            'pool_timeout': 10,
+            'pool_pre_ping': True,
+            'pool_recycle': 240,  # Neon closes idle connections after ~5 minutes
+            'connect_args': connect_args,
+        }
+    if profile == 'server':
+        return {
+            'poolclass': TimedQueuePool,
+            'pool_size': config.get('DB_POOL_SIZE', 5),
+            'max_overflow': config.get('DB_MAX_OVERFLOW', 10),
+            'pool_timeout': 30,
+            'pool_pre_ping': True,
+            'pool_recycle': 1800,
+            'pool_use_lifo': True,
+            'connect_args': connect_args,
+        }
+    raise ValueError(f"Unknown DEPLOY_PROFILE: {profile}")
+
+
+def init_app(app):
+    """Apply the profile's engine options; call before db.init_app(app)."""
+    if 'SQLALCHEMY_ENGINE_OPTIONS' not in app.config:
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app.config)
+    TimedPoolMixin.slow_acquire_ms = app.config.get('DB_SLOW_ACQUIRE_MS', 200)
+    TimedPoolMixin.logger = app.logger
+
+    @app.after_request
+    def report_db_acquire(response):
+        ms = g.get('db_acquire_ms')
+        if ms is not None:
+            response.headers.add('Server-Timing', f'db-acquire;dur={ms:.1f}')
+        return response
+
+
+@event.listens_for(Engine, 'do_connect')
+def _timed_dbapi_connect(dialect, conn_rec, cargs, cparams):
+    """Time new DBAPI connections (TCP + TLS + auth)."""
+    start = time.perf_counter()
+    connection = dialect.connect(*cargs, **cparams)
+    stats.record_connect((time.perf_counter() - start) * 1000)
+    return connection
+
+
+def warm_up(app):
+    """
+    Open (and pool) the first connection now rather than on the first request.
+    Returns the acquire time in ms, or None if the database isn't reachable;
+    the app still starts either way.
+    """
+    with app.app_context():
+        start = time.perf_counter()
+        try:
+            with db.engine.connect() as conn:
+                conn.execute(text('SELECT 1'))
+        except Exception as e:
+            app.logger.warning("Database warm-up failed: %s", e)
+            return None
+        ms = (time.perf_counter() - start) * 1000
+        app.logger.info("Database warm-up: %.1f ms (%s profile)", ms, app.config.get('DEPLOY_PROFILE'))
+        return ms
@@ -0,0 +1,99 @@
+"""
+In-memory clubs and chapters directory.
+
+Clubs and chapters change only when scripts/import_clubs_chapters.py runs or
+an admin edits a row, so the list and detail pages are served from an
+immutable snapshot held by each worker process instead of querying per hit.
+
+The snapshot is rebuilt when its version moves:
+- commits in this process bump the club/chapter table versions (page_cache),
+  which is checked on every call and costs nothing;
+- writes from other processes (the import script, other workers) change the
+  row count / latest updated_at of either table, which is checked with one
+  small query at most every DIRECTORY_CHECK_SECONDS.
+"""
+import threading
+import time
+from collections import namedtuple
+from types import MappingProxyType
+
+from flask import current_app
+from sqlalchemy import func, select
+
+from models import db, Club, StudentChapter
+from page_cache import table_version
+
+ClubEntry = namedtuple('ClubEntry', [
+    'id', 'name', 'description', 'faculty_incharge',
+    'contact', 'instagram_url', 'youtube_url', 'contact_url', 'website_url',
+])
+ChapterEntry = namedtuple('ChapterEntry', [
+    'id', 'name', 'associated_club', 'description', 'student_lead', 'contact', 'contact_url',
+])
+Directory = namedtuple('Directory', ['clubs', 'clubs_by_id', 'chapters', 'chapters_by_id'])
+
+_lock = threading.Lock()
+_state = {'directory': None, 'local_version': None, 'db_version': None, 'checked_at': 0.0}
+
+
+def _local_version():
+    return (table_version(Club.__table__.name)[0], table_version(StudentChapter.__table__.name)[0])
+
+
+def _db_version():
+    """Row count and latest update of both tables, in one round trip."""
+    return tuple(db.session.execute(select(
+        select(func.count(Club.id)).scalar_subquery(),
+        select(func.max(Club.updated_at)).scalar_subquery(),
+        select(func.count(StudentChapter.id)).scalar_subquery(),
+        select(func.max(StudentChapter.updated_at)).scalar_subquery(),
+    )).one())
+
+
+def _load():
+    clubs = tuple(
+        ClubEntry(c.id, c.name, c.description, c.faculty_incharge,
+                  c.contact, c.instagram_url, c.youtube_url, c.contact_url, c.website_url)
+        for c in Club.query.order_by(Club.name)
+    )
+    chapters = tuple(
+        ChapterEntry(c.id, c.name, c.associated_club, c.description, c.student_lead,
+                     c.contact, c.contact_url)
+        for c in StudentChapter.query.order_by(StudentChapter.name)
+    )
+    return Directory(
+        clubs=clubs,
+        clubs_by_id=MappingProxyType({c.id: c for c in clubs}),
+        chapters=chapters,
+        chapters_by_id=MappingProxyType({c.id: c for c in chapters}),
+    )
+
+
+def get_directory():
+    """The current Directory snapshot, reloading it only if its version moved."""
+    local_version = _local_version()
+    now = time.monotonic()
+    interval = current_app.config.get('DIRECTORY_CHECK_SECONDS', 60)
+    with _lock:
+        directory = _state['directory']
+        if (directory is not None and _state['local_version'] == local_version
+                and now - _state['checked_at'] < interval):
+            return directory
+
+    db_version = _db_version()
+    with _lock:
+        if directory is not None and _state['db_version'] == db_version:
+            _state.update(local_version=local_version, checked_at=now)
+            return directory
+
+    directory = _load()
+    with _lock:
+        _state.update(directory=directory, local_version=local_version,
+                      db_version=db_version, checked_at=now)
+    return directory
+
+
+def invalidate():
+    """Force the next get_directory() call to reload."""
+    with _lock:
+        _state.update(directory=None, local_version=None, db_version=None, checked_at=0.0)
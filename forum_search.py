@@ -0,0 +1,349 @@
+"""
+Full-text search for forum posts.
+
+Posts and comments are indexed as separate documents: one for each post
+(title and body) and one for each comment, keyed by (post_id, comment_id).
+Matches are rolled up to their post at query time, so a new comment costs
+one small insert no matter how long its thread is. The backend follows the
+database in use:
+
+- PostgreSQL: a forum_search table holding a weighted tsvector with a GIN index
+- SQLite: an FTS5 virtual table ranked with bm25
+- anything else, or a database that hasn't been migrated yet: the old LIKE scan
+
+Documents are refreshed inside the same transaction as the write by an
+after_flush hook that reindexes every post and comment whose text changed.
+scripts/build_forum_search.py creates the index and backfills it.
+"""
+import math
+import re
+import time
+
+from flask import current_app, has_app_context
+from sqlalchemy import bindparam, event, inspect, text
+from sqlalchemy.orm import joinedload
+
+from models import db, ForumPost, ForumComment
+
+SEARCH_TABLE = 'forum_search'
+
+# How many best-matching posts are fetched before blending in the vote score
+CANDIDATE_LIMIT = 200
+
+
+def _ids(statement):
+    return text(statement).bindparams(bindparam('ids', expanding=True))
+
+
+def _has_columns(conn, *names):
+    """Whether the search table exists in its current layout (older ones held one document per post)."""
+    inspector = inspect(conn)
+    if not inspector.has_table(SEARCH_TABLE):
+        return False
+    return set(names) <= {c['name'] for c in inspector.get_columns(SEARCH_TABLE)}
+
+
+class LikeSearch:
+    """Fallback: substring scan over title and content, no separate index."""
+    name = 'like'
+
+    def is_ready(self, conn):
+        return True
+
+    def create(self, conn):
+        pass
+
+    def reindex_posts(self, conn, post_ids):
+        pass
+
+    def reindex_comments(self, conn, comment_ids):
+        pass
+
+    def remove_posts(self, conn, post_ids):
+        pass
+
+    def remove_comments(self, conn, comment_ids):
+        pass
+
+    def candidates(self, conn, q, category_id, limit):
+        query = db.session.query(ForumPost.id).filter(
+            (ForumPost.title.contains(q)) | (ForumPost.content.contains(q))
+        )
+        if category_id:
+            query = query.filter(ForumPost.category_id == category_id)
+        rows = query.order_by(ForumPost.score.desc(), ForumPost.created_at.desc()).limit(limit)
+        return [(post_id, 1.0) for (post_id,) in rows]
+
+
+class PostgresSearch:
+    """
+    tsvector per document behind a GIN index: a post's row (comment_id 0)
+    weighs title A and body B, each comment's row is weighted C.
+    """
+    name = 'postgresql'
+
+    def is_ready(self, conn):
+        return _has_columns(conn, 'comment_id')
+
+    def create(self, conn):
+        if inspect(conn).has_table(SEARCH_TABLE) and not self.is_ready(conn):
+            conn.execute(text(f"DROP TABLE {SEARCH_TABLE}"))
+        conn.execute(text(f"""
+            CREATE TABLE IF NOT EXISTS {SEARCH_TABLE} (
+                post_id INTEGER NOT NULL REFERENCES forum_posts (id) ON DELETE CASCADE,
+                comment_id INTEGER NOT NULL DEFAULT 0,
+                document TSVECTOR NOT NULL,
+                PRIMARY KEY (post_id, comment_id)
+            )
+        """))
+        conn.execute(text(
+            f"CREATE INDEX IF NOT EXISTS ix_{SEARCH_TABLE}_document ON {SEARCH_TABLE} USING GIN (document)"
+        ))
+        conn.execute(text(
+            f"CREATE INDEX IF NOT EXISTS ix_{SEARCH_TABLE}_comment ON {SEARCH_TABLE} (comment_id)"
+        ))
+
+    def reindex_posts(self, conn, post_ids):
+        conn.execute(_ids(f"""
+            INSERT INTO {SEARCH_TABLE} (post_id, comment_id, document)
+            SELECT p.id, 0,
+                   setweight(to_tsvector('english', coalesce(p.title, '')), 'A') ||
+                   setweight(to_tsvector('english', coalesce(p.content, '')), 'B')
+            FROM forum_posts p
+            WHERE p.id IN :ids
+            ON CONFLICT (post_id, comment_id) DO UPDATE SET document = EXCLUDED.document
+        """), {'ids': list(post_ids)})
+
+    def reindex_comments(self, conn, comment_ids):
+        # delete first rather than upsert: a comment moved to another post changes its key
+        self.remove_comments(conn, comment_ids)
+        conn.execute(_ids(f"""
+            INSERT INTO {SEARCH_TABLE} (post_id, comment_id, document)
+            SELECT c.post_id, c.id, setweight(to_tsvector('english', coalesce(c.content, '')), 'C')
+            FROM forum_comments c
+            WHERE c.id IN :ids
+        """), {'ids': list(comment_ids)})
+
+    def remove_posts(self, conn, post_ids):
+        # the post's comment rows share its post_id and go with it
+        conn.execute(_ids(f"DELETE FROM {SEARCH_TABLE} WHERE post_id IN :ids"), {'ids': list(post_ids)})
+
+    def remove_comments(self, conn, comment_ids):
+        conn.execute(_ids(f"DELETE FROM {SEARCH_TABLE} WHERE comment_id IN :ids"), {'ids': list(comment_ids)})
+
+    def candidates(self, conn, q, category_id, limit):
+        category_filter = "AND p.category_id = :category_id" if category_id else ""
+        rows = conn.execute(text(f"""
+            SELECT s.post_id, sum(ts_rank(s.document, query)) AS relevance
+            FROM {SEARCH_TABLE} s
+            JOIN forum_posts p ON p.id = s.post_id,
+                 websearch_to_tsquery('english', :q) query
+            WHERE s.document @@ query {category_filter}
+            GROUP BY s.post_id
+            ORDER BY relevance DESC
+            LIMIT :limit
+        """), {'q': q, 'category_id': category_id, 'limit': limit})
+        return [(post_id, relevance) for post_id, relevance in rows]
+
+
+class SqliteSearch:
+    """
+    FTS5 table, columns weighted title > body > comments. A post's document
+    has rowid -post_id, a comment's has rowid = comment id; post_id is stored
+    alongside so comment matches roll up to their post.
+    """
+    name = 'sqlite'
+    BM25 = "bm25(0.0, 10.0, 4.0, 1.0)"
+
+    def is_ready(self, conn):
+        return _has_columns(conn, 'post_id')
+
+    def create(self, conn):
+        if inspect(conn).has_table(SEARCH_TABLE) and not self.is_ready(conn):
+            conn.execute(text(f"DROP TABLE {SEARCH_TABLE}"))
+        conn.execute(text(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} "
+            f"USING fts5(post_id UNINDEXED, title, content, comments, tokenize='porter unicode61')"
+        ))
+
+    def reindex_posts(self, conn, post_ids):
+        self.remove_posts(conn, post_ids)
+        conn.execute(_ids(f"""
+            INSERT INTO {SEARCH_TABLE} (rowid, post_id, title, content, comments)
+            SELECT -p.id, p.id, p.title, p.content, ''
+            FROM forum_posts p
+            WHERE p.id IN :ids
+        """), {'ids': list(post_ids)})
+
+    def reindex_comments(self, conn, comment_ids):
+        self.remove_comments(conn, comment_ids)
+        conn.execute(_ids(f"""
+            INSERT INTO {SEARCH_TABLE} (rowid, post_id, title, content, comments)
+            SELECT c.id, c.post_id, '', '', c.content
+            FROM forum_comments c
+            WHERE c.id IN :ids
+        """), {'ids': list(comment_ids)})
+
+    def remove_posts(self, conn, post_ids):
+        # rowid lookups only; the post's comments are removed by their own ids
+        conn.execute(_ids(f"DELETE FROM {SEARCH_TABLE} WHERE rowid IN :ids"), {'ids': [-i for i in post_ids]})
+
+    def remove_comments(self, conn, comment_ids):
+        conn.execute(_ids(f"DELETE FROM {SEARCH_TABLE} WHERE rowid IN :ids"), {'ids': list(comment_ids)})
+
+    def candidates(self, conn, q, category_id, limit):
+        # Quote every word so user input can't trip FTS5 query syntax; words are ANDed
+        terms = re.findall(r'\w+', q)
+        if not terms:
+            return []
+        match = ' '.join('"%s"' % t for t in terms)
+        category_filter = "AND p.category_id = :category_id" if category_id else ""
+        # bm25() can't be called under an aggregate; the rank column computes it per row instead
+        rows = conn.execute(text(f"""
+            SELECT {SEARCH_TABLE}.post_id, sum(-{SEARCH_TABLE}.rank) AS relevance
+            FROM {SEARCH_TABLE}
+            JOIN forum_posts p ON p.id = {SEARCH_TABLE}.post_id
+            WHERE {SEARCH_TABLE} MATCH :match AND {SEARCH_TABLE}.rank MATCH :bm25 {category_filter}
+            GROUP BY {SEARCH_TABLE}.post_id
+            ORDER BY relevance DESC
+            LIMIT :limit
+        """), {'match': match, 'bm25': self.BM25, 'category_id': category_id, 'limit': limit})
+        return [(post_id, relevance) for post_id, relevance in rows]
+
+
+BACKENDS = {
+    'postgresql': PostgresSearch(),
+    'sqlite': SqliteSearch(),
+    'like': LikeSearch(),
+}
+
+# (backend name, database url) -> True once the index table exists, else when it was last found missing
+_ready = {}
+
+# A missing index is looked for again after this long, so workers started
+# before scripts/build_forum_search.py pick it up without a restart
+NOT_READY_RECHECK_SECONDS = 30
+
+
+def get_backend(conn):
+    """Pick the backend for a connection, honouring FORUM_SEARCH_BACKEND ('auto' or 'like')."""
+    configured = 'auto'
+    if has_app_context():
+        configured = current_app.config.get('FORUM_SEARCH_BACKEND', 'auto')
+    if configured == 'like':
+        return BACKENDS['like']
+    return BACKENDS.get(conn.dialect.name, BACKENDS['like'])
+
+
+def _ready_backend(conn, recheck=False):
+    """
+    The configured backend if its index exists, otherwise the LIKE fallback.
+    Only an existing index is remembered for good; a missing one is checked
+    again after NOT_READY_RECHECK_SECONDS, or right away with recheck=True.
+    """
+    backend = get_backend(conn)
+    key = (backend.name, str(conn.engine.url))
+    state = _ready.get(key)
+    if state is not True and (recheck or state is None or
+                              time.monotonic() - state > NOT_READY_RECHECK_SECONDS):
+        state = True if backend.is_ready(conn) else time.monotonic()
+        _ready[key] = state
+    return backend if state is True else BACKENDS['like']
+
+
+def create_index(conn):
+    """Create the search index for this database; returns the backend used."""
+    backend = get_backend(conn)
+    backend.create(conn)
+    _ready.pop((backend.name, str(conn.engine.url)), None)
+    return backend
+
+
+def rebuild_index(conn, batch_size=500):
+    """Reindex every post and comment in batches; returns the number of posts indexed."""
+    backend = _ready_backend(conn)
+    post_ids = [post_id for (post_id,) in conn.execute(text("SELECT id FROM forum_posts ORDER BY id"))]
+    for i in range(0, len(post_ids), batch_size):
+        backend.reindex_posts(conn, post_ids[i:i + batch_size])
+    comment_ids = [comment_id for (comment_id,) in conn.execute(text("SELECT id FROM forum_comments ORDER BY id"))]
+    for i in range(0, len(comment_ids), batch_size):
+        backend.reindex_comments(conn, comment_ids[i:i + batch_size])
+    return len(post_ids)
+
+
+def update_index(conn, posts=(), comments=(), removed_posts=(), removed_comments=()):
+    """
+    Reindex the given posts and comments and drop the removed ones. The flush
+    hook below calls this; bulk deletes that bypass the session call it
+    themselves, passing the ids of every comment they delete.
+    """
+    removed_posts, removed_comments = set(removed_posts), set(removed_comments)
+    posts = set(posts) - removed_posts
+    comments = set(comments) - removed_comments
+    if not (posts or comments or removed_posts or removed_comments):
+        return
+    # checked afresh while the index looks missing: skipping these writes would lose them for good
+    backend = _ready_backend(conn, recheck=True)
+    if removed_posts:
+        backend.remove_posts(conn, removed_posts)
+    if removed_comments:
+        backend.remove_comments(conn, removed_comments)
+    if posts:
+        backend.reindex_posts(conn, posts)
+    if comments:
+        backend.reindex_comments(conn, comments)
+
+
+def search_posts(q, category_id=None, limit=50):
+    """
+    Posts matching q, best first. Text relevance is normalized to the best
+    match and blended with the post's vote score (FORUM_SEARCH_SCORE_WEIGHT
+    per log-unit of score), so a well-voted post can outrank a slightly
+    better textual match.
+    """
+    conn = db.session.connection()
+    candidates = _ready_backend(conn).candidates(conn, q, category_id, CANDIDATE_LIMIT)
+    if not candidates:
+        return []
+
+    relevance = dict(candidates)
+    top = max(relevance.values()) or 1.0
+    weight = current_app.config.get('FORUM_SEARCH_SCORE_WEIGHT', 0.1)
+    posts = ForumPost.query.options(
+        joinedload(ForumPost.author),
+        joinedload(ForumPost.category)
+    ).filter(ForumPost.id.in_(relevance.keys())).all()
+
+    def blended(post):
+        score = post.score or 0
+        return relevance[post.id] / top + weight * math.copysign(math.log1p(abs(score)), score)
+
+    posts.sort(key=lambda p: (blended(p), p.created_at), reverse=True)
+    return posts[:limit]
+
+
+def _changed(obj, *attrs):
+    state = inspect(obj)
+    return any(state.attrs[a].history.has_changes() for a in attrs)
+
+
+@event.listens_for(db.session, 'after_flush')
+def _reindex_after_flush(session, flush_context):
+    posts, comments, removed_posts, removed_comments = set(), set(), set(), set()
+    for obj in session.new:
+        if isinstance(obj, ForumPost):
+            posts.add(obj.id)
+        elif isinstance(obj, ForumComment):
+            comments.add(obj.id)
+    for obj in session.dirty:
+        if isinstance(obj, ForumPost) and _changed(obj, 'title', 'content'):
+            posts.add(obj.id)
+        elif isinstance(obj, ForumComment) and _changed(obj, 'content', 'post_id'):
+            comments.add(obj.id)
+    for obj in session.deleted:
+        if isinstance(obj, ForumPost):
+            removed_posts.add(obj.id)
+        elif isinstance(obj, ForumComment):
+            removed_comments.add(obj.id)
+    if posts or comments or removed_posts or removed_comments:
+        update_index(session.connection(), posts, comments, removed_posts, removed_comments)
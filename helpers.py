@@ -0,0 +1,103 @@
+"""
+Helpers shared by the blueprints: validation regexes, privilege decorators,
+upload checks and keyset cursors.
+"""
+import re
+from datetime import datetime
+from functools import wraps
+
+from flask import redirect, url_for, flash, current_app, abort
+from flask_login import login_required, current_user
+from sqlalchemy import tuple_
+
+# -------------------------
+# Validation regexes
+# -------------------------
+EMAIL_RE = re.compile(r"^[^@]+@[^@]+\.[^@]+$")
+PASSWORD_RE = re.compile(r'^(?=.*[a-z])(?=.*[A-Z])(?=.*\d)(?=.*[\W_]).{8,}$')
+MOBILE_RE = re.compile(r'^\d{10}$')
+
+
+# -------------------------
+# Privilege System
+# Level 1: Admin (all functions)
+# Level 2: Staff (forum announcements, calendar events)
+# Level 3: Coordinator (create events in events tab)
+# Level 4: Student/Default (doubts, study posts only in forum)
+# -------------------------
+def privilege_required(required_level):
+    """Decorator to require a minimum privilege level"""
+    def decorator(f):
+        @wraps(f)
+        @login_required
+        def decorated_function(*args, **kwargs):
+            if not current_user.is_authenticated:
+                flash('Please login to access this feature.', 'warning')
+                return redirect(url_for('auth.login'))
+            if current_user.privilege_level > required_level:
+                flash(f'Access denied. Privilege level {required_level} or higher required.', 'danger')
+                return redirect(url_for('main.index'))
+            return f(*args, **kwargs)
+        return decorated_function
+    return decorator
+
+def admin_required(f):
+    @wraps(f)
+    @login_required
+    def decorated_function(*args, **kwargs):
+        if not current_user.is_authenticated or current_user.privilege_level != 1:
+            flash('Access denied. Admin privileges required.', 'danger')
+            return redirect(url_for('main.index'))
+        return f(*args, **kwargs)
+    return decorated_function
+
+def staff_required(f):
+    """Level 2 or higher (Staff, Admin)"""
+    return privilege_required(2)(f)
+
+def coordinator_required(f):
+    """Level 3 or higher (Coordinator, Staff, Admin)"""
+    return privilege_required(3)(f)
+
+
+# -------------------------
+# Keyset pagination helpers
+# -------------------------
+def encode_cursor(timestamp, row_id):
+    """Opaque keyset cursor for a listing ordered by (timestamp, id): '<timestamp>_<id>'."""
+    return f"{timestamp.isoformat()}_{row_id}"
+
+
+def decode_cursor(cursor):
+    """Parse a cursor from encode_cursor(); aborts with 400 if malformed."""
+    try:
+        timestamp, row_id = cursor.rsplit('_', 1)
+        return datetime.fromisoformat(timestamp), int(row_id)
+    except (ValueError, AttributeError):
+        abort(400)
+
+
+def paginate_messages(query, model, cursor=None, limit=50):
+    """
+    Keyset-paginate a chat query on (created_at, id), newest page first.
+
+    Returns (messages, next_cursor): messages are oldest-first for display and
+    next_cursor points at the page of older messages, or is None at the start
+    of the history.
+    """
+    if cursor:
+        created_at, msg_id = decode_cursor(cursor)
+        query = query.filter(tuple_(model.created_at, model.id) < tuple_(created_at, msg_id))
+    rows = query.order_by(model.created_at.desc(), model.id.desc()).limit(limit + 1).all()
+    next_cursor = encode_cursor(rows[limit - 1].created_at, rows[limit - 1].id) if len(rows) > limit else None
+    rows = rows[:limit]
+    rows.reverse()
+    return rows, next_cursor
+
+
+# -------------------------
+# Uploads
+# -------------------------
+def allowed_file(filename):
+    return bool(filename) and '.' in filename and \
+           filename.rsplit('.', 1)[1].lower() in current_app.config['ALLOWED_EXTENSIONS']
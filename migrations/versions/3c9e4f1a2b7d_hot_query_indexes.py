@@ -0,0 +1,82 @@
+"""Composite and partial indexes for the hot filters, unique registrations
+
+Revision ID: 3c9e4f1a2b7d
+Revises:
+Create Date: 2026-10-17 10:00:00
+
+First managed revision. Databases so far were built with db.create_all() and
+the scripts/ migrations, and a fresh create_all() already has these indexes,
+so every step checks what exists first and the upgrade is safe on either.
+Tables that don't exist yet are skipped (create them with scripts/create_db.py).
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c9e4f1a2b7d'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+UNREAD_WHERE = {'sqlite_where': sa.text('is_read = 0'), 'postgresql_where': sa.text('NOT is_read')}
+
+# (index name, table, columns, dialect-specific options)
+INDEXES = [
+    ('ix_direct_messages_unread', 'direct_messages', ['receiver_id', 'sender_id'], UNREAD_WHERE),
+    ('ix_team_messages_team_created', 'team_messages', ['team_id', 'created_at'], {}),
+    ('ix_forum_posts_category_score', 'forum_posts', ['category_id', 'score', 'created_at'], {}),
+    ('ix_forum_posts_score_created', 'forum_posts', ['score', 'created_at'], {}),
+    ('ix_forum_comments_post_parent', 'forum_comments', ['post_id', 'parent_id'], {}),
+    ('ix_registrations_event', 'registrations', ['event_id'], {}),
+    ('ix_team_join_request_team_status', 'team_join_request', ['team_id', 'status'], {}),
+]
+
+
+def _tables():
+    return set(sa.inspect(op.get_bind()).get_table_names())
+
+
+def _indexes(table):
+    return {ix['name'] for ix in sa.inspect(op.get_bind()).get_indexes(table)}
+
+
+def _unique_constraints(table):
+    return {uc['name'] for uc in sa.inspect(op.get_bind()).get_unique_constraints(table)}
+
+
+def upgrade():
+    tables = _tables()
+
+    if 'registrations' in tables and 'unique_registration' not in _unique_constraints('registrations'):
+        # Registering twice used to be possible under concurrent clicks; keep the earliest row
+        op.execute(sa.text(
+            "DELETE FROM registrations WHERE id NOT IN "
+            "(SELECT MIN(id) FROM registrations GROUP BY user_id, event_id)"
+        ))
+        with op.batch_alter_table('registrations') as batch_op:
+            batch_op.create_unique_constraint('unique_registration', ['user_id', 'event_id'])
+
+    for name, table, columns, options in INDEXES:
+        if table in tables and name not in _indexes(table):
+            op.create_index(name, table, columns, **options)
+
+    # (post_id, parent_id) serves everything the single-column index did
+    if 'forum_comments' in tables and 'ix_forum_comments_post_id' in _indexes('forum_comments'):
+        op.drop_index('ix_forum_comments_post_id', table_name='forum_comments')
+
+
+def downgrade():
+    tables = _tables()
+
+    if 'forum_comments' in tables and 'ix_forum_comments_post_id' not in _indexes('forum_comments'):
+        op.create_index('ix_forum_comments_post_id', 'forum_comments', ['post_id'])
+
+    for name, table, columns, options in reversed(INDEXES):
+        # team_messages' index predates this revision
+        if name != 'ix_team_messages_team_created' and table in tables and name in _indexes(table):
+            op.drop_index(name, table_name=table)
+
+    if 'registrations' in tables and 'unique_registration' in _unique_constraints('registrations'):
+        with op.batch_alter_table('registrations') as batch_op:
+            batch_op.drop_constraint('unique_registration', type_='unique')
@@ -0,0 +1,76 @@
+"""User deletion jobs table, indexes for deleting a user's rows
+
+Revision ID: 5f7a1c9d3e24
+Revises: 8d2b6a0e5f13
+Create Date: 2026-10-17 16:00:00
+
+Deleting a user (user_deletion.py) finds their rows by author, sender,
+receiver and vote target; without these indexes each of those lookups
+scans the whole table.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5f7a1c9d3e24'
+down_revision = '8d2b6a0e5f13'
+branch_labels = None
+depends_on = None
+
+# (index name, table, columns)
+INDEXES = [
+    ('ix_forum_posts_author', 'forum_posts', ['author_id']),
+    ('ix_forum_comments_author', 'forum_comments', ['author_id']),
+    ('ix_forum_comments_parent', 'forum_comments', ['parent_id']),
+    ('ix_forum_votes_post', 'forum_votes', ['post_id']),
+    ('ix_forum_votes_comment', 'forum_votes', ['comment_id']),
+    ('ix_direct_messages_receiver', 'direct_messages', ['receiver_id']),
+    ('ix_team_messages_sender', 'team_messages', ['sender_id']),
+]
+
+
+def _tables():
+    return set(sa.inspect(op.get_bind()).get_table_names())
+
+
+def _indexes(table):
+    return {ix['name'] for ix in sa.inspect(op.get_bind()).get_indexes(table)}
+
+
+def upgrade():
+    tables = _tables()
+
+    for name, table, columns in INDEXES:
+        if table in tables and name not in _indexes(table):
+            op.create_index(name, table, columns)
+
+    if 'user_deletion_jobs' not in tables:
+        op.create_table(
+            'user_deletion_jobs',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('username', sa.String(length=100), nullable=True),
+            sa.Column('requested_by', sa.Integer(), nullable=True),
+            sa.Column('status', sa.String(length=20), nullable=False),
+            sa.Column('step', sa.String(length=50), nullable=True),
+            sa.Column('rows_total', sa.Integer(), nullable=False),
+            sa.Column('rows_done', sa.Integer(), nullable=False),
+            sa.Column('error', sa.Text(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.Column('updated_at', sa.DateTime(), nullable=True),
+            sa.Column('finished_at', sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint('id'),
+        )
+        op.create_index('ix_user_deletion_jobs_user_id', 'user_deletion_jobs', ['user_id'])
+
+
+def downgrade():
+    tables = _tables()
+
+    if 'user_deletion_jobs' in tables:
+        op.drop_table('user_deletion_jobs')
+
+    for name, table, columns in reversed(INDEXES):
+        if table in tables and name in _indexes(table):
+            op.drop_index(name, table_name=table)
@@ -0,0 +1,38 @@
+"""Admin dashboard counters table (entity_stats)
+
+Revision ID: 8d2b6a0e5f13
+Revises: 3c9e4f1a2b7d
+Create Date: 2026-10-17 14:00:00
+
+The single row is created by the first dashboard load (EntityStats.get) or
+scripts/reconcile_stats.py.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8d2b6a0e5f13'
+down_revision = '3c9e4f1a2b7d'
+branch_labels = None
+depends_on = None
+
+COUNTERS = ('users', 'projects', 'events', 'teams', 'clubs', 'chapters',
+            'users_this_week', 'projects_this_week', 'events_this_week')
+
+
+def upgrade():
+    if 'entity_stats' in sa.inspect(op.get_bind()).get_table_names():
+        return  # created by db.create_all()
+    op.create_table(
+        'entity_stats',
+        sa.Column('id', sa.Integer(), nullable=False),
+        *[sa.Column(name, sa.Integer(), nullable=False) for name in COUNTERS],
+        sa.Column('week_start', sa.Date(), nullable=True),
+        sa.Column('reconciled_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+
+
+def downgrade():
+    op.drop_table('entity_stats')
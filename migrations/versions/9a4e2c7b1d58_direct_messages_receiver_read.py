@@ -0,0 +1,52 @@
+"""Replace the partial unread DM index and the receiver index with one (receiver_id, is_read, sender_id)
+
+Revision ID: 9a4e2c7b1d58
+Revises: 5f7a1c9d3e24
+Create Date: 2026-10-17 18:00:00
+
+5f7a1c9d3e24 added ix_direct_messages_receiver for user deletion, and the
+planner then preferred it over the partial ix_direct_messages_unread for the
+navbar unread count, reading every message a user ever received. The
+composite index reads only the unread entries for that count (receiver_id,
+is_read = false), serves marking a conversation read, and still finds
+everything a user received, so it replaces both.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9a4e2c7b1d58'
+down_revision = '5f7a1c9d3e24'
+branch_labels = None
+depends_on = None
+
+UNREAD_WHERE = {'sqlite_where': sa.text('is_read = 0'), 'postgresql_where': sa.text('NOT is_read')}
+
+
+def _indexes(table):
+    return {ix['name'] for ix in sa.inspect(op.get_bind()).get_indexes(table)}
+
+
+def upgrade():
+    if 'direct_messages' not in sa.inspect(op.get_bind()).get_table_names():
+        return
+    existing = _indexes('direct_messages')
+    if 'ix_direct_messages_receiver_read' not in existing:
+        op.create_index('ix_direct_messages_receiver_read', 'direct_messages',
+                        ['receiver_id', 'is_read', 'sender_id'])
+    for name in ('ix_direct_messages_receiver', 'ix_direct_messages_unread'):
+        if name in existing:
+            op.drop_index(name, table_name='direct_messages')
+
+
+def downgrade():
+    if 'direct_messages' not in sa.inspect(op.get_bind()).get_table_names():
+        return
+    existing = _indexes('direct_messages')
+    if 'ix_direct_messages_unread' not in existing:
+        op.create_index('ix_direct_messages_unread', 'direct_messages', ['receiver_id', 'sender_id'], **UNREAD_WHERE)
+    if 'ix_direct_messages_receiver' not in existing:
+        op.create_index('ix_direct_messages_receiver', 'direct_messages', ['receiver_id'])
+    if 'ix_direct_messages_receiver_read' in existing:
+        op.drop_index('ix_direct_messages_receiver_read', table_name='direct_messages')
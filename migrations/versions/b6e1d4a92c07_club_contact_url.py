@@ -0,0 +1,40 @@
+"""Club contact_url: the link in a contact that isn't Instagram/YouTube
+
+Revision ID: b6e1d4a92c07
+Revises: 9a4e2c7b1d58
+Create Date: 2026-10-17 20:00:00
+
+Contacts such as 'LinkedIn: <url>' or a bare URL had no link column and were
+shown as plain text. Existing rows are backfilled with the same rule as
+Club.normalize_links (the last http link in the contact).
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b6e1d4a92c07'
+down_revision = '9a4e2c7b1d58'
+branch_labels = None
+depends_on = None
+
+
+def _columns(table):
+    return {c['name'] for c in sa.inspect(op.get_bind()).get_columns(table)}
+
+
+def upgrade():
+    bind = op.get_bind()
+    if 'club' not in sa.inspect(bind).get_table_names() or 'contact_url' in _columns('club'):
+        return
+    op.add_column('club', sa.Column('contact_url', sa.String(length=300), nullable=True))
+
+    rows = bind.execute(sa.text("SELECT id, contact FROM club WHERE contact LIKE '%http%'")).all()
+    for club_id, contact in rows:
+        bind.execute(sa.text('UPDATE club SET contact_url = :url WHERE id = :id'),
+                     {'url': contact[contact.rfind('http'):].strip(), 'id': club_id})
+
+
+def downgrade():
+    if 'contact_url' in _columns('club'):
+        op.drop_column('club', 'contact_url')
@@ -0,0 +1,42 @@
+"""Drop the copied user names from the leaderboard
+
+Revision ID: e2a7c5d1f940
+Revises: b6e1d4a92c07
+Create Date: 2026-10-17 20:30:00
+
+/leaderboard joins user for the username and name, so renames show at once;
+the copies made when a row was created went stale and are no longer written.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2a7c5d1f940'
+down_revision = 'b6e1d4a92c07'
+branch_labels = None
+depends_on = None
+
+
+def _columns(table):
+    return {c['name'] for c in sa.inspect(op.get_bind()).get_columns(table)}
+
+
+def upgrade():
+    if 'leaderboard' not in sa.inspect(op.get_bind()).get_table_names():
+        return
+    columns = _columns('leaderboard')
+    with op.batch_alter_table('leaderboard') as batch:
+        for name in ('username', 'display_name'):
+            if name in columns:
+                batch.drop_column(name)
+
+
+def downgrade():
+    if 'leaderboard' not in sa.inspect(op.get_bind()).get_table_names():
+        return
+    with op.batch_alter_table('leaderboard') as batch:
+        batch.add_column(sa.Column('username', sa.String(length=100), nullable=True))
+        batch.add_column(sa.Column('display_name', sa.String(length=120), nullable=True))
+    op.execute('UPDATE leaderboard SET username = (SELECT username FROM "user" WHERE "user".id = leaderboard.user_id), '
+               'display_name = (SELECT name FROM "user" WHERE "user".id = leaderboard.user_id)')
@@ -1,10 +1,26 @@
+import re
 from flask_sqlalchemy import SQLAlchemy
-from datetime import datetime
+from sqlalchemy import event, inspect
+from sqlalchemy.exc import IntegrityError
+from datetime import datetime, timedelta
 from flask_login import UserMixin
 from werkzeug.security import generate_password_hash, check_password_hash
 
 db = SQLAlchemy()
 
+
+def upsert_insert():
+    """The dialect's INSERT construct with ON CONFLICT support, or None if the database has none."""
+    dialect = db.session.get_bind().dialect.name
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        return None
+    return insert
+
+
 # association table for users <-> teams (many-to-many)
 team_members = db.Table(
     'team_members',
@@ -12,6 +28,13 @@ team_members = db.Table(
     db.Column('team_id', db.Integer, db.ForeignKey('team.id'))
 )
 
+# association table for users <-> normalized skills (kept in sync with User.skills)
+user_skills = db.Table(
+    'user_skills',
+    db.Column('user_id', db.Integer, db.ForeignKey('user.id'), primary_key=True),
+    db.Column('skill_id', db.Integer, db.ForeignKey('skills.id'), primary_key=True, index=True)
+)
+
 class User(UserMixin, db.Model):
     id = db.Column(db.Integer, primary_key=True)
     # basic account/profile
@@ -41,6 +64,7 @@ class User(UserMixin, db.Model):
     # relationships & metadata
     projects = db.relationship('Project', backref='owner', lazy=True)
     teams = db.relationship('Team', secondary=team_members, back_populates='members')
+    skill_tags = db.relationship('Skill', secondary=user_skills, backref='users')
 
     # admin flag
     is_admin = db.Column(db.Boolean, default=False, nullable=False)
@@ -53,8 +77,19 @@ class User(UserMixin, db.Model):
     is_silenced = db.Column(db.Boolean, default=False, nullable=False)
     silence_until = db.Column(db.DateTime, nullable=True)  # None = permanent silence
 
+    # denormalized count of unread direct messages (shown in the navbar badge)
+    unread_msg_count = db.Column(db.Integer, default=0, nullable=False)
+
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    # password_hash of an account locked while a UserDeletionJob removes it;
+    # check_password_hash() never matches it
+    LOCKED_PASSWORD = '!deleted'
+
+    @property
+    def is_locked(self):
+        return self.password_hash == self.LOCKED_PASSWORD
+
     def set_password(self, password):
         """Hashes and stores a password securely."""
         self.password_hash = generate_password_hash(password)
@@ -63,10 +98,73 @@ class User(UserMixin, db.Model):
         """Verifies a password against the stored hash."""
         return check_password_hash(self.password_hash, password)
 
+    @classmethod
+    def recount_unread_messages(cls):
+        """Recompute unread_msg_count for every user from direct_messages."""
+        unread = db.select(db.func.count(DirectMessage.id)).where(
+            DirectMessage.receiver_id == cls.id,
+            DirectMessage.is_read == False  # noqa: E712
+        ).scalar_subquery()
+        return cls.query.update({cls.unread_msg_count: unread}, synchronize_session=False)
+
     def __repr__(self):
         return f'<User {self.username}>'
 
 
+class Skill(db.Model):
+    """One normalized skill ("python", "machine learning"), shared by all users who list it."""
+    __tablename__ = 'skills'
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False, unique=True)
+
+    SPLIT_RE = re.compile(r'[,;/|\n]+')
+
+    @classmethod
+    def normalize(cls, skills_text):
+        """Split a free-text skills field into unique lowercase skill names, in order."""
+        names = []
+        for part in cls.SPLIT_RE.split(skills_text or ''):
+            name = ' '.join(part.lower().split())[:100]
+            if name and name not in names:
+                names.append(name)
+        return names
+
+    @classmethod
+    def get_or_create_all(cls, names):
+        """
+        Skill rows for the given normalized names, creating any that are missing.
+        New names are inserted with ON CONFLICT DO NOTHING and selected back, so
+        two signups introducing the same skill at once don't fail on the unique
+        name.
+        """
+        if not names:
+            return []
+        with db.session.no_autoflush:
+            existing = {s.name: s for s in cls.query.filter(cls.name.in_(names))}
+            missing = [name for name in names if name not in existing]
+            insert = upsert_insert()
+            if missing and insert:
+                db.session.execute(insert(cls.__table__).values([{'name': name} for name in missing])
+                                   .on_conflict_do_nothing(index_elements=['name']))
+                existing.update((s.name, s) for s in cls.query.filter(cls.name.in_(missing)))
+        for name in names:
+            if name not in existing:
+                existing[name] = cls(name=name)
+                db.session.add(existing[name])
+        return [existing[name] for name in names]
+
+    def __repr__(self):
+        return f'<Skill {self.name}>'
+
+
+@event.listens_for(db.session, 'before_flush')
+def _sync_skill_tags(session, flush_context, instances):
+    """Keep User.skill_tags in step with the free-text User.skills column."""
+    for obj in list(session.new) + list(session.dirty):
+        if isinstance(obj, User) and inspect(obj).attrs.skills.history.has_changes():
+            obj.skill_tags = Skill.get_or_create_all(Skill.normalize(obj.skills))
+
+
 class Project(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
@@ -95,6 +193,9 @@ class Event(db.Model):
     
     creator = db.relationship('User', foreign_keys=[created_by])
 
+    # backs the date-range queries of the calendar feed
+    __table_args__ = (db.Index('ix_events_date_end', 'date', 'end_date'),)
+
     def __repr__(self):
         return f'<Event {self.title}>'
 
@@ -108,6 +209,11 @@ class Registration(db.Model):
     user = db.relationship('User', backref=db.backref('registrations', lazy='dynamic'))
     event = db.relationship('Event', backref=db.backref('registrations', lazy='dynamic'))
 
+    # one registration per user and event; also serves lookups by user.
+    # event_id backs the per-event registration counts on /events
+    __table_args__ = (db.UniqueConstraint('user_id', 'event_id', name='unique_registration'),
+                      db.Index('ix_registrations_event', 'event_id'))
+
     def __repr__(self):
         return f'<Registration user={self.user_id} event={self.event_id}>'
 
@@ -144,6 +250,19 @@ class TeamJoinRequest(db.Model):
     team = db.relationship('Team', backref='join_requests')
     sender = db.relationship('User')
 
+    # a team's pending requests (team page, duplicate-request check)
+    __table_args__ = (db.Index('ix_team_join_request_team_status', 'team_id', 'status'),)
+
+
+def normalize_url(url):
+    """Trim a user-supplied link and give it a scheme; empty values become None."""
+    url = (url or '').strip()
+    if not url:
+        return None
+    if not url.startswith(('http://', 'https://')):
+        url = 'https://' + url
+    return url
+
 
 class Club(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -152,7 +271,30 @@ class Club(db.Model):
     contact = db.Column(db.String(200))      # phone or email
     faculty_incharge = db.Column(db.String(200))
     website = db.Column(db.String(300))
+    # Links derived from contact/website on every write (see _normalize_directory_links)
+    instagram_url = db.Column(db.String(300))
+    youtube_url = db.Column(db.String(300))
+    contact_url = db.Column(db.String(300))  # last link in contact, whatever its label
+    website_url = db.Column(db.String(300))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def normalize_links(self):
+        """Split 'Instagram: <url> | Youtube: <url>' contact text into normalized link columns.
+
+        contact_url keeps the last http link of any other contact ('LinkedIn: <url>',
+        a bare URL) so it still renders as a link.
+        """
+        contact = (self.contact or '').strip()
+        links = {}
+        for part in contact.split('|'):
+            label, sep, url = part.partition(':')
+            if sep and normalize_url(url):
+                links[label.strip().lower()] = normalize_url(url)
+        self.instagram_url = links.get('instagram')
+        self.youtube_url = links.get('youtube')
+        self.contact_url = normalize_url(contact[contact.rfind('http'):]) if 'http' in contact else None
+        self.website_url = normalize_url(self.website)
 
     def __repr__(self):
         return f'<Club {self.name}>'
@@ -163,12 +305,31 @@ class StudentChapter(db.Model):
     associated_club = db.Column(db.String(250))  # optional string reference
     description = db.Column(db.Text)
     contact = db.Column(db.String(200))
+    # contact as a clickable link, derived on every write
+    contact_url = db.Column(db.String(300))
     student_lead = db.Column(db.String(200))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def normalize_links(self):
+        self.contact_url = normalize_url(self.contact)
 
     def __repr__(self):
         return f'<StudentChapter {self.name}>'
 
+
+@event.listens_for(db.session, 'before_flush')
+def _normalize_directory_links(session, flush_context, instances):
+    """Store normalized club/chapter links at write time so pages never fix them up."""
+    for obj in list(session.new) + list(session.dirty):
+        if isinstance(obj, Club):
+            state = inspect(obj)
+            if obj in session.new or any(state.attrs[a].history.has_changes() for a in ('contact', 'website')):
+                obj.normalize_links()
+        elif isinstance(obj, StudentChapter):
+            if obj in session.new or inspect(obj).attrs.contact.history.has_changes():
+                obj.normalize_links()
+
 class TeamInvite(db.Model):
     id = db.Column(db.Integer, primary_key=True)
 
@@ -212,6 +373,7 @@ class ForumPost(db.Model):
     upvotes = db.Column(db.Integer, default=0)
     downvotes = db.Column(db.Integer, default=0)
     score = db.Column(db.Integer, default=0)  # upvotes - downvotes
+    comment_count = db.Column(db.Integer, default=0, nullable=False)  # kept in sync by add_comment
     is_locked = db.Column(db.Boolean, default=False)
     is_pinned = db.Column(db.Boolean, default=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -220,6 +382,12 @@ class ForumPost(db.Model):
     author = db.relationship('User', backref='forum_posts')
     comments = db.relationship('ForumComment', backref='post', lazy=True, cascade='all, delete-orphan')
     votes = db.relationship('ForumVote', backref='post', lazy=True, cascade='all, delete-orphan')
+
+    # the /forum listing, per category and overall, best score first; a user's
+    # posts by author (user deletion)
+    __table_args__ = (db.Index('ix_forum_posts_category_score', 'category_id', 'score', 'created_at'),
+                      db.Index('ix_forum_posts_score_created', 'score', 'created_at'),
+                      db.Index('ix_forum_posts_author', 'author_id'))
     
     def __repr__(self):
         return f'<ForumPost {self.title}>'
@@ -241,6 +409,12 @@ class ForumComment(db.Model):
     author = db.relationship('User', backref='forum_comments')
     parent = db.relationship('ForumComment', remote_side=[id], backref='replies')
     votes = db.relationship('ForumVote', backref='comment', lazy=True, cascade='all, delete-orphan')
+
+    # a post's comment tree is loaded in one query by post_id; author and parent
+    # lookups serve user deletion
+    __table_args__ = (db.Index('ix_forum_comments_post_parent', 'post_id', 'parent_id'),
+                      db.Index('ix_forum_comments_author', 'author_id'),
+                      db.Index('ix_forum_comments_parent', 'parent_id'))
     
     def __repr__(self):
         return f'<ForumComment {self.id}>'
@@ -257,9 +431,85 @@ class ForumVote(db.Model):
     
     user = db.relationship('User', backref='forum_votes')
     
+    # votes on a post or comment, when it is deleted along with its author
     __table_args__ = (db.UniqueConstraint('user_id', 'post_id', name='unique_post_vote'),
-                      db.UniqueConstraint('user_id', 'comment_id', name='unique_comment_vote'))
+                      db.UniqueConstraint('user_id', 'comment_id', name='unique_comment_vote'),
+                      db.Index('ix_forum_votes_post', 'post_id'),
+                      db.Index('ix_forum_votes_comment', 'comment_id'))
     
+    VOTE_TYPES = ('upvote', 'downvote')
+
+    @classmethod
+    def apply(cls, user_id, vote_type, post_id=None, comment_id=None):
+        """
+        Cast, switch or retract a user's vote on a post or comment.
+
+        Voting the same way again retracts the vote; voting the other way switches
+        it. The vote row changes with one conditional statement (the unique
+        constraints arbitrate races) and the target's counters with a single
+        `SET upvotes = upvotes + :d` UPDATE that also derives score, so
+        concurrent voters never overwrite each other. The caller commits.
+        """
+        if vote_type not in cls.VOTE_TYPES:
+            raise ValueError(f'Invalid vote type: {vote_type}')
+        target = ForumPost if post_id is not None else ForumComment
+        target_id = post_id if post_id is not None else comment_id
+        up = 1 if vote_type == 'upvote' else 0
+        down = 1 - up
+
+        mine = cls.query.filter_by(user_id=user_id, post_id=post_id, comment_id=comment_id)
+        if mine.filter(cls.vote_type == vote_type).delete(synchronize_session=False):
+            d_up, d_down = -up, -down
+        elif mine.filter(cls.vote_type != vote_type)\
+                .update({cls.vote_type: vote_type}, synchronize_session=False):
+            d_up, d_down = up - down, down - up
+        else:
+            try:
+                with db.session.begin_nested():
+                    db.session.add(cls(user_id=user_id, post_id=post_id,
+                                       comment_id=comment_id, vote_type=vote_type))
+            except IntegrityError:
+                return  # a concurrent request from the same user got there first
+            d_up, d_down = up, down
+
+        upvotes = db.func.coalesce(target.upvotes, 0)
+        downvotes = db.func.coalesce(target.downvotes, 0)
+        target.query.filter_by(id=target_id).update({
+            target.upvotes: upvotes + d_up,
+            target.downvotes: downvotes + d_down,
+            target.score: upvotes - downvotes + (d_up - d_down),
+        }, synchronize_session=False)
+
+    @classmethod
+    def reconcile(cls, post_ids=None, comment_ids=None):
+        """
+        Recompute upvotes/downvotes/score on every post and comment from the
+        vote rows, fixing any drift. Pass post_ids and/or comment_ids to only
+        recompute those targets. Returns (posts, comments) rows that changed;
+        the caller commits.
+        """
+        scoped = post_ids is not None or comment_ids is not None
+        changed = []
+        for target, fk, ids in ((ForumPost, cls.post_id, post_ids), (ForumComment, cls.comment_id, comment_ids)):
+            if scoped and not ids:
+                changed.append(0)
+                continue
+            def tally(kind):
+                return db.select(db.func.count(cls.id))\
+                    .where(fk == target.id, cls.vote_type == kind).scalar_subquery()
+            ups, downs = tally('upvote'), tally('downvote')
+            query = target.query.filter(target.id.in_(ids)) if scoped else target.query
+            changed.append(query.filter(
+                (db.func.coalesce(target.upvotes, -1) != ups) |
+                (db.func.coalesce(target.downvotes, -1) != downs) |
+                (db.func.coalesce(target.score, 0) != ups - downs)
+            ).update({
+                target.upvotes: ups,
+                target.downvotes: downs,
+                target.score: ups - downs,
+            }, synchronize_session=False))
+        return tuple(changed)
+
     def __repr__(self):
         return f'<ForumVote {self.vote_type}>'
 
@@ -279,10 +529,158 @@ class DirectMessage(db.Model):
     sender = db.relationship('User', foreign_keys=[sender_id], backref='sent_messages')
     receiver = db.relationship('User', foreign_keys=[receiver_id], backref='received_messages')
 
+    # backs the keyset-paginated conversation history and marking a conversation
+    # read (sender + receiver); (receiver, is_read) reads only the unread entries
+    # for the navbar unread count and recounts, and finds everything a user
+    # received for user deletion
+    __table_args__ = (db.Index('ix_direct_messages_pair_created', 'sender_id', 'receiver_id', 'created_at'),
+                      db.Index('ix_direct_messages_receiver_read', 'receiver_id', 'is_read', 'sender_id'))
+
     def __repr__(self):
         return f'<DirectMessage {self.sender_id} -> {self.receiver_id}>'
 
 
+class Conversation(db.Model):
+    """
+    One summary row per pair of users who have exchanged DMs, so the inbox is a
+    single indexed query. The pair is stored ordered (user_a_id < user_b_id);
+    unread_a / unread_b count messages the respective side hasn't read yet.
+    """
+    __tablename__ = 'conversations'
+    id = db.Column(db.Integer, primary_key=True)
+    user_a_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    user_b_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    last_message_id = db.Column(db.Integer, db.ForeignKey('direct_messages.id'), nullable=True)
+    last_message_preview = db.Column(db.String(100), default='')
+    last_message_at = db.Column(db.DateTime, nullable=True)
+    unread_a = db.Column(db.Integer, default=0, nullable=False)
+    unread_b = db.Column(db.Integer, default=0, nullable=False)
+
+    user_a = db.relationship('User', foreign_keys=[user_a_id])
+    user_b = db.relationship('User', foreign_keys=[user_b_id])
+
+    __table_args__ = (db.UniqueConstraint('user_a_id', 'user_b_id', name='unique_conversation_pair'),
+                      db.Index('ix_conversations_user_a_last', 'user_a_id', 'last_message_at'),
+                      db.Index('ix_conversations_user_b_last', 'user_b_id', 'last_message_at'))
+
+    PREVIEW_LENGTH = 80
+
+    @staticmethod
+    def pair(user_id, other_id):
+        """Returns the (user_a_id, user_b_id) key for two users."""
+        return (user_id, other_id) if user_id < other_id else (other_id, user_id)
+
+    def partner_of(self, user_id):
+        return self.user_b if user_id == self.user_a_id else self.user_a
+
+    def unread_for(self, user_id):
+        return self.unread_a if user_id == self.user_a_id else self.unread_b
+
+    @classmethod
+    def for_user(cls, user_id):
+        """Query for every conversation the user is part of, newest first."""
+        return cls.query.filter(
+            (cls.user_a_id == user_id) | (cls.user_b_id == user_id)
+        ).order_by(cls.last_message_at.desc())
+
+    @classmethod
+    def record_message(cls, msg):
+        """
+        Fold a newly added DirectMessage into its conversation summary and the
+        receiver's unread counter.
+        Must be called in the same transaction as the insert (after a flush,
+        so msg.id is set); the caller commits.
+        """
+        user_a_id, user_b_id = cls.pair(msg.sender_id, msg.receiver_id)
+        unread_col = cls.unread_a if msg.receiver_id == user_a_id else cls.unread_b
+        last = {
+            'last_message_id': msg.id,
+            'last_message_preview': msg.content[:cls.PREVIEW_LENGTH],
+            'last_message_at': msg.created_at,
+        }
+        insert = upsert_insert()
+        if insert:
+            # one statement, so two first messages between a pair at once both land
+            # on the same row instead of one failing on unique_conversation_pair
+            table = cls.__table__
+            db.session.execute(
+                insert(table).values(
+                    user_a_id=user_a_id,
+                    user_b_id=user_b_id,
+                    unread_a=1 if msg.receiver_id == user_a_id else 0,
+                    unread_b=1 if msg.receiver_id == user_b_id else 0,
+                    **last
+                ).on_conflict_do_update(
+                    index_elements=['user_a_id', 'user_b_id'],
+                    set_=dict(last, **{unread_col.key: table.c[unread_col.key] + 1})
+                )
+            )
+        else:
+            values = {getattr(cls, key): value for key, value in last.items()}
+            values[unread_col] = unread_col + 1
+            updated = cls.query.filter_by(user_a_id=user_a_id, user_b_id=user_b_id)\
+                .update(values, synchronize_session=False)
+            if not updated:
+                db.session.add(cls(
+                    user_a_id=user_a_id,
+                    user_b_id=user_b_id,
+                    unread_a=1 if msg.receiver_id == user_a_id else 0,
+                    unread_b=1 if msg.receiver_id == user_b_id else 0,
+                    **last
+                ))
+
+        User.query.filter_by(id=msg.receiver_id).update(
+            {User.unread_msg_count: User.unread_msg_count + 1},
+            synchronize_session=False
+        )
+
+    @classmethod
+    def mark_read(cls, reader_id, partner_id, count):
+        """
+        Reset the reader's unread counter for the conversation with partner and
+        take the `count` newly read messages off their total.
+        """
+        user_a_id, user_b_id = cls.pair(reader_id, partner_id)
+        unread_col = cls.unread_a if reader_id == user_a_id else cls.unread_b
+        cls.query.filter_by(user_a_id=user_a_id, user_b_id=user_b_id)\
+            .update({unread_col: 0}, synchronize_session=False)
+        if count:
+            User.query.filter_by(id=reader_id).update(
+                {User.unread_msg_count: User.unread_msg_count - count},
+                synchronize_session=False
+            )
+
+    @classmethod
+    def rebuild(cls, batch_size=1000):
+        """
+        Recompute every conversation summary, and each user's unread total,
+        from direct_messages.
+        Streams messages in id order, so memory is bounded by the number of pairs.
+        Returns the number of conversations written; the caller commits.
+        """
+        summaries = {}
+        messages = DirectMessage.query.order_by(DirectMessage.id).yield_per(batch_size)
+        for msg in messages:
+            key = cls.pair(msg.sender_id, msg.receiver_id)
+            summary = summaries.setdefault(key, {'unread_a': 0, 'unread_b': 0})
+            summary['last_message_id'] = msg.id
+            summary['last_message_preview'] = msg.content[:cls.PREVIEW_LENGTH]
+            summary['last_message_at'] = msg.created_at
+            if not msg.is_read:
+                summary['unread_a' if msg.receiver_id == key[0] else 'unread_b'] += 1
+
+        cls.query.delete(synchronize_session=False)
+        db.session.bulk_insert_mappings(cls, [
+            dict(summary, user_a_id=key[0], user_b_id=key[1])
+            for key, summary in summaries.items()
+        ])
+        User.recount_unread_messages()
+        return len(summaries)
+
+    def __repr__(self):
+        return f'<Conversation {self.user_a_id} <-> {self.user_b_id}>'
+
+
 # -------------------------
 # Team Group Chat Messages
 # -------------------------
@@ -297,5 +695,351 @@ class TeamMessage(db.Model):
     team = db.relationship('Team', backref=db.backref('messages', lazy='dynamic', order_by='TeamMessage.created_at'))
     sender = db.relationship('User', backref='team_messages')
 
+    # backs the keyset-paginated team chat history; by sender for user deletion
+    __table_args__ = (db.Index('ix_team_messages_team_created', 'team_id', 'created_at'),
+                      db.Index('ix_team_messages_sender', 'sender_id'))
+
     def __repr__(self):
         return f'<TeamMessage team={self.team_id} sender={self.sender_id}>'
+
+
+# -------------------------
+# Leaderboard
+# -------------------------
+class Platform(db.Model):
+    __tablename__ = 'platforms'
+    id = db.Column(db.Integer, primary_key=True)
+    slug = db.Column(db.String(50), nullable=False, unique=True)  # 'hackerrank', 'codechef', 'leetcode'
+    name = db.Column(db.String(100), nullable=False)
+
+    def __repr__(self):
+        return f'<Platform {self.slug}>'
+
+
+class PlatformScore(db.Model):
+    __tablename__ = 'platform_scores'
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    platform_id = db.Column(db.Integer, db.ForeignKey('platforms.id'), nullable=False)
+    score = db.Column(db.Integer, default=0, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    user = db.relationship('User', backref='platform_scores')
+    platform = db.relationship('Platform')
+
+    __table_args__ = (db.UniqueConstraint('user_id', 'platform_id', name='unique_platform_score'),)
+
+    @classmethod
+    def set_score(cls, user_id, slug, score):
+        """
+        Store a user's score on one platform and refresh their leaderboard row.
+        The caller commits.
+        """
+        platform = Platform.query.filter_by(slug=slug).first()
+        if platform is None:
+            raise ValueError(f'Unknown platform: {slug}')
+        row = cls.query.filter_by(user_id=user_id, platform_id=platform.id).first()
+        if row is None:
+            row = cls(user_id=user_id, platform_id=platform.id)
+            db.session.add(row)
+        row.score = score
+        db.session.flush()
+        LeaderboardEntry.refresh_user(user_id)
+
+    def __repr__(self):
+        return f'<PlatformScore user={self.user_id} platform={self.platform_id} score={self.score}>'
+
+
+class LeaderboardEntry(db.Model):
+    """
+    Materialized leaderboard: one row per user with at least one platform score,
+    holding per-platform scores, the total and a precomputed competition rank
+    (1 + number of users with a higher total). /leaderboard pages through this
+    table by rank instead of re-ranking everyone per request, joining the user
+    for the name so renames show up at once.
+    """
+    __tablename__ = 'leaderboard'
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    hackerrank_score = db.Column(db.Integer, default=0, nullable=False)
+    codechef_score = db.Column(db.Integer, default=0, nullable=False)
+    leetcode_score = db.Column(db.Integer, default=0, nullable=False)
+    total_score = db.Column(db.Integer, default=0, nullable=False)
+    rank = db.Column(db.Integer, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (db.Index('ix_leaderboard_rank', 'rank', 'user_id'),
+                      db.Index('ix_leaderboard_total', 'total_score'))
+
+    user = db.relationship('User')
+
+    PLATFORMS = ('hackerrank', 'codechef', 'leetcode')
+
+    @classmethod
+    def _user_scores(cls, user_id=None):
+        """{user_id: {slug: score}} for one user, or for everyone when user_id is None."""
+        query = db.session.query(PlatformScore.user_id, Platform.slug, PlatformScore.score)\
+            .join(Platform, Platform.id == PlatformScore.platform_id)
+        if user_id is not None:
+            query = query.filter(PlatformScore.user_id == user_id)
+        scores = {}
+        for uid, slug, score in query:
+            scores.setdefault(uid, {})[slug] = score or 0
+        return scores
+
+    @classmethod
+    def refresh_user(cls, user_id):
+        """
+        Recompute one user's row after a score change. Only rows whose total lies
+        between the user's old and new totals change rank, so that range is
+        shifted with one UPDATE instead of re-ranking the whole table.
+        The caller commits.
+        """
+        scores = cls._user_scores(user_id).get(user_id, {})
+        per_platform = {f'{slug}_score': scores.get(slug, 0) for slug in cls.PLATFORMS}
+        total = sum(per_platform.values())
+
+        entry = db.session.get(cls, user_id)
+        old_total = entry.total_score if entry is not None else None
+        others = cls.query.filter(cls.user_id != user_id)
+
+        if old_total is None:
+            others.filter(cls.total_score < total)\
+                .update({cls.rank: cls.rank + 1}, synchronize_session=False)
+        elif total > old_total:
+            others.filter(cls.total_score >= old_total, cls.total_score < total)\
+                .update({cls.rank: cls.rank + 1}, synchronize_session=False)
+        elif total < old_total:
+            others.filter(cls.total_score >= total, cls.total_score < old_total)\
+                .update({cls.rank: cls.rank - 1}, synchronize_session=False)
+
+        rank = 1 + others.filter(cls.total_score > total).count()
+        if entry is None:
+            entry = cls(user_id=user_id)
+            db.session.add(entry)
+        for field, value in per_platform.items():
+            setattr(entry, field, value)
+        entry.total_score = total
+        entry.rank = rank
+        return entry
+
+    @classmethod
+    def rebuild(cls):
+        """
+        Recompute the whole table from platform_scores (use after bulk imports or
+        to fix drift). Returns the number of ranked users; the caller commits.
+        """
+        scores = cls._user_scores()
+        users = {uid for (uid,) in db.session.query(User.id).filter(User.id.in_(scores.keys()))} if scores else set()
+        rows = []
+        for user_id, by_slug in scores.items():
+            if user_id not in users:
+                continue
+            row = {f'{slug}_score': by_slug.get(slug, 0) for slug in cls.PLATFORMS}
+            row.update(user_id=user_id, total_score=sum(row.values()))
+            rows.append(row)
+
+        # competition ranking: ties share a rank, the next rank skips
+        rows.sort(key=lambda r: (-r['total_score'], r['user_id']))
+        for i, row in enumerate(rows):
+            if i and row['total_score'] == rows[i - 1]['total_score']:
+                row['rank'] = rows[i - 1]['rank']
+            else:
+                row['rank'] = i + 1
+
+        cls.query.delete(synchronize_session=False)
+        db.session.bulk_insert_mappings(cls, rows)
+        return len(rows)
+
+    def __repr__(self):
+        return f'<LeaderboardEntry #{self.rank} user={self.user_id}>'
+
+
+class EntityStats(db.Model):
+    """
+    Admin dashboard counters in a single row (id=1): a total per counted model
+    and, for some, how many were created this week (since Monday, UTC).
+
+    The after_flush hook below adds a flush's inserts and deletes to the row in
+    one UPDATE, so the dashboard reads one row instead of running COUNT(*) per
+    table. Writes that bypass the session (Core inserts, query.delete()) either
+    call add() themselves or are corrected by reconcile(), which recounts
+    everything; get() reconciles when the row is missing or stale. The weekly
+    counters start again from zero with the first write of a new week.
+    """
+    __tablename__ = 'entity_stats'
+    id = db.Column(db.Integer, primary_key=True)
+    users = db.Column(db.Integer, default=0, nullable=False)
+    projects = db.Column(db.Integer, default=0, nullable=False)
+    events = db.Column(db.Integer, default=0, nullable=False)
+    teams = db.Column(db.Integer, default=0, nullable=False)
+    clubs = db.Column(db.Integer, default=0, nullable=False)
+    chapters = db.Column(db.Integer, default=0, nullable=False)
+    users_this_week = db.Column(db.Integer, default=0, nullable=False)
+    projects_this_week = db.Column(db.Integer, default=0, nullable=False)
+    events_this_week = db.Column(db.Integer, default=0, nullable=False)
+    week_start = db.Column(db.Date)  # the Monday the *_this_week columns count from
+    reconciled_at = db.Column(db.DateTime)
+
+    # counter column -> model; WEEKLY ones (models with created_at) also have <name>_this_week
+    COUNTED = {'users': User, 'projects': Project, 'events': Event, 'teams': Team,
+               'clubs': Club, 'chapters': StudentChapter}
+    WEEKLY = ('users', 'projects', 'events')
+
+    @staticmethod
+    def current_week():
+        today = datetime.utcnow().date()
+        return today - timedelta(days=today.weekday())
+
+    @classmethod
+    def counter_for(cls, model):
+        """The counter name for a model class, or None if it isn't counted."""
+        for name, counted in cls.COUNTED.items():
+            if counted is model:
+                return name
+        return None
+
+    def this_week(self, name):
+        """How many <name> were created this week (0 if nothing was counted since Monday)."""
+        if self.week_start != self.current_week():
+            return 0
+        return getattr(self, f'{name}_this_week')
+
+    @classmethod
+    def add(cls, deltas, connection=None):
+        """
+        Apply {counter: (total change, this-week change)} to the row with one
+        UPDATE, rolling the weekly counters over if the week has changed.
+        A missing row is left alone; reconcile() creates it.
+        """
+        table = cls.__table__
+        week = cls.current_week()
+        values = {table.c[name]: table.c[name] + total for name, (total, _) in deltas.items() if total}
+        for name in cls.WEEKLY:
+            column = table.c[f'{name}_this_week']
+            change = deltas.get(name, (0, 0))[1]
+            values[column] = db.case((table.c.week_start == week, column + change), else_=max(change, 0))
+        values[table.c.week_start] = week
+        (connection or db.session).execute(db.update(table).where(table.c.id == 1).values(values))
+
+    @classmethod
+    def removal(cls, model, *criteria):
+        """
+        Counter changes for bulk-deleting the model's rows matching criteria
+        (query.delete() skips the flush hook). Call before the DELETE and pass
+        the result to add().
+        """
+        name = cls.counter_for(model)
+        count = db.select(db.func.count()).select_from(model).where(*criteria)
+        total = db.session.execute(count).scalar()
+        weekly = 0
+        if total and name in cls.WEEKLY:
+            since = datetime.combine(cls.current_week(), datetime.min.time())
+            weekly = db.session.execute(count.where(model.created_at >= since)).scalar()
+        return {name: (-total, -weekly)}
+
+    @classmethod
+    def reconcile(cls):
+        """Recount every counter from its table in one query; returns the row. The caller commits."""
+        week = cls.current_week()
+        since = datetime.combine(week, datetime.min.time())
+        counts = [db.select(db.func.count()).select_from(model).scalar_subquery().label(name)
+                  for name, model in cls.COUNTED.items()]
+        counts += [db.select(db.func.count()).select_from(model).where(model.created_at >= since)
+                   .scalar_subquery().label(f'{name}_this_week')
+                   for name, model in cls.COUNTED.items() if name in cls.WEEKLY]
+        values = db.session.execute(db.select(*counts)).one()._mapping
+
+        stats = db.session.get(cls, 1)
+        if stats is None:
+            stats = cls(id=1)
+            db.session.add(stats)
+        for name, value in values.items():
+            setattr(stats, name, value)
+        stats.week_start = week
+        stats.reconciled_at = datetime.utcnow()
+        return stats
+
+    @classmethod
+    def get(cls, max_age=3600):
+        """
+        The stats row, recounted first if it is missing or was last reconciled
+        more than max_age seconds ago. Commits when it recounts.
+        """
+        stats = db.session.get(cls, 1)
+        if stats is not None and stats.reconciled_at is not None and \
+                datetime.utcnow() - stats.reconciled_at < timedelta(seconds=max_age):
+            return stats
+        try:
+            stats = cls.reconcile()
+            db.session.commit()
+        except IntegrityError:
+            # another request created the row first; theirs is just as fresh
+            db.session.rollback()
+            stats = db.session.get(cls, 1)
+        return stats
+
+    def __repr__(self):
+        return f'<EntityStats users={self.users} reconciled_at={self.reconciled_at}>'
+
+
+@event.listens_for(db.session, 'after_flush')
+def _count_entities(session, flush_context):
+    """Fold the flush's inserts and deletes of counted models into EntityStats."""
+    week = EntityStats.current_week()
+    deltas = {}
+    for objects, sign in ((session.new, 1), (session.deleted, -1)):
+        for obj in objects:
+            name = EntityStats.counter_for(type(obj))
+            if name is None:
+                continue
+            total, weekly = deltas.get(name, (0, 0))
+            if name in EntityStats.WEEKLY:
+                # loaded_value: never trigger a load on a row that was just deleted
+                created = inspect(obj).attrs.created_at.loaded_value
+                if isinstance(created, datetime) and created.date() >= week:
+                    weekly += sign
+            deltas[name] = (total + sign, weekly)
+    if deltas:
+        EntityStats.add(deltas, session.connection())
+
+
+class UserDeletionJob(db.Model):
+    """
+    Progress of a user being deleted in the background (user_deletion.py).
+    user_id has no foreign key: the job row outlives the user it deletes.
+    rows_total is the footprint counted when the job was created, so
+    rows_done can pass it if the user kept writing until the account was locked.
+    """
+    __tablename__ = 'user_deletion_jobs'
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, nullable=False, index=True)
+    username = db.Column(db.String(100))
+    requested_by = db.Column(db.Integer)  # admin user id
+    status = db.Column(db.String(20), default='pending', nullable=False)  # pending/running/done/failed
+    step = db.Column(db.String(50))  # what is being deleted right now
+    rows_total = db.Column(db.Integer, default=0, nullable=False)
+    rows_done = db.Column(db.Integer, default=0, nullable=False)
+    error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    finished_at = db.Column(db.DateTime)
+
+    # a running job that hasn't committed a chunk for this long is assumed dead
+    STALLED_AFTER = timedelta(minutes=5)
+
+    @property
+    def percent(self):
+        if self.status == 'done':
+            return 100
+        return min(99, 100 * self.rows_done // self.rows_total) if self.rows_total else 0
+
+    @property
+    def resumable(self):
+        """Failed, never started, or running without progress (its worker died)."""
+        if self.status in ('pending', 'failed'):
+            return True
+        return self.status == 'running' and self.updated_at is not None and \
+            datetime.utcnow() - self.updated_at > self.STALLED_AFTER
+
+    def __repr__(self):
+        return f'<UserDeletionJob user={self.user_id} {self.status} {self.rows_done}/{self.rows_total}>'
@@ -0,0 +1,151 @@
+"""
+Rendered-page cache for public pages.
+
+Every table has a data version that is bumped after a transaction that wrote
+to it commits. A cached page is keyed on its endpoint, the query string and
+the versions of the tables it reads, so a commit touching any of them makes
+the old entry unreachable; nothing has to be invalidated by hand.
+
+Only anonymous GET/HEAD requests are served from the cache. Logged-in users
+see their own navbar and badges, so their requests always render. Cached
+responses carry an ETag and Last-Modified and answer conditional requests
+with 304.
+
+Versions live in the worker process: a commit made by another worker is only
+picked up once PAGE_CACHE_TTL expires the entry.
+"""
+import hashlib
+import threading
+from datetime import datetime, timezone
+from functools import wraps
+
+from flask import current_app, request, session, make_response
+from flask_login import current_user
+from sqlalchemy import event, inspect
+
+from cache import TTLCache
+from models import db
+
+_pages = TTLCache(ttl=60, max_entries=1000)
+
+# table name -> (version, time of the last commit that touched it)
+_versions = {}
+_versions_lock = threading.Lock()
+_started_at = datetime.now(timezone.utc).replace(microsecond=0)
+
+# model class -> {attribute name: extra tables to bump when it changes} (bump_with)
+_bumped_with = {}
+
+
+def table_version(table):
+    """(version, last_modified) for a table name."""
+    return _versions.get(table, (0, _started_at))
+
+
+def bump(*tables):
+    """Mark tables as changed; cached pages that read them are no longer served."""
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    with _versions_lock:
+        for table in tables:
+            version, _ = _versions.get(table, (0, _started_at))
+            _versions[table] = (version + 1, now)
+
+
+def bump_with(column, *models):
+    """
+    Flushes that change column (an ORM attribute such as User.name) also bump
+    the models' tables. For pages cached on those models that display the
+    column too (a project list shows its owner's name) and so shouldn't be
+    keyed on the column's whole table, which changes far more often.
+    """
+    _bumped_with.setdefault(column.class_, {})[column.key] = tuple(m.__table__.name for m in models)
+
+
+def clear():
+    """Drop every cached page."""
+    _pages.clear()
+
+
+def _dirty_tables(session):
+    return session.info.setdefault('page_cache_tables', set())
+
+
+@event.listens_for(db.session, 'after_flush')
+def _collect_flushed_tables(session, flush_context):
+    tables = _dirty_tables(session)
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        table = getattr(obj, '__table__', None)
+        if table is not None:
+            tables.add(table.name)
+    for obj in session.dirty:
+        state = inspect(obj)
+        for key, extra in _bumped_with.get(type(obj), {}).items():
+            if state.attrs[key].history.has_changes():
+                tables.update(extra)
+
+
+@event.listens_for(db.session, 'do_orm_execute')
+def _collect_bulk_tables(orm_execute_state):
+    # query.update()/delete() and update()/delete() statements skip the flush
+    if orm_execute_state.is_update or orm_execute_state.is_delete:
+        mapper = orm_execute_state.bind_mapper
+        if mapper is not None:
+            _dirty_tables(orm_execute_state.session).add(mapper.local_table.name)
+
+
+@event.listens_for(db.session, 'after_commit')
+def _bump_committed_tables(session):
+    tables = session.info.pop('page_cache_tables', None)
+    if tables:
+        bump(*tables)
+
+
+@event.listens_for(db.session, 'after_rollback')
+def _discard_rolled_back_tables(session):
+    session.info.pop('page_cache_tables', None)
+
+
+def cached_page(*models):
+    """
+    Cache the rendered page for anonymous visitors, keyed on the data versions
+    of the given models' tables. The view must only depend on those tables and
+    the query string.
+    """
+    tables = tuple(model.__table__.name for model in models)
+
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            if (not current_app.config.get('PAGE_CACHE_ENABLED', True)
+                    or request.method not in ('GET', 'HEAD')
+                    or current_user.is_authenticated
+                    or '_flashes' in session):
+                return f(*args, **kwargs)
+
+            versions = [table_version(t) for t in tables]
+            key = (request.endpoint, request.query_string,
+                   tuple(version for version, _ in versions))
+            entry = _pages.get(key)
+            if entry is None:
+                response = make_response(f(*args, **kwargs))
+                # Never store errors, redirects or anything that touched the session
+                if response.status_code != 200 or session.modified:
+                    return response
+                body = response.get_data()
+                entry = {
+                    'body': body,
+                    'mimetype': response.mimetype,
+                    'etag': hashlib.sha1(body).hexdigest(),
+                    'last_modified': max([_started_at] + [ts for _, ts in versions]),
+                }
+                _pages.set(key, entry, ttl=current_app.config.get('PAGE_CACHE_TTL', 60))
+
+            response = current_app.response_class(entry['body'], mimetype=entry['mimetype'])
+            response.set_etag(entry['etag'])
+            response.last_modified = entry['last_modified']
+            # Browsers revalidate every time; the 304 costs no rendering or queries
+            response.cache_control.no_cache = True
+            response.vary.add('Cookie')
+            return response.make_conditional(request)
+        return decorated
+    return decorator
@@ -0,0 +1,90 @@
+"""
+People search over name, username and skills.
+
+Skills are matched exactly against the normalized skills table, so "python"
+finds users who list Python and not "micropython". Name and username are
+matched case-insensitively by prefix or substring. On PostgreSQL those
+lookups are served by pg_trgm GIN indexes on lower(name) / lower(username);
+scripts/migrate_people_search.py creates them and backfills skills.
+
+Results are ranked by match quality: exact username, exact skill, username
+prefix, name (word) prefix, then substring matches.
+"""
+from sqlalchemy import case, func, literal, or_, select, text, union
+
+from models import db, User, Skill, user_skills
+
+TRIGRAM_INDEXES = {
+    'ix_user_name_trgm': 'lower(name)',
+    'ix_user_username_trgm': 'lower(username)',
+}
+
+
+def create_indexes(conn):
+    """Create the trigram indexes (PostgreSQL only); returns the names created or checked."""
+    if conn.dialect.name != 'postgresql':
+        return []
+    conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    for name, expr in TRIGRAM_INDEXES.items():
+        conn.execute(text(f'CREATE INDEX IF NOT EXISTS {name} ON "user" USING GIN ({expr} gin_trgm_ops)'))
+    return list(TRIGRAM_INDEXES)
+
+
+def _like_escape(value):
+    return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def search_query(q, limit=50):
+    """The ranked search for q as a (User, quality) query, or None if q is blank."""
+    term = ' '.join(q.lower().split())
+    if not term:
+        return None
+    escaped = _like_escape(term)
+    name = func.lower(User.name)
+    username = func.lower(User.username)
+
+    # Candidates come from two lookups that can each use their own index: the
+    # trigram-backed LIKEs, and the exact skill name through user_skills. Put in
+    # one OR, the skill subquery would have to be checked against every user.
+    by_text = select(User.id).where(or_(
+        username.like('%' + escaped + '%', escape='\\'),
+        name.like('%' + escaped + '%', escape='\\')
+    ))
+    by_skill = select(user_skills.c.user_id)\
+        .join(Skill, Skill.id == user_skills.c.skill_id)\
+        .where(Skill.name == term)
+    candidates = union(by_text, by_skill).subquery()
+    has_skill = User.id.in_(by_skill)
+
+    quality = case(
+        (username == term, 100),
+        (has_skill, 80),
+        (username.like(escaped + '%', escape='\\'), 60),
+        (or_(name.like(escaped + '%', escape='\\'),
+             name.like('% ' + escaped + '%', escape='\\')), 50),
+        (username.like('%' + escaped + '%', escape='\\'), 30),
+        else_=literal(20)
+    ).label('quality')
+
+    return db.session.query(User, quality)\
+        .join(candidates, candidates.c.id == User.id)\
+        .order_by(quality.desc(), User.name).limit(limit)
+
+
+def search_users(q, limit=50):
+    """Users matching q, best match first."""
+    query = search_query(q, limit)
+    if query is None:
+        return []
+    return [user for user, _ in query.all()]
+
+
+def rebuild_skills(batch_size=500):
+    """Re-derive every user's skill tags from User.skills; returns users processed."""
+    count = 0
+    for user in User.query.order_by(User.id).yield_per(batch_size):
+        user.skill_tags = Skill.get_or_create_all(Skill.normalize(user.skills))
+        count += 1
+        if count % batch_size == 0:
+            db.session.flush()
+    return count
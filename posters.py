@@ -0,0 +1,228 @@
+"""
+Event poster pipeline.
+
+An upload is stored once under POSTER_ORIGINALS_FOLDER/<content hash>.<ext>,
+outside the static tree, so re-uploading the same file never duplicates it,
+the raw bytes (EXIF/GPS included) are never served, and the request returns
+as soon as they are on disk. Event.poster holds posters/<hash>.<ext>. A
+background worker then decodes the image once and writes resized variants
+in WebP and JPEG to static/images:
+
+    posters/<hash>-<width>.webp / .jpg   for the card, detail and full widths
+
+Re-encoding drops EXIF/ICC metadata. When all variants are written a manifest
+is saved next to the source (<source>.json); until then, if processing fails
+(logged) and whenever Pillow isn't installed, templates get a placeholder.
+The images shipped in static/images are repo assets: their variants work the
+same way, but without a manifest the original itself is shown.
+
+Templates call poster_image(poster) (or the poster_picture macro in
+events/_poster.html) to get src plus srcset strings for a <picture>.
+scripts/process_posters.py builds variants for posters already on disk.
+"""
+import hashlib
+import io
+import json
+import os
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from flask import current_app, url_for
+
+POSTER_DIR = 'posters'  # relative to static/images
+PLACEHOLDER = 'images/poster-placeholder.svg'  # relative to static
+EXTENSIONS = {'png', 'jpg', 'jpeg', 'webp'}
+
+# variant name -> max width in px (None keeps the original width)
+VARIANT_WIDTHS = {'card': 480, 'detail': 1200, 'full': None}
+
+# format -> (file extension, Pillow save options)
+FORMATS = {
+    'webp': ('webp', {'quality': 80, 'method': 4}),
+    'jpeg': ('jpg', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+PosterImage = namedtuple('PosterImage', ['src', 'webp_srcset', 'jpeg_srcset'])
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='posters')
+
+# poster -> manifest, filled once a poster's variants exist
+_manifests = {}
+
+
+class PosterError(ValueError):
+    """The upload isn't an image we can use as a poster."""
+
+
+@lru_cache(maxsize=None)
+def pillow():
+    """
+    Pillow's (Image, ImageOps), imported on first use so pages that only
+    render posters don't pay for it at startup. None if Pillow isn't installed
+    (it is optional: without it posters are stored but never resized).
+    """
+    try:
+        from PIL import Image, ImageOps
+    except ImportError:
+        return None
+    return Image, ImageOps
+
+
+def images_folder():
+    return os.path.join(current_app.static_folder, 'images')
+
+
+def is_upload(poster):
+    """True for posters uploaded through save_poster (as opposed to shipped images)."""
+    return poster.startswith(POSTER_DIR + '/')
+
+
+def source_path(poster):
+    """Where a poster's original lives: POSTER_ORIGINALS_FOLDER for uploads, static/images otherwise."""
+    if is_upload(poster):
+        return os.path.join(current_app.config['POSTER_ORIGINALS_FOLDER'], poster[len(POSTER_DIR) + 1:])
+    return os.path.join(images_folder(), poster)
+
+
+def manifest_path(source_path):
+    return source_path + '.json'
+
+
+def _write_atomic(path, data):
+    tmp = f"{path}.{os.getpid()}-{threading.get_ident()}.tmp"  # unique per writer thread
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def save_poster(file_storage):
+    """
+    Store an uploaded poster under its content hash and queue its variants.
+    Returns the value for Event.poster (a path relative to static/images).
+    Raises PosterError for non-image uploads.
+    """
+    ext = file_storage.filename.rsplit('.', 1)[-1].lower() if '.' in file_storage.filename else ''
+    if ext not in EXTENSIONS:
+        raise PosterError('Invalid file type. Only images (png, jpg, jpeg, webp) are allowed.')
+    data = file_storage.read()
+    pil = pillow()
+    if pil is not None:
+        try:
+            # Parses the header and structure only; the full decode happens in the worker
+            pil[0].open(io.BytesIO(data)).verify()
+        except Exception:
+            raise PosterError('The uploaded poster is not a valid image.')
+
+    poster = f"{POSTER_DIR}/{hashlib.sha256(data).hexdigest()[:20]}.{ext}"
+    path = source_path(poster)
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        _write_atomic(path, data)
+    queue_variants(poster)
+    return poster
+
+
+def queue_variants(poster):
+    """Build a poster's variants on the worker pool; no-op if done or Pillow is missing."""
+    source = source_path(poster)
+    if pillow() is None or os.path.exists(manifest_path(source)):
+        return None
+    out_dir = os.path.join(images_folder(), POSTER_DIR)
+    logger = current_app.logger
+
+    def report(future):
+        # e.g. a truncated image or a decompression bomb that passed verify()
+        if future.exception() is not None:
+            logger.error("Could not build variants for poster %s (retry with scripts/process_posters.py)",
+                         poster, exc_info=future.exception())
+
+    future = _executor.submit(process_poster, source, out_dir)
+    future.add_done_callback(report)
+    return future
+
+
+def move_legacy_original(poster):
+    """
+    Move an upload saved under static/images/posters (before originals were kept
+    outside the static tree) to source_path(), with its manifest. True if moved.
+    """
+    legacy = os.path.join(images_folder(), poster)
+    if not is_upload(poster) or not os.path.exists(legacy):
+        return False
+    target = source_path(poster)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    for old, new in ((legacy, target), (manifest_path(legacy), manifest_path(target))):
+        if os.path.exists(old):
+            os.replace(old, new)
+    return True
+
+
+def process_poster(source_path, out_dir):
+    """
+    Decode the source once and write every variant into out_dir, then the
+    manifest. Safe to run twice: output names depend only on the content.
+    """
+    with open(source_path, 'rb') as f:
+        data = f.read()
+    digest = hashlib.sha256(data).hexdigest()[:20]
+    os.makedirs(out_dir, exist_ok=True)
+    Image, ImageOps = pillow()
+
+    with Image.open(io.BytesIO(data)) as decoded:
+        image = ImageOps.exif_transpose(decoded)
+        has_alpha = image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info)
+        image = image.convert('RGBA' if has_alpha else 'RGB')
+    width, height = image.size
+
+    variants = []
+    for max_width in VARIANT_WIDTHS.values():
+        w = width if max_width is None else min(max_width, width)
+        if max_width is not None and w == width:
+            continue  # source is narrower than this variant; 'full' covers it
+        resized = image if w == width else image.resize((w, round(height * w / width)), Image.LANCZOS)
+        for fmt, (ext, options) in FORMATS.items():
+            out = resized
+            if fmt == 'jpeg' and has_alpha:
+                out = Image.new('RGB', resized.size, (255, 255, 255))
+                out.paste(resized, mask=resized.getchannel('A'))
+            buf = io.BytesIO()
+            out.save(buf, format=fmt.upper(), **options)
+            filename = f"{digest}-{w}.{ext}"
+            _write_atomic(os.path.join(out_dir, filename), buf.getvalue())
+            variants.append({'format': fmt, 'width': w, 'file': f"{POSTER_DIR}/{filename}"})
+
+    manifest = {'width': width, 'height': height, 'variants': variants}
+    _write_atomic(manifest_path(source_path), json.dumps(manifest).encode())
+    return manifest
+
+
+def _manifest(poster):
+    manifest = _manifests.get(poster)
+    if manifest is None:
+        try:
+            with open(manifest_path(source_path(poster))) as f:
+                manifest = _manifests[poster] = json.load(f)
+        except (OSError, ValueError):
+            return None
+    return manifest
+
+
+def poster_image(poster):
+    """src and srcset strings for a poster; srcsets are empty until variants exist."""
+    manifest = _manifest(poster)
+    jpegs = [v for v in manifest['variants'] if v['format'] == 'jpeg'] if manifest else []
+    if not jpegs:
+        # never the raw upload: it still carries its metadata
+        fallback = PLACEHOLDER if is_upload(poster) else 'images/' + poster
+        return PosterImage(url_for('static', filename=fallback), '', '')
+
+    def srcset(fmt):
+        return ', '.join(
+            f"{url_for('static', filename='images/' + v['file'])} {v['width']}w"
+            for v in manifest['variants'] if v['format'] == fmt
+        )
+
+    return PosterImage(url_for('static', filename='images/' + jpegs[-1]['file']),
+                       srcset('webp'), srcset('jpeg'))
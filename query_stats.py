@@ -0,0 +1,166 @@
+"""
+Per-request SQL instrumentation.
+
+Cursor-execute hooks on every Engine time each statement issued while a
+request is being handled and group them by shape: the SQL with literals,
+bind markers and IN-lists collapsed, so `WHERE user.id = ?` run once per row
+of a loop counts as one shape repeated N times. A shape repeated at least
+N_PLUS_ONE_THRESHOLD times in one request is flagged as a likely N+1.
+
+For every request:
+- a `Server-Timing: db;dur=<ms>;desc="<n> queries"` entry,
+- a JSON log line on the 'query_stats' logger (a warning when N+1 shapes
+  were seen, info otherwise),
+- per-endpoint totals in `routes`, shown worst-first on /admin/queries.
+
+Totals are per worker process and reset on restart.
+"""
+import json
+import logging
+import re
+import threading
+import time
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger('query_stats')
+
+_WS_RE = re.compile(r'\s+')
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r'(?<![\w.])-?\d+(?:\.\d+)?\b')
+_PARAM_RE = re.compile(r'%\(\w+\)s|:\w+|\$\d+|%s|\?')
+_LIST_RE = re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)')
+_POSTCOMPILE_RE = re.compile(r'\(?\[POSTCOMPILE_\w+\]\)?')
+
+
+def statement_shape(statement):
+    """Normalize SQL so executions that differ only in their values compare equal."""
+    shape = _WS_RE.sub(' ', statement).strip()
+    shape = _STRING_RE.sub('?', shape)
+    shape = _POSTCOMPILE_RE.sub('(?)', shape)
+    shape = _PARAM_RE.sub('?', shape)
+    shape = _NUMBER_RE.sub('?', shape)
+    return _LIST_RE.sub('(?)', shape)
+
+
+class RequestQueries:
+    """Queries seen while handling one request."""
+
+    def __init__(self):
+        self.count = 0
+        self.ms = 0.0
+        self.shapes = {}  # shape -> [executions, total ms]
+
+    def record(self, statement, ms):
+        self.count += 1
+        self.ms += ms
+        entry = self.shapes.setdefault(statement_shape(statement), [0, 0.0])
+        entry[0] += 1
+        entry[1] += ms
+
+    def repeated(self, threshold):
+        """[(shape, executions, ms)] for shapes run at least `threshold` times, most frequent first."""
+        hits = [(shape, n, ms) for shape, (n, ms) in self.shapes.items() if n >= threshold]
+        return sorted(hits, key=lambda hit: -hit[1])
+
+
+class RouteStats:
+    """Process-wide per-endpoint totals for the admin page."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._routes = {}
+
+    def record(self, endpoint, queries, n_plus_one):
+        with self._lock:
+            route = self._routes.setdefault(endpoint, {
+                'endpoint': endpoint, 'requests': 0, 'queries': 0, 'max_queries': 0,
+                'db_ms': 0.0, 'max_db_ms': 0.0, 'n_plus_one_requests': 0, 'n_plus_one_shape': None,
+            })
+            route['requests'] += 1
+            route['queries'] += queries.count
+            route['max_queries'] = max(route['max_queries'], queries.count)
+            route['db_ms'] += queries.ms
+            route['max_db_ms'] = max(route['max_db_ms'], queries.ms)
+            if n_plus_one:
+                route['n_plus_one_requests'] += 1
+                route['n_plus_one_shape'] = f"{n_plus_one[0][1]}x {n_plus_one[0][0]}"
+
+    def worst(self, limit=50):
+        """Routes by total DB time, with per-request averages."""
+        with self._lock:
+            rows = [dict(r) for r in self._routes.values()]
+        for r in rows:
+            r['avg_queries'] = round(r['queries'] / r['requests'], 1)
+            r['avg_db_ms'] = round(r['db_ms'] / r['requests'], 2)
+            r['db_ms'] = round(r['db_ms'], 1)
+            r['max_db_ms'] = round(r['max_db_ms'], 1)
+        rows.sort(key=lambda r: -r['db_ms'])
+        return rows[:limit]
+
+
+routes = RouteStats()
+
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _before_execute(conn, cursor, statement, parameters, context, executemany):
+    # Kept on the statement's execution context, not the connection: a statement
+    # that raises never reaches after_cursor_execute, and its start time goes
+    # away with the context instead of lingering on the pooled connection.
+    if context is not None:
+        context.query_stats_start = time.perf_counter()
+
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def _after_execute(conn, cursor, statement, parameters, context, executemany):
+    start = getattr(context, 'query_stats_start', None)
+    if start is None:
+        return
+    ms = (time.perf_counter() - start) * 1000
+    if has_request_context():
+        queries = g.get('request_queries')
+        if queries is not None:
+            queries.record(statement, ms)
+
+
+def init_app(app):
+    """Start collecting per-request query stats unless QUERY_STATS_ENABLED is off."""
+    if not app.config.get('QUERY_STATS_ENABLED', True):
+        return
+    threshold = app.config.get('N_PLUS_ONE_THRESHOLD', 5)
+
+    @app.before_request
+    def start_query_stats():
+        g.request_queries = RequestQueries()
+
+    @app.after_request
+    def report_query_stats(response):
+        queries = g.pop('request_queries', None)
+        if queries is None:
+            return response
+        response.headers.add('Server-Timing', f'db;dur={queries.ms:.1f};desc="{queries.count} queries"')
+
+        endpoint = request.endpoint or '<unmatched>'
+        n_plus_one = queries.repeated(threshold)
+        routes.record(endpoint, queries, n_plus_one)
+
+        record = {
+            'endpoint': endpoint,
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'queries': queries.count,
+            'db_ms': round(queries.ms, 2),
+        }
+        if n_plus_one:
+            record['n_plus_one'] = [{'shape': shape, 'count': n, 'ms': round(ms, 2)} for shape, n, ms in n_plus_one]
+            logger.warning(json.dumps(record))
+        else:
+            logger.info(json.dumps(record))
+        return response
@@ -0,0 +1,259 @@
+"""
+Route benchmark: drives the main pages through the Flask test client against
+the configured database and reports latency percentiles and query counts per
+route (query counts come from the Server-Timing header, see query_stats.py).
+
+Fill a database with scripts/generate_dataset.py first, then e.g.
+
+    DATABASE_URL=sqlite:///instances/bench-100k.db python scripts/bench_routes.py --out bench-100k.json
+    DATABASE_URL=sqlite:///instances/bench-100k.db python scripts/bench_routes.py --compare bench-100k.json
+
+Results are JSON (--out FILE, or --json for stdout) with the table sizes, git
+commit and settings alongside the numbers, so runs at different scales or
+commits can be told apart; --compare prints the change against an earlier
+result file. The rendered-page cache is off unless --page-cache is given, so
+anonymous pages measure real work. Opening a conversation marks it read, so
+run against a benchmark database, never the shared one.
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import re
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import func
+
+from app import create_app
+from models import (
+    db, User, Event, Team, TeamMessage, ForumPost, ForumComment, ForumVote,
+    DirectMessage, Registration
+)
+
+SERVER_TIMING_DB_RE = re.compile(r'db;dur=([\d.]+);desc="(\d+) queries"')
+SIZE_MODELS = (User, Event, Registration, Team, TeamMessage, ForumPost, ForumComment, ForumVote, DirectMessage)
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, -(-pct * len(sorted_values) // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def pick_fixtures():
+    """Ids that make each route do representative work: the busiest post, chatter, team, etc."""
+    admin = User.query.filter_by(privilege_level=1).order_by(User.id).first()
+    hot_post = ForumPost.query.order_by(ForumPost.comment_count.desc(), ForumPost.id).first()
+    quiet_post = ForumPost.query.order_by(ForumPost.comment_count, ForumPost.id).first()
+
+    chatter_id = partner_id = None
+    top = db.session.query(DirectMessage.sender_id, DirectMessage.receiver_id, func.count(DirectMessage.id))\
+        .group_by(DirectMessage.sender_id, DirectMessage.receiver_id)\
+        .order_by(func.count(DirectMessage.id).desc()).first()
+    if top:
+        chatter_id, partner_id = top[0], top[1]
+
+    team = member_id = None
+    busiest = db.session.query(TeamMessage.team_id, func.count(TeamMessage.id))\
+        .group_by(TeamMessage.team_id).order_by(func.count(TeamMessage.id).desc()).first()
+    if busiest:
+        team = db.session.get(Team, busiest[0])
+        member_id = team.members[0].id if team.members else None
+
+    return {
+        'admin_id': admin.id if admin else None,
+        'hot_post_id': hot_post.id if hot_post else None,
+        'quiet_post_id': quiet_post.id if quiet_post else None,
+        'chatter_id': chatter_id,
+        'partner_id': partner_id,
+        'team_id': team.id if team else None,
+        'member_id': member_id,
+    }
+
+
+def build_routes(f):
+    """[(name, path, login_as_user_id)] for the routes that have the data they need."""
+    today = datetime.utcnow().date()
+    window = f"start={today - timedelta(days=30)}&end={today + timedelta(days=60)}"
+    routes = [
+        ('home', '/', None),
+        ('projects', '/projects', None),
+        ('events', '/events', None),
+        ('calendar_feed', f'/api/events?{window}', None),
+        ('clubs', '/clubs', None),
+        ('leaderboard', '/leaderboard', None),
+        ('forum', '/forum', None),
+        ('forum_search', '/forum?search=python', None),
+        ('user_search', '/search?q=python', None),
+        ('teamup', '/teamup', None),
+    ]
+    if f['hot_post_id']:
+        routes.append(('forum_post_hot', f"/forum/post/{f['hot_post_id']}", None))
+        routes.append(('forum_post_quiet', f"/forum/post/{f['quiet_post_id']}", None))
+    if f['chatter_id']:
+        routes.append(('inbox', '/messages', f['chatter_id']))
+        routes.append(('conversation', f"/messages/{f['partner_id']}", f['chatter_id']))
+        routes.append(('view_user', f"/user/{f['chatter_id']}", None))
+    if f['member_id']:
+        routes.append(('team_chat', f"/teamup/{f['team_id']}/chat", f['member_id']))
+    if f['admin_id']:
+        routes.append(('admin_dashboard', '/admin', f['admin_id']))
+        routes.append(('admin_users', '/admin/users', f['admin_id']))
+    return routes
+
+
+def bench_route(app, path, user_id, requests, warmup):
+    client = app.test_client()
+    if user_id is not None:
+        with client.session_transaction() as session:
+            session['_user_id'] = str(user_id)
+            session['_fresh'] = True
+
+    latencies, queries, db_ms, statuses = [], [], [], set()
+    for i in range(warmup + requests):
+        start = time.perf_counter()
+        response = client.get(path)
+        response.get_data()
+        elapsed = (time.perf_counter() - start) * 1000
+        if i < warmup:
+            continue
+        latencies.append(elapsed)
+        statuses.add(response.status_code)
+        for header in response.headers.getlist('Server-Timing'):
+            match = SERVER_TIMING_DB_RE.search(header)
+            if match:
+                db_ms.append(float(match.group(1)))
+                queries.append(int(match.group(2)))
+
+    latencies.sort()
+    db_ms.sort()
+    return {
+        'path': path,
+        'logged_in': user_id is not None,
+        'status': sorted(statuses),
+        'p50_ms': round(percentile(latencies, 50), 2),
+        'p90_ms': round(percentile(latencies, 90), 2),
+        'p95_ms': round(percentile(latencies, 95), 2),
+        'p99_ms': round(percentile(latencies, 99), 2),
+        'max_ms': round(latencies[-1], 2),
+        'mean_ms': round(sum(latencies) / len(latencies), 2),
+        'queries': max(queries) if queries else None,
+        'db_p50_ms': round(percentile(db_ms, 50), 2) if db_ms else None,
+    }
+
+
+def print_report(result):
+    print(f"{'route':<18} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8} {'queries':>8} {'db p50':>8}  status")
+    for name, r in result['routes'].items():
+        print(f"{name:<18} {r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} {r['p99_ms']:>8.1f} {r['max_ms']:>8.1f} "
+              f"{r['queries'] if r['queries'] is not None else '-':>8} "
+              f"{r['db_p50_ms'] if r['db_p50_ms'] is not None else '-':>8}  {','.join(map(str, r['status']))}")
+
+
+def print_comparison(old, new):
+    print(f"Compared with {old['meta'].get('commit')} ({old['meta'].get('timestamp')}), "
+          f"{old['meta']['rows'].get('user')} users then / {new['meta']['rows'].get('user')} now")
+    print(f"{'route':<18} {'p50 old':>8} {'p50 new':>8} {'change':>8} {'p95 old':>8} {'p95 new':>8} {'queries':>10}")
+    for name, r in new['routes'].items():
+        before = old['routes'].get(name)
+        if before is None:
+            print(f"{name:<18} {'-':>8} {r['p50_ms']:>8.1f} {'new':>8}")
+            continue
+        change = (r['p50_ms'] - before['p50_ms']) / before['p50_ms'] * 100 if before['p50_ms'] else 0.0
+        print(f"{name:<18} {before['p50_ms']:>8.1f} {r['p50_ms']:>8.1f} {change:>+7.0f}% "
+              f"{before['p95_ms']:>8.1f} {r['p95_ms']:>8.1f} {str(before['queries']) + '->' + str(r['queries']):>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the main routes against the configured database.')
+    parser.add_argument('--requests', type=int, default=20, help='timed requests per route')
+    parser.add_argument('--warmup', type=int, default=2, help='untimed requests per route first')
+    parser.add_argument('--routes', help='comma-separated route names to run (default: all)')
+    parser.add_argument('--page-cache', action='store_true', help='leave the rendered-page cache on')
+    parser.add_argument('--out', help='write the JSON result to this file')
+    parser.add_argument('--compare', help='earlier JSON result to compare against')
+    parser.add_argument('--json', action='store_true', help='print the JSON result instead of a report')
+    args = parser.parse_args()
+
+    if not os.environ.get('DATABASE_URL'):
+        print("[ERROR] Set DATABASE_URL to a benchmark database (see scripts/generate_dataset.py)")
+        sys.exit(1)
+
+    app = create_app()
+    app.config['PAGE_CACHE_ENABLED'] = args.page_cache
+    # per-request N+1 warnings would drown the report; the counts are in the results
+    logging.getLogger('query_stats').setLevel(logging.ERROR)
+
+    with app.app_context():
+        fixtures = pick_fixtures()
+        rows = {model.__tablename__: model.query.count() for model in SIZE_MODELS}
+        dialect = db.engine.dialect.name
+        db.session.remove()
+    routes = build_routes(fixtures)
+    if args.routes:
+        wanted = set(args.routes.split(','))
+        routes = [r for r in routes if r[0] in wanted]
+
+    if not args.json:
+        print("=" * 60)
+        print("Route Benchmark")
+        print("=" * 60)
+        print(f"[INFO] {dialect}: " + ', '.join(f"{n} {t}" for t, n in rows.items()))
+        print(f"[INFO] {args.requests} requests per route after {args.warmup} warm-up")
+
+    result = {
+        'meta': {
+            'timestamp': datetime.utcnow().isoformat(timespec='seconds'),
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'dialect': dialect,
+            'rows': rows,
+            'requests': args.requests,
+            'warmup': args.warmup,
+            'page_cache': args.page_cache,
+            'fixtures': fixtures,
+        },
+        'routes': {},
+    }
+    for name, path, user_id in routes:
+        result['routes'][name] = bench_route(app, path, user_id, args.requests, args.warmup)
+
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(result, f, indent=1)
+    if args.json:
+        print(json.dumps(result))
+    else:
+        print_report(result)
+        if args.out:
+            print(f"[INFO] Wrote {args.out}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            print_comparison(json.load(f), result)
+
+    failed = [name for name, r in result['routes'].items() if r['status'] != [200]]
+    if failed:
+        print(f"[ERROR] Non-200 responses from: {', '.join(failed)}")
+        sys.exit(1)
+    if not args.json:
+        print("\n[SUCCESS] Benchmark complete")
+        print("=" * 60)
+
+
+if __name__ == '__main__':
+    main()
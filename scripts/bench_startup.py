@@ -0,0 +1,106 @@
+"""
+Startup benchmark: wall time from a cold `import app` to the first response,
+measured in fresh interpreters (what a serverless cold start pays).
+
+Each run reports three phases: importing the app module (Flask, SQLAlchemy,
+models, blueprints), create_app(), and the first request through the test
+client. It also checks that the heavy optional modules (Pillow, boto3,
+brotli, and the admin-only bulk_import and user_deletion) were not imported,
+since they should only load when a request actually needs them. Exits with status 1 if the median total exceeds the
+budget or a heavy module was loaded.
+
+    python scripts/bench_startup.py [--runs 5] [--path /login] [--budget-ms 1500] [--json]
+
+The budget can also be set with STARTUP_BUDGET_MS. The default path needs no
+database query, so the number doesn't depend on network latency.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_BUDGET_MS = 1500
+HEAVY_MODULES = ('PIL', 'boto3', 'botocore', 'brotli', 'bulk_import', 'user_deletion')
+
+# Runs in the child interpreter; prints one JSON line
+PROBE = r'''
+import json, sys, time
+t0 = time.perf_counter()
+import app as app_module
+t1 = time.perf_counter()
+app = app_module.create_app()
+t2 = time.perf_counter()
+response = app.test_client().get(sys.argv[1])
+t3 = time.perf_counter()
+print(json.dumps({
+    'import_ms': (t1 - t0) * 1000,
+    'create_app_ms': (t2 - t1) * 1000,
+    'first_response_ms': (t3 - t2) * 1000,
+    'total_ms': (t3 - t0) * 1000,
+    'status': response.status_code,
+    'heavy_modules': sorted(m for m in sys.argv[2].split(',') if m in sys.modules),
+}))
+'''
+
+
+def run_once(path):
+    env = dict(os.environ, PYTHONPATH=ROOT + os.pathsep + os.environ.get('PYTHONPATH', ''))
+    out = subprocess.run(
+        [sys.executable, '-c', PROBE, path, ','.join(HEAVY_MODULES)],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--path', default='/login')
+    parser.add_argument('--budget-ms', type=float,
+                        default=float(os.environ.get('STARTUP_BUDGET_MS', DEFAULT_BUDGET_MS)))
+    parser.add_argument('--json', action='store_true', help='print a single JSON object instead of a report')
+    args = parser.parse_args()
+
+    try:
+        runs = [run_once(args.path) for _ in range(args.runs)]
+    except subprocess.CalledProcessError as e:
+        print(f"[ERROR] Startup failed:\n{e.stderr}")
+        sys.exit(1)
+
+    phases = ('import_ms', 'create_app_ms', 'first_response_ms', 'total_ms')
+    result = {
+        'path': args.path,
+        'runs': args.runs,
+        'budget_ms': args.budget_ms,
+        'median': {p: round(statistics.median(r[p] for r in runs), 1) for p in phases},
+        'max': {p: round(max(r[p] for r in runs), 1) for p in phases},
+        'status': runs[-1]['status'],
+        'heavy_modules': sorted({m for r in runs for m in r['heavy_modules']}),
+    }
+    result['ok'] = result['median']['total_ms'] <= args.budget_ms and not result['heavy_modules']
+
+    if args.json:
+        print(json.dumps(result))
+    else:
+        print("=" * 60)
+        print("Startup Benchmark")
+        print("=" * 60)
+        print(f"[INFO] {args.runs} cold starts, first request GET {args.path} -> {result['status']}")
+        for p in phases:
+            print(f"[INFO] {p[:-3]:<18} median {result['median'][p]:8.1f} ms   max {result['max'][p]:8.1f} ms")
+        if result['heavy_modules']:
+            print(f"[ERROR] Loaded at startup: {', '.join(result['heavy_modules'])}")
+        if result['median']['total_ms'] > args.budget_ms:
+            print(f"[ERROR] Median {result['median']['total_ms']} ms is over the {args.budget_ms:.0f} ms budget")
+        if result['ok']:
+            print(f"\n[SUCCESS] Within the {args.budget_ms:.0f} ms startup budget")
+        print("=" * 60)
+    sys.exit(0 if result['ok'] else 1)
+
+
+if __name__ == '__main__':
+    main()
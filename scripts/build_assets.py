@@ -0,0 +1,59 @@
+"""
+Builds static/dist: content-hashed copies of every static file, .gz/.br
+siblings for text assets and the manifest url_for('static') resolves
+through (see assets.py). static/dist is build output and is not committed:
+run this in the deploy step (before `vercel --prod`) and again locally after
+changing anything under static/, since the app trusts the manifest as built.
+
+    python scripts/build_assets.py           # build
+    python scripts/build_assets.py --check   # list sources changed since the last build
+
+--check exits with status 1 if any source is stale or was never built.
+"""
+import argparse
+import os
+import sys
+
+import assets
+
+STATIC_FOLDER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'static')
+
+parser = argparse.ArgumentParser(description='Fingerprint and precompress static files into static/dist.')
+parser.add_argument('--check', action='store_true', help='only report sources changed since the last build')
+args = parser.parse_args()
+
+print("=" * 60)
+print("Build Static Assets")
+print("=" * 60)
+
+if args.check:
+    changed = assets.stale(STATIC_FOLDER)
+    for rel in changed:
+        print(f"[ERROR] static/{rel} changed since the last build")
+    if changed:
+        print(f"\n[INFO] {len(changed)} stale assets; run scripts/build_assets.py")
+    else:
+        print("[SUCCESS] static/dist is up to date")
+    print("=" * 60)
+    sys.exit(1 if changed else 0)
+
+try:
+    if assets.brotli is None:
+        print("[INFO] Brotli not installed (pip install Brotli); writing .gz only")
+    manifest = assets.build(STATIC_FOLDER)
+    total = 0
+    for rel, entry in sorted(manifest['files'].items()):
+        path = os.path.join(STATIC_FOLDER, entry['path'])
+        size = os.path.getsize(path)
+        total += size
+        compressed = [f"{suffix} {os.path.getsize(path + suffix) // 1024} KB"
+                      for _, suffix in assets.ENCODINGS if os.path.exists(path + suffix)]
+        note = f" ({', '.join(compressed)})" if compressed else ""
+        print(f"[SUCCESS] {rel} -> {entry['path']}{note}")
+    print(f"\n[INFO] {len(manifest['files'])} assets, {total // 1024} KB fingerprinted")
+except Exception as e:
+    print(f"[ERROR] Asset build failed: {e}")
+    import traceback
+    traceback.print_exc()
+
+print("=" * 60)
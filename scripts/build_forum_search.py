@@ -0,0 +1,34 @@
+"""
+Creates the forum full-text search index for the configured database and
+(re)indexes every post with its comments.
+PostgreSQL gets a tsvector table with a GIN index, SQLite an FTS5 table.
+Safe to re-run; an index in the older one-document-per-post layout is
+replaced. New and edited posts/comments are indexed automatically.
+"""
+from app import create_app
+from models import db
+import forum_search
+
+app = create_app()
+
+with app.app_context():
+    print("=" * 60)
+    print("Build Forum Search Index")
+    print("=" * 60)
+
+    try:
+        conn = db.session.connection()
+        backend = forum_search.create_index(conn)
+        print(f"[SUCCESS] Search index ready ({backend.name} backend)")
+
+        count = forum_search.rebuild_index(conn)
+        db.session.commit()
+        print(f"[SUCCESS] Indexed {count} posts")
+
+    except Exception as e:
+        print(f"[ERROR] Build failed: {e}")
+        db.session.rollback()
+        import traceback
+        traceback.print_exc()
+
+    print("=" * 60)
@@ -0,0 +1,80 @@
+"""
+Check for the forum comment tree (build_comment_tree): every comment must be
+reachable through the "load more replies" links, i.e. opening ?thread=<id>
+on a comment with more than max_replies replies shows all of them.
+Needs no database. Exits with status 1 on failure.
+
+    python scripts/check_comment_tree.py
+"""
+import sys
+from types import SimpleNamespace
+
+from blueprints.forum import build_comment_tree
+
+MAX_DEPTH = 5
+MAX_REPLIES = 10
+
+
+def walk(nodes):
+    for node in nodes:
+        yield node
+        yield from walk(node['replies'])
+
+
+def reachable(comments):
+    """Comment ids a reader can get to from the post page by following "load more" links."""
+    seen, pending = set(), [None]
+    while pending:
+        root_id = pending.pop()
+        for node in walk(build_comment_tree(comments, root_id, MAX_DEPTH, MAX_REPLIES)):
+            seen.add(node['comment'].id)
+            if node['more'] and node['comment'].id != root_id:
+                pending.append(node['comment'].id)
+    return seen
+
+
+def main():
+    # one top-level comment with 25 replies, the first of which has 15 replies of its own,
+    # and a chain deeper than MAX_DEPTH
+    comments = [SimpleNamespace(id=1, parent_id=None)]
+    comments += [SimpleNamespace(id=100 + i, parent_id=1) for i in range(25)]
+    comments += [SimpleNamespace(id=200 + i, parent_id=100) for i in range(15)]
+    comments += [SimpleNamespace(id=300 + i, parent_id=300 + i - 1 if i else 1) for i in range(MAX_DEPTH + 3)]
+
+    print("=" * 60)
+    print("Comment Tree Check")
+    print("=" * 60)
+    failed = False
+
+    top = build_comment_tree(comments, None, MAX_DEPTH, MAX_REPLIES)
+    first = top[0]
+    if len(first['replies']) != MAX_REPLIES or first['more'] != 25 + 1 - MAX_REPLIES:
+        print(f"[ERROR] Post page: expected {MAX_REPLIES} replies shown and the rest behind 'load more', "
+              f"got {len(first['replies'])} shown, {first['more']} more")
+        failed = True
+    else:
+        print(f"[INFO] Post page shows {MAX_REPLIES} replies, {first['more']} behind 'load more'")
+
+    thread = build_comment_tree(comments, 1, MAX_DEPTH, MAX_REPLIES)[0]
+    if len(thread['replies']) != 26 or thread['more']:
+        print(f"[ERROR] Thread view: expected all 26 replies, got {len(thread['replies'])} "
+              f"and {thread['more']} still hidden")
+        failed = True
+    else:
+        print("[INFO] Thread view shows every direct reply")
+
+    missing = {c.id for c in comments} - reachable(comments)
+    if missing:
+        print(f"[ERROR] {len(missing)} comments can't be reached: {sorted(missing)[:10]}")
+        failed = True
+    else:
+        print(f"[INFO] All {len(comments)} comments reachable")
+
+    if not failed:
+        print("[SUCCESS] Comment tree check passed")
+    print("=" * 60)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+"""
+Reports database connection latency for the active DEPLOY_PROFILE: the cold
+first connection (what a serverless cold start pays) and the warm acquire
+time of the following checkouts (pool wait + pre-ping, or a full connect
+with the nopool profile).
+
+    DEPLOY_PROFILE=serverless python scripts/check_db_latency.py [checkouts]
+"""
+import sys
+
+from sqlalchemy import text
+
+from app import create_app
+from models import db
+import db_engine
+
+CHECKOUTS = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+app = create_app()
+
+with app.app_context():
+    print("=" * 60)
+    print("Database Connection Latency")
+    print("=" * 60)
+    options = {k: v for k, v in app.config['SQLALCHEMY_ENGINE_OPTIONS'].items() if k != 'connect_args'}
+    print(f"[INFO] Profile: {app.config['DEPLOY_PROFILE']}  pool: {type(db.engine.pool).__name__}")
+    print(f"[INFO] Engine options: {options}")
+
+    cold = db_engine.warm_up(app)
+    if cold is None:
+        print("[ERROR] Could not connect to the database")
+        sys.exit(1)
+    print(f"[INFO] Cold connection + first query: {cold:.1f} ms")
+
+    db_engine.stats.reset()
+    for _ in range(CHECKOUTS):
+        with db.engine.connect() as conn:
+            conn.execute(text('SELECT 1'))
+    snapshot = db_engine.stats.snapshot()
+    print(f"[INFO] Warm checkouts: {snapshot['acquires']}, "
+          f"avg acquire {snapshot['avg_acquire_ms']} ms, max {snapshot['max_acquire_ms']} ms")
+    print(f"[INFO] New connections opened: {snapshot['connects']} "
+          f"(avg connect {snapshot['avg_connect_ms']} ms)")
+    print(f"[INFO] Pool status: {db.engine.pool.status()}")
+    print("=" * 60)
@@ -0,0 +1,209 @@
+"""
+Query-plan regression check: runs EXPLAIN on the filters behind the busiest
+pages and fails if any of them reads its table with a full scan, or through
+an index other than the one it is meant to use (EXPECTED_INDEXES).
+
+    python scripts/check_query_plans.py [--only forum_listing,team_chat] [--json]
+
+Works on SQLite (EXPLAIN QUERY PLAN) and PostgreSQL (EXPLAIN, FORMAT JSON).
+PostgreSQL happily seq-scans small tables even when a good index exists, so
+there the check runs with enable_seqscan off: a Seq Scan that still shows up
+means no index can serve the query. Run it against a migrated database
+(`flask db upgrade`, or db.create_all() on a fresh one); it needs no data.
+On PostgreSQL it also checks people search, which needs the trigram indexes
+from scripts/migrate_people_search.py.
+Exits with status 1 if any query falls back to a full scan or the wrong index.
+"""
+import argparse
+import json
+import re
+import sys
+from datetime import datetime
+
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.orm import joinedload
+
+import people_search
+from app import create_app
+from blueprints.messaging import conversation_query
+from models import (
+    db, user_skills, Conversation, DirectMessage, Event, ForumComment, ForumPost, ForumVote, Registration, Skill,
+    TeamJoinRequest, TeamMessage
+)
+
+SQLITE_SCAN_RE = re.compile(r'^SCAN (\w+)(?: AS \w+)?$')
+SQLITE_INDEX_RE = re.compile(r'USING (?:COVERING )?INDEX (\w+)|USING INTEGER PRIMARY KEY')
+
+
+# query name -> the indexes it is meant to use. Any other index counts as a regression
+# even when it avoids a full scan, e.g. a wider index displacing a partial one.
+# Queries not listed only have to avoid full scans.
+EXPECTED_INDEXES = {
+    'forum_listing': {'ix_forum_posts_score_created'},
+    'forum_category': {'ix_forum_posts_category_score'},
+    'post_comments': {'ix_forum_comments_post_parent'},
+    'unread_count': {'ix_direct_messages_receiver_read'},
+    # equality on sender, receiver and is_read: either index serves it
+    'mark_conversation_read': {'ix_direct_messages_pair_created', 'ix_direct_messages_receiver_read'},
+    'conversation_history': {'ix_direct_messages_pair_created'},
+    'inbox': {'ix_conversations_user_a_last', 'ix_conversations_user_b_last'},
+    'team_chat': {'ix_team_messages_team_created'},
+    'pending_join_requests': {'ix_team_join_request_team_status'},
+    'calendar_feed': {'ix_events_date_end'},
+    'registration_exists': {'unique_registration', 'sqlite_autoindex_registrations_1'},
+    'event_registration_counts': {'ix_registrations_event'},
+    'delete_user_posts': {'ix_forum_posts_author'},
+    'delete_user_comments': {'ix_forum_comments_author'},
+    'delete_comment_replies': {'ix_forum_comments_parent'},
+    'delete_comment_votes': {'ix_forum_votes_comment'},
+    'delete_user_messages': {'ix_direct_messages_pair_created', 'ix_direct_messages_receiver_read'},
+    'delete_user_team_messages': {'ix_team_messages_sender'},
+    'people_search_skill': {'ix_user_skills_skill_id'},
+    'people_search': {'ix_user_name_trgm', 'ix_user_username_trgm', 'user_pkey'},
+}
+
+
+def hot_queries(dialect_name):
+    """(name, table that must not be scanned, statement), written the way the routes write them."""
+    queries = [
+        ('forum_listing', 'forum_posts',
+         ForumPost.query.options(joinedload(ForumPost.author), joinedload(ForumPost.category))
+         .order_by(ForumPost.score.desc(), ForumPost.created_at.desc()).limit(50)),
+        ('forum_category', 'forum_posts',
+         ForumPost.query.options(joinedload(ForumPost.author), joinedload(ForumPost.category))
+         .filter_by(category_id=1).order_by(ForumPost.score.desc(), ForumPost.created_at.desc()).limit(50)),
+        ('post_comments', 'forum_comments',
+         ForumComment.query.options(joinedload(ForumComment.author)).filter_by(post_id=1)
+         .order_by(ForumComment.score.desc(), ForumComment.created_at)),
+        ('unread_count', 'direct_messages',
+         select(func.count(DirectMessage.id))
+         .where(DirectMessage.receiver_id == 1, DirectMessage.is_read == False)),  # noqa: E712
+        ('mark_conversation_read', 'direct_messages',
+         update(DirectMessage).where(DirectMessage.sender_id == 2, DirectMessage.receiver_id == 1,
+                                     DirectMessage.is_read == False)  # noqa: E712
+         .values(is_read=True)),
+        ('conversation_history', 'direct_messages',
+         conversation_query(1, 2).order_by(DirectMessage.created_at.desc(), DirectMessage.id.desc()).limit(51)),
+        ('inbox', 'conversations', Conversation.for_user(1)),
+        ('team_chat', 'team_messages',
+         TeamMessage.query.options(joinedload(TeamMessage.sender)).filter_by(team_id=1)
+         .order_by(TeamMessage.created_at.desc(), TeamMessage.id.desc()).limit(51)),
+        ('pending_join_requests', 'team_join_request',
+         TeamJoinRequest.query.filter_by(team_id=1, status='pending')),
+        ('calendar_feed', 'events',
+         Event.query.filter(Event.date >= datetime(2025, 1, 1), Event.date < datetime(2025, 3, 1),
+                            (Event.end_date >= datetime(2025, 2, 1)) |
+                            ((Event.end_date == None) & (Event.date >= datetime(2025, 2, 1))))  # noqa: E711
+         .order_by(Event.date, Event.id)),
+        ('registration_exists', 'registrations',
+         Registration.query.filter_by(user_id=1, event_id=1).limit(1)),
+        ('event_registration_counts', 'registrations',
+         db.session.query(Registration.event_id, func.count(Registration.id))
+         .filter(Registration.event_id.in_([1, 2, 3])).group_by(Registration.event_id)),
+        ('delete_user_posts', 'forum_posts', select(ForumPost.id).where(ForumPost.author_id == 1)),
+        ('delete_user_comments', 'forum_comments', select(ForumComment.id).where(ForumComment.author_id == 1)),
+        ('delete_comment_replies', 'forum_comments',
+         select(ForumComment.id).where(ForumComment.parent_id.in_([1, 2, 3]))),
+        ('delete_comment_votes', 'forum_votes', select(ForumVote.id).where(ForumVote.comment_id.in_([1, 2, 3]))),
+        ('delete_user_messages', 'direct_messages',
+         select(DirectMessage.id).where(or_(DirectMessage.sender_id == 1, DirectMessage.receiver_id == 1))),
+        ('delete_user_team_messages', 'team_messages', select(TeamMessage.id).where(TeamMessage.sender_id == 1)),
+        ('people_search_skill', 'user_skills',
+         select(user_skills.c.user_id).join(Skill, Skill.id == user_skills.c.skill_id).where(Skill.name == 'python')),
+    ]
+    # Substring LIKEs on name/username are only indexable through pg_trgm
+    # (scripts/migrate_people_search.py creates the indexes); SQLite always scans.
+    if dialect_name == 'postgresql':
+        queries.append(('people_search', 'user', people_search.search_query('python')))
+    return queries
+
+
+def to_sql(statement, dialect):
+    statement = getattr(statement, 'statement', statement)  # Query -> Select
+    return str(statement.compile(dialect=dialect, compile_kwargs={'literal_binds': True}))
+
+
+def explain_sqlite(conn, sql, table):
+    """(full scan?, indexes used, plan lines) from EXPLAIN QUERY PLAN."""
+    details = [row[3] for row in conn.exec_driver_sql('EXPLAIN QUERY PLAN ' + sql)]
+    scanned = any((m := SQLITE_SCAN_RE.match(d)) and m.group(1) == table for d in details)
+    indexes = sorted({m.group(1) or 'primary key' for d in details
+                      if table in d for m in [SQLITE_INDEX_RE.search(d)] if m})
+    return scanned, indexes, details
+
+
+def explain_postgresql(conn, sql, table):
+    """(full scan?, indexes used, plan node summaries) from EXPLAIN (FORMAT JSON)."""
+    with conn.begin():
+        conn.exec_driver_sql('SET LOCAL enable_seqscan = off')
+        plan = conn.exec_driver_sql('EXPLAIN (FORMAT JSON) ' + sql).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    nodes, stack = [], [plan[0]['Plan']]
+    while stack:
+        node = stack.pop()
+        nodes.append(node)
+        stack.extend(node.get('Plans', []))
+    scanned = any(n['Node Type'] == 'Seq Scan' and n.get('Relation Name') == table for n in nodes)
+    indexes = sorted({n['Index Name'] for n in nodes if n.get('Relation Name') == table and 'Index Name' in n})
+    details = [f"{n['Node Type']} {n.get('Relation Name', '')} {n.get('Index Name', '')}".strip() for n in nodes]
+    return scanned, indexes, details
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Fail if a hot query falls back to a full table scan.')
+    parser.add_argument('--only', help='comma-separated query names to check (default: all)')
+    parser.add_argument('--json', action='store_true', help='print the results as JSON')
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        dialect = db.engine.dialect
+        if dialect.name == 'sqlite':
+            explain = explain_sqlite
+        elif dialect.name == 'postgresql':
+            explain = explain_postgresql
+        else:
+            print(f"[ERROR] No EXPLAIN support for {dialect.name}")
+            sys.exit(1)
+
+        queries = hot_queries(dialect.name)
+        if args.only:
+            wanted = set(args.only.split(','))
+            queries = [q for q in queries if q[0] in wanted]
+
+        results = []
+        with db.engine.connect() as conn:
+            for name, table, statement in queries:
+                scanned, indexes, details = explain(conn, to_sql(statement, dialect), table)
+                expected = EXPECTED_INDEXES.get(name)
+                unexpected = sorted(set(indexes) - expected) if expected else []
+                results.append({'query': name, 'table': table, 'full_scan': scanned,
+                                'indexes': indexes, 'unexpected_indexes': unexpected, 'plan': details})
+
+    failed = [r for r in results if r['full_scan'] or r['unexpected_indexes']]
+    if args.json:
+        print(json.dumps({'dialect': dialect.name, 'ok': not failed, 'queries': results}))
+    else:
+        print("=" * 60)
+        print("Query Plan Check")
+        print("=" * 60)
+        for r in results:
+            if r['full_scan'] or r['unexpected_indexes']:
+                if r['full_scan']:
+                    print(f"[ERROR] {r['query']}: full scan of {r['table']}")
+                else:
+                    print(f"[ERROR] {r['query']}: uses {', '.join(r['unexpected_indexes'])}, expected "
+                          f"{' or '.join(sorted(EXPECTED_INDEXES[r['query']]))}")
+                for line in r['plan']:
+                    print(f"          {line}")
+            else:
+                print(f"[INFO] {r['query']:<26} {r['table']:<18} {', '.join(r['indexes']) or '-'}")
+        if not failed:
+            print(f"\n[SUCCESS] {len(results)} hot queries use their indexes")
+        print("=" * 60)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
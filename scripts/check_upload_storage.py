@@ -0,0 +1,151 @@
+"""
+Check for the upload storage backends (storage.py). For each backend it
+streams a large upload and checks that memory stays flat, uploads the same
+content twice and checks it is stored once, then reads it back through the
+backend's /uploads response. Exits with status 1 on failure.
+
+The local backend runs in a temporary directory. The S3 backend runs against
+a real S3-compatible endpoint when UPLOAD_S3_ENDPOINT_URL and
+UPLOAD_S3_BUCKET are set (e.g. a local MinIO), otherwise against a small
+folder-backed stand-in for the S3 client:
+
+    python scripts/check_upload_storage.py
+"""
+import io
+import os
+import shutil
+import sys
+import tempfile
+import tracemalloc
+from urllib.parse import urlparse, parse_qs
+
+from flask import Flask
+from werkzeug.datastructures import FileStorage
+
+import storage
+
+try:
+    from botocore.exceptions import ClientError
+except ImportError:
+    ClientError = None
+
+UPLOAD_SIZE = 6 * 1024 * 1024
+MAX_PEAK = 1024 * 1024  # streaming must not hold the whole file in memory
+
+
+class FolderS3Client:
+    """Just enough of the boto3 S3 client for S3Storage, backed by a directory."""
+
+    def __init__(self, root):
+        self.root = root
+        self.puts = 0
+
+    def _path(self, bucket, key):
+        return os.path.join(self.root, bucket, key)
+
+    def head_object(self, Bucket, Key):
+        if not os.path.exists(self._path(Bucket, Key)):
+            err = ClientError({'Error': {'Code': '404'}}, 'HeadObject') if ClientError else Exception()
+            err.response = {'Error': {'Code': '404'}}
+            raise err
+        return {}
+
+    def upload_fileobj(self, fileobj, bucket, key, ExtraArgs=None):
+        path = self._path(bucket, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as out:
+            shutil.copyfileobj(fileobj, out, storage.CHUNK_SIZE)
+        self.puts += 1
+
+    def delete_object(self, Bucket, Key):
+        os.remove(self._path(Bucket, Key))
+
+    def generate_presigned_url(self, method, Params, ExpiresIn):
+        return f"http://s3.invalid/{Params['Bucket']}/{Params['Key']}?X-Amz-Expires={ExpiresIn}"
+
+
+def upload(data, filename):
+    return FileStorage(stream=io.BytesIO(data), filename=filename)
+
+
+def check(backend, read_back):
+    failures = []
+    payload = os.urandom(UPLOAD_SIZE)
+    source = upload(payload, 'resume.pdf')
+
+    tracemalloc.start()
+    key = storage.store_upload(backend, source)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # the test payload itself is allocated before tracing starts
+    print(f"[INFO] {backend.name}: stored {UPLOAD_SIZE // 1024} KB as {key}, peak {peak // 1024} KB")
+    if peak > MAX_PEAK:
+        failures.append(f"{backend.name}: peak memory {peak // 1024} KB while streaming")
+
+    again = storage.store_upload(backend, upload(payload, 'copy-of-resume.PDF'))
+    if again != key:
+        failures.append(f"{backend.name}: identical upload got a new key {again}")
+
+    other = storage.store_upload(backend, upload(b'certificate', 'cert.png'))
+    if other == key or not backend.exists(other):
+        failures.append(f"{backend.name}: different content was not stored separately")
+
+    if read_back(key) != payload:
+        failures.append(f"{backend.name}: blob read back differs from upload")
+    backend.delete(other)
+    return failures
+
+
+def main():
+    app = Flask(__name__)
+    tmp = tempfile.mkdtemp()
+    failures = []
+    print("=" * 60)
+    print("Upload Storage Check")
+    print("=" * 60)
+    try:
+        with app.test_request_context():
+            local = storage.LocalStorage(os.path.join(tmp, 'uploads'))
+
+            def read_local(key):
+                response = local.response(key)
+                response.direct_passthrough = False
+                return response.get_data()
+            failures += check(local, read_local)
+
+            endpoint = os.environ.get('UPLOAD_S3_ENDPOINT_URL')
+            bucket = os.environ.get('UPLOAD_S3_BUCKET')
+            if endpoint and bucket:
+                s3 = storage.S3Storage(bucket, prefix='check/', endpoint_url=endpoint)
+                print(f"[INFO] s3: using {endpoint}/{bucket}")
+            else:
+                s3 = storage.S3Storage('bucket', prefix='check/', client=FolderS3Client(os.path.join(tmp, 's3')))
+                print("[INFO] s3: UPLOAD_S3_ENDPOINT_URL/UPLOAD_S3_BUCKET not set, using the folder stand-in")
+
+            def read_s3(key):
+                location = s3.response(key).headers['Location']
+                if parse_qs(urlparse(location).query).get('X-Amz-Expires') != [str(s3.url_expires)]:
+                    failures.append("s3: presigned URL has the wrong expiry")
+                if isinstance(s3.client, FolderS3Client):
+                    with open(s3.client._path(s3.bucket, s3.prefix + key), 'rb') as f:
+                        return f.read()
+                body = io.BytesIO()
+                s3.client.download_fileobj(s3.bucket, s3.prefix + key, body)
+                return body.getvalue()
+            failures += check(s3, read_s3)
+            if isinstance(s3.client, FolderS3Client) and s3.client.puts != 2:
+                failures.append(f"s3: expected 2 uploads after dedupe, saw {s3.client.puts}")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    for failure in failures:
+        print(f"[ERROR] {failure}")
+    if failures:
+        print("=" * 60)
+        sys.exit(1)
+    print("\n[SUCCESS] Streaming, dedupe and read-back OK for both backends")
+    print("=" * 60)
+
+
+if __name__ == '__main__':
+    main()
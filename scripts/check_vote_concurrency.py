@@ -0,0 +1,85 @@
+"""
+Concurrency check for forum voting: many threads vote on the same post and
+comment at once, then the stored counters are compared with the vote rows.
+Any difference means updates were lost. Exits with status 1 on failure.
+
+Runs against a throwaway SQLite database by default. Point DATABASE_URL at a
+scratch PostgreSQL database to exercise real row-level concurrency:
+
+    python scripts/check_vote_concurrency.py [voters] [votes_per_voter]
+"""
+import os
+import sys
+import random
+import tempfile
+import threading
+
+if 'DATABASE_URL' not in os.environ:
+    _tmp = tempfile.NamedTemporaryFile(suffix='.db', delete=False)
+    os.environ['DATABASE_URL'] = 'sqlite:///' + _tmp.name
+
+from app import create_app
+from models import db, User, ForumPost, ForumComment, ForumVote
+
+VOTERS = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+VOTES_PER_VOTER = int(sys.argv[2]) if len(sys.argv) > 2 else 25
+
+app = create_app()
+
+
+def vote_worker(user_id, post_id, comment_id, errors):
+    rng = random.Random(user_id)
+    with app.app_context():
+        for _ in range(VOTES_PER_VOTER):
+            vote_type = rng.choice(ForumVote.VOTE_TYPES)
+            target = {'post_id': post_id} if rng.random() < 0.5 else {'comment_id': comment_id}
+            try:
+                ForumVote.apply(user_id, vote_type, **target)
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                errors.append(e)
+
+
+with app.app_context():
+    print("=" * 60)
+    print("Vote Concurrency Check")
+    print("=" * 60)
+
+    db.create_all()
+    users = [User(name=f'voter{i}', email=f'voter{i}_{os.getpid()}@example.com',
+                  username=f'voter{i}_{os.getpid()}', password_hash='x') for i in range(VOTERS)]
+    db.session.add_all(users)
+    db.session.flush()
+    post = ForumPost(title='Concurrency check', content='-', author_id=users[0].id)
+    db.session.add(post)
+    db.session.flush()
+    comment = ForumComment(content='-', author_id=users[0].id, post_id=post.id)
+    db.session.add(comment)
+    db.session.commit()
+    user_ids, post_id, comment_id = [u.id for u in users], post.id, comment.id
+
+errors = []
+threads = [threading.Thread(target=vote_worker, args=(uid, post_id, comment_id, errors)) for uid in user_ids]
+for t in threads:
+    t.start()
+for t in threads:
+    t.join()
+
+with app.app_context():
+    failed = False
+    for model, target_id, fk in ((ForumPost, post_id, ForumVote.post_id),
+                                 (ForumComment, comment_id, ForumVote.comment_id)):
+        row = db.session.get(model, target_id)
+        ups = ForumVote.query.filter(fk == target_id, ForumVote.vote_type == 'upvote').count()
+        downs = ForumVote.query.filter(fk == target_id, ForumVote.vote_type == 'downvote').count()
+        ok = (row.upvotes, row.downvotes, row.score) == (ups, downs, ups - downs)
+        failed |= not ok
+        print(f"[{'SUCCESS' if ok else 'ERROR'}] {model.__name__}: counters "
+              f"{row.upvotes}/{row.downvotes}/{row.score}, votes {ups}/{downs}/{ups - downs}")
+    if errors:
+        print(f"[WARN] {len(errors)} votes failed with errors, first: {errors[0]}")
+    print(f"\n{VOTERS} voters x {VOTES_PER_VOTER} votes: {'FAILED — votes were lost' if failed else 'no votes lost'}")
+    print("=" * 60)
+
+sys.exit(1 if failed else 0)
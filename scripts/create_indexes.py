@@ -0,0 +1,38 @@
+"""
+Creates any index declared on the models that is missing from the database
+(db.create_all() only adds indexes when it creates the table itself), e.g.
+the chat history and calendar date-range indexes. Safe to re-run.
+"""
+from app import create_app
+from models import db
+from sqlalchemy import inspect
+
+app = create_app()
+
+with app.app_context():
+    print("=" * 60)
+    print("Create Missing Indexes")
+    print("=" * 60)
+    
+    try:
+        inspector = inspect(db.engine)
+        for table in db.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                print(f"[INFO] Table {table.name} does not exist yet — skipping")
+                continue
+            existing = {ix['name'] for ix in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in existing:
+                    index.create(db.engine)
+                    print(f"[SUCCESS] Created index {index.name}")
+                else:
+                    print(f"[INFO] Index {index.name} already exists")
+        
+        print("\n[SUCCESS] Migration completed successfully!")
+        
+    except Exception as e:
+        print(f"[ERROR] Migration failed: {e}")
+        import traceback
+        traceback.print_exc()
+    
+    print("=" * 60)
@@ -0,0 +1,412 @@
+"""
+Fills a database with a synthetic campus-scale dataset for benchmarking:
+users (with skills and platform scores), projects, events, registrations,
+teams, forum posts/comments/votes, direct messages and team chat, plus the
+clubs/chapters directory.
+
+Activity is skewed the way real usage is: a few hot posts collect most
+comments and votes, a few heavy chatters send most DMs, some teams are far
+busier than others, and popular events draw most registrations. The same
+--seed always produces the same data.
+
+Rows are bulk-inserted with Core statements. Counters the app maintains per
+write (comment counts, vote counters, conversation summaries, unread counts)
+are tallied while generating; leaderboard ranks and the forum search index
+are rebuilt the way the maintenance scripts do.
+
+    DATABASE_URL=sqlite:///instances/bench-100k.db python scripts/generate_dataset.py --scale 100k --reset
+
+--scale picks a total row count (1k, 100k or 1m); --rows sets it directly.
+DATABASE_URL must be set explicitly so the shared database is never filled by
+accident. --reset drops and recreates all tables first; without it the
+database must be empty. User 1 is an admin ('bench_admin'); every account's
+password is Passw0rd!.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from itertools import accumulate
+
+from werkzeug.security import generate_password_hash
+
+from app import create_app
+from models import (
+    db, User, Skill, user_skills, Project, Event, Registration, Team, team_members,
+    Club, StudentChapter, ForumCategory, ForumPost, ForumComment, ForumVote,
+    DirectMessage, Conversation, TeamMessage, Platform, PlatformScore, LeaderboardEntry, EntityStats
+)
+import forum_search
+
+SCALES = {'1k': 1_000, '100k': 100_000, '1m': 1_000_000}
+
+# share of the total row count per table (team_members, user_skills and the
+# directory come on top)
+MIX = {
+    'users': 0.02,
+    'projects': 0.005,
+    'events': 0.002,
+    'registrations': 0.05,
+    'teams': 0.004,
+    'posts': 0.03,
+    'comments': 0.15,
+    'votes': 0.33,
+    'direct_messages': 0.25,
+    'team_messages': 0.12,
+}
+
+SKILLS = [
+    'python', 'java', 'c++', 'javascript', 'react', 'flask', 'django', 'sql', 'machine learning',
+    'deep learning', 'data science', 'android', 'flutter', 'kotlin', 'go', 'rust', 'docker',
+    'kubernetes', 'aws', 'linux', 'git', 'figma', 'ui/ux', 'node.js', 'typescript', 'c',
+    'competitive programming', 'cybersecurity', 'iot', 'blockchain',
+]
+BRANCHES = ['CSE', 'IT', 'ECE', 'EEE', 'MECH', 'CIVIL', 'AIML', 'DS']
+CATEGORIES = [('Doubts', 'Ask anything'), ('Study', 'Notes and resources'),
+              ('Announcements', 'Official updates'), ('General', 'Everything else')]
+PLATFORMS = [('hackerrank', 'HackerRank'), ('codechef', 'CodeChef'), ('leetcode', 'LeetCode')]
+WORDS = ('lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor incididunt '
+         'ut labore et dolore magna aliqua python flask exam lab project hackathon assignment '
+         'deadline placement internship club event notes doubt semester').split()
+
+BATCH_SIZE = 5000
+
+
+class Skewed:
+    """Zipf-like picker: a shuffled few ids get most of the picks."""
+
+    def __init__(self, rng, ids, s=1.1):
+        self.rng = rng
+        self.ids = list(ids)
+        rng.shuffle(self.ids)
+        self.cum_weights = list(accumulate(1 / (rank + 1) ** s for rank in range(len(self.ids))))
+
+    def pick(self, k=1):
+        return self.rng.choices(self.ids, cum_weights=self.cum_weights, k=k)
+
+    def one(self):
+        return self.pick()[0]
+
+
+def text(rng, words):
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize()
+
+
+def ago(rng, now, max_days):
+    return now - timedelta(seconds=rng.randint(0, max_days * 86400))
+
+
+def insert(table, rows):
+    """Bulk-insert an iterable of row dicts in batches; returns the row count."""
+    batch, count = [], 0
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= BATCH_SIZE:
+            db.session.execute(table.insert(), batch)
+            count += len(batch)
+            batch = []
+    if batch:
+        db.session.execute(table.insert(), batch)
+        count += len(batch)
+    return count
+
+
+def update_by_id(table, rows):
+    """Batched UPDATE ... WHERE id = :row_id for an iterable of {'row_id': .., column: value} dicts."""
+    stmt = table.update().where(table.c.id == db.bindparam('row_id'))
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= BATCH_SIZE:
+            db.session.execute(stmt, batch)
+            batch = []
+    if batch:
+        db.session.execute(stmt, batch)
+
+
+def counts_for(total):
+    counts = {name: max(1, round(total * share)) for name, share in MIX.items()}
+    counts['users'] = max(counts['users'], 10)
+    counts['posts'] = max(counts['posts'], 5)
+    return counts
+
+
+def generate(counts, seed):
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    written = {}
+    password_hash = generate_password_hash('Passw0rd!')
+
+    # users, skills, platform scores
+    n_users = counts['users']
+    user_ids = range(1, n_users + 1)
+    skill_ids = range(1, len(SKILLS) + 1)
+    written['skills'] = insert(Skill.__table__, ({'id': i, 'name': name} for i, name in zip(skill_ids, SKILLS)))
+    user_skill_rows = []
+
+    def users():
+        for i in user_ids:
+            picked = rng.sample(skill_ids, rng.randint(0, 4))
+            user_skill_rows.extend({'user_id': i, 'skill_id': s} for s in picked)
+            username = 'bench_admin' if i == 1 else f'student{i}'
+            yield {
+                'id': i, 'name': f'Student {i}', 'username': username, 'email': f'{username}@vnrvjiet.in',
+                'password_hash': password_hash, 'roll_number': f'22071A{i:05d}',
+                'branch': rng.choice(BRANCHES), 'year': str(rng.randint(1, 4)), 'college': 'VNR VJIET',
+                'skills': ', '.join(SKILLS[s - 1] for s in picked), 'bio': text(rng, 12),
+                'is_admin': i == 1, 'privilege_level': 1 if i == 1 else rng.choice((2, 3, 4, 4, 4, 4, 4, 4)),
+                'is_banned': False, 'is_silenced': False, 'unread_msg_count': 0,
+                'created_at': ago(rng, now, 730),
+            }
+    written['users'] = insert(User.__table__, users())
+    written['user_skills'] = insert(user_skills, user_skill_rows)
+
+    written['platforms'] = insert(Platform.__table__, (
+        {'id': i, 'slug': slug, 'name': name} for i, (slug, name) in enumerate(PLATFORMS, 1)))
+    written['platform_scores'] = insert(PlatformScore.__table__, (
+        {'user_id': u, 'platform_id': p, 'score': int(rng.paretovariate(1.5) * 100), 'updated_at': now}
+        for u in user_ids if rng.random() < 0.3
+        for p in rng.sample(range(1, len(PLATFORMS) + 1), rng.randint(1, len(PLATFORMS)))
+    ))
+
+    active_users = Skewed(rng, user_ids, s=0.9)
+
+    # directory
+    written['clubs'] = insert(Club.__table__, (
+        {'id': i, 'name': f'Club {i}', 'description': text(rng, 20), 'contact': f'club{i}@vnrvjiet.in',
+         'website_url': f'https://example.org/club{i}', 'created_at': now, 'updated_at': now}
+        for i in range(1, 31)))
+    written['student_chapters'] = insert(StudentChapter.__table__, (
+        {'id': i, 'name': f'Chapter {i}', 'description': text(rng, 20), 'student_lead': f'Student {i}',
+         'created_at': now, 'updated_at': now}
+        for i in range(1, 21)))
+
+    # projects, events, registrations
+    written['projects'] = insert(Project.__table__, (
+        {'id': i, 'title': text(rng, 3), 'description': text(rng, 30), 'owner_id': active_users.one(),
+         'github': f'https://github.com/example/project{i}', 'created_at': ago(rng, now, 365)}
+        for i in range(1, counts['projects'] + 1)))
+
+    event_ids = range(1, counts['events'] + 1)
+    written['events'] = insert(Event.__table__, (
+        {'id': i, 'title': text(rng, 3), 'description': text(rng, 25), 'location': f'Block {rng.choice("ABCDE")}',
+         'date': now + timedelta(days=rng.randint(-365, 120), hours=rng.randint(8, 18)),
+         'event_type': rng.choice(('general', 'general', 'exam', 'deadline', 'holiday')),
+         'color': '#007bff', 'created_by': 1, 'created_at': ago(rng, now, 400)}
+        for i in event_ids))
+
+    popular_events = Skewed(rng, event_ids, s=1.0)
+    pairs = set()
+    target = min(counts['registrations'], n_users * len(event_ids))
+    while len(pairs) < target:
+        pairs.add((rng.choice(user_ids), popular_events.one()))
+    written['registrations'] = insert(Registration.__table__, (
+        {'user_id': u, 'event_id': e, 'created_at': ago(rng, now, 180)} for u, e in sorted(pairs)))
+
+    # teams
+    team_ids = range(1, counts['teams'] + 1)
+    members_of = {}
+    for t in team_ids:
+        members_of[t] = list({active_users.one() for _ in range(rng.randint(1, 4))})
+    written['teams'] = insert(Team.__table__, (
+        {'id': t, 'name': f'Team {t}', 'description': text(rng, 15), 'leader_id': members_of[t][0],
+         'size_limit': 4, 'event_id': rng.choice(event_ids) if rng.random() < 0.5 else None}
+        for t in team_ids))
+    written['team_members'] = insert(team_members, (
+        {'team_id': t, 'user_id': u} for t, members in members_of.items() for u in members))
+
+    busy_teams = Skewed(rng, team_ids, s=1.2)
+    written['team_messages'] = insert(TeamMessage.__table__, (
+        {'team_id': t, 'sender_id': rng.choice(members_of[t]), 'content': text(rng, rng.randint(2, 20)),
+         'created_at': ago(rng, now, 120)}
+        for t in busy_teams.pick(counts['team_messages'])))
+
+    # forum
+    written['forum_categories'] = insert(ForumCategory.__table__, (
+        {'id': i, 'name': name, 'description': desc, 'created_at': now}
+        for i, (name, desc) in enumerate(CATEGORIES, 1)))
+    post_ids = range(1, counts['posts'] + 1)
+    post_created = {}
+
+    def posts():
+        for i in post_ids:
+            post_created[i] = ago(rng, now, 365)
+            yield {'id': i, 'title': text(rng, rng.randint(4, 10)), 'content': text(rng, rng.randint(20, 120)),
+                   'author_id': active_users.one(), 'category_id': rng.randint(1, len(CATEGORIES)),
+                   'upvotes': 0, 'downvotes': 0, 'score': 0, 'comment_count': 0,
+                   'is_locked': False, 'is_pinned': i <= 2, 'created_at': post_created[i],
+                   'updated_at': post_created[i]}
+    written['forum_posts'] = insert(ForumPost.__table__, posts())
+
+    hot_posts = Skewed(rng, post_ids, s=1.1)
+    comment_ids = range(1, counts['comments'] + 1)
+    comments_on = {}
+
+    def comments():
+        for i, post_id in zip(comment_ids, hot_posts.pick(len(comment_ids))):
+            siblings = comments_on.setdefault(post_id, [])
+            parent = rng.choice(siblings) if siblings and rng.random() < 0.4 else None
+            siblings.append(i)
+            created = post_created[post_id] + timedelta(minutes=rng.randint(1, 60 * 24 * 14))
+            yield {'id': i, 'content': text(rng, rng.randint(5, 60)), 'author_id': active_users.one(),
+                   'post_id': post_id, 'parent_id': parent, 'upvotes': 0, 'downvotes': 0, 'score': 0,
+                   'created_at': created, 'updated_at': created}
+    written['forum_comments'] = insert(ForumComment.__table__, comments())
+
+    hot_comments = Skewed(rng, comment_ids, s=1.0)
+    post_votes, comment_votes = set(), set()
+    want_post_votes = min(counts['votes'] * 2 // 3, n_users * len(post_ids))
+    want_comment_votes = min(counts['votes'] - want_post_votes, n_users * len(comment_ids))
+    while len(post_votes) < want_post_votes:
+        post_votes.add((rng.choice(user_ids), hot_posts.one()))
+    while len(comment_votes) < want_comment_votes:
+        comment_votes.add((rng.choice(user_ids), hot_comments.one()))
+
+    # vote counters are tallied here and written by id below; ForumVote.reconcile()
+    # recomputes them with correlated subqueries, far too slow at these sizes
+    post_tally, comment_tally = {}, {}
+
+    def votes(pairs, column, tally):
+        for user_id, target_id in sorted(pairs):
+            kind = 'upvote' if rng.random() < 0.8 else 'downvote'
+            counters = tally.setdefault(target_id, [0, 0])
+            counters[kind == 'downvote'] += 1
+            yield {'user_id': user_id, column: target_id, 'vote_type': kind, 'created_at': ago(rng, now, 365)}
+    written['forum_votes'] = insert(ForumVote.__table__, votes(post_votes, 'post_id', post_tally))
+    written['forum_votes'] += insert(ForumVote.__table__, votes(comment_votes, 'comment_id', comment_tally))
+    del post_votes, comment_votes
+
+    update_by_id(ForumPost.__table__, (
+        {'row_id': p, 'upvotes': up, 'downvotes': down, 'score': up - down}
+        for p, (up, down) in post_tally.items()))
+    update_by_id(ForumPost.__table__, (
+        {'row_id': p, 'comment_count': len(ids)} for p, ids in comments_on.items()))
+    update_by_id(ForumComment.__table__, (
+        {'row_id': c, 'upvotes': up, 'downvotes': down, 'score': up - down}
+        for c, (up, down) in comment_tally.items()))
+
+    # direct messages: heavy chatters talk to a handful of regular contacts
+    chatters = Skewed(rng, user_ids, s=1.2)
+    contacts = {}
+    messages = []
+    for sender in chatters.pick(counts['direct_messages']):
+        people = contacts.setdefault(sender, [u for u in active_users.pick(8) if u != sender] or [1 + sender % n_users])
+        created = ago(rng, now, 180)
+        messages.append({
+            'sender_id': sender, 'receiver_id': rng.choice(people), 'content': text(rng, rng.randint(1, 25)),
+            'is_read': created < now - timedelta(days=2) or rng.random() < 0.5, 'created_at': created,
+        })
+    messages.sort(key=lambda m: m['created_at'])
+
+    # conversation summaries and unread totals, as Conversation.rebuild() would
+    # derive them (its per-user recount doesn't scale to a bulk load)
+    summaries, unread = {}, {}
+    for i, msg in enumerate(messages, 1):
+        msg['id'] = i
+        key = Conversation.pair(msg['sender_id'], msg['receiver_id'])
+        summary = summaries.setdefault(key, {'user_a_id': key[0], 'user_b_id': key[1], 'unread_a': 0, 'unread_b': 0})
+        summary['last_message_id'] = i
+        summary['last_message_preview'] = msg['content'][:Conversation.PREVIEW_LENGTH]
+        summary['last_message_at'] = msg['created_at']
+        if not msg['is_read']:
+            summary['unread_a' if msg['receiver_id'] == key[0] else 'unread_b'] += 1
+            unread[msg['receiver_id']] = unread.get(msg['receiver_id'], 0) + 1
+    written['direct_messages'] = insert(DirectMessage.__table__, messages)
+    written['conversations'] = insert(Conversation.__table__, summaries.values())
+    update_by_id(User.__table__, ({'row_id': u, 'unread_msg_count': n} for u, n in unread.items()))
+    del messages
+
+    return written
+
+
+def rebuild_derived():
+    """Leaderboard ranks, dashboard counters and the forum search index, via the maintenance code paths."""
+    ranked = LeaderboardEntry.rebuild()
+    EntityStats.reconcile()
+    conn = db.session.connection()
+    forum_search.create_index(conn)
+    indexed = forum_search.rebuild_index(conn)
+    return {'leaderboard': ranked, 'search_index': indexed}
+
+
+def fix_sequences():
+    """Explicit ids bypass PostgreSQL sequences; move them past the inserted rows."""
+    if db.engine.dialect.name != 'postgresql':
+        return
+    for table in db.metadata.sorted_tables:
+        if 'id' in table.c and table.c.id.primary_key and table.c.id.autoincrement:
+            db.session.execute(db.text(
+                f"SELECT setval(pg_get_serial_sequence('\"{table.name}\"', 'id'), "
+                f"COALESCE((SELECT MAX(id) FROM \"{table.name}\"), 0) + 1, false)"
+            ))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Fill a database with a synthetic, skewed dataset.')
+    parser.add_argument('--scale', choices=SCALES, default='1k')
+    parser.add_argument('--rows', type=int, help='approximate total rows (overrides --scale)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--reset', action='store_true', help='drop and recreate all tables first')
+    parser.add_argument('--json', action='store_true', help='print a single JSON object instead of a report')
+    args = parser.parse_args()
+
+    if not os.environ.get('DATABASE_URL'):
+        print("[ERROR] Set DATABASE_URL to the database to fill (e.g. sqlite:///instances/bench.db)")
+        sys.exit(1)
+
+    total = args.rows or SCALES[args.scale]
+    counts = counts_for(total)
+    app = create_app()
+    app.config['PAGE_CACHE_ENABLED'] = False
+
+    with app.app_context():
+        if not args.json:
+            print("=" * 60)
+            print("Generate Synthetic Dataset")
+            print("=" * 60)
+            print(f"[INFO] ~{total} rows into {db.engine.url.render_as_string(hide_password=True)}")
+
+        started = time.perf_counter()
+        try:
+            if args.reset:
+                db.drop_all()
+            db.create_all()
+            if db.session.query(User.id).first() is not None:
+                print("[ERROR] Database already has users; pass --reset to replace its contents")
+                sys.exit(1)
+
+            written = generate(counts, args.seed)
+            derived = rebuild_derived()
+            fix_sequences()
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            print(f"[ERROR] Generation failed: {e}")
+            raise
+
+        result = {
+            'scale': args.scale if not args.rows else None,
+            'target_rows': total,
+            'seed': args.seed,
+            'dialect': db.engine.dialect.name,
+            'rows': written,
+            'total_rows': sum(written.values()),
+            'derived': derived,
+            'seconds': round(time.perf_counter() - started, 1),
+        }
+
+    if args.json:
+        print(json.dumps(result))
+        return
+    for table, n in written.items():
+        print(f"[INFO] {table:<18} {n:>9}")
+    print(f"[INFO] Rebuilt {derived['leaderboard']} leaderboard rows, {derived['search_index']} indexed posts")
+    print(f"\n[SUCCESS] Wrote {result['total_rows']} rows in {result['seconds']} s")
+    print("=" * 60)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+Bulk CSV import of clubs, student chapters or users (see bulk_import.py).
+
+    python scripts/import_csv.py users roster.csv --default-password 'Welcome@2024'
+    python scripts/import_csv.py clubs "data/data of vnr clubs.csv"
+    python scripts/import_csv.py chapters "data/data of vnr student clubs.csv"
+
+Rows are upserted in batches and matched on club/chapter name or user email,
+so running the same file again changes nothing. Bad rows are listed with
+their line numbers (the first 1000 with --errors FILE) and don't stop the rest.
+
+User CSVs need email and name columns; username, password, mobile,
+roll number, college, branch, year, skills and coding handles are optional.
+Passwords are only set for new accounts; rows without one get
+--default-password (or DEFAULT_IMPORT_PASSWORD), otherwise they are rejected.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+
+from app import create_app
+from bulk_import import BATCH_SIZE, IMPORTERS, import_file
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Bulk import clubs, chapters or users from a CSV file.')
+    parser.add_argument('kind', choices=sorted(IMPORTERS))
+    parser.add_argument('csv_file')
+    parser.add_argument('--default-password', default=os.environ.get('DEFAULT_IMPORT_PASSWORD'),
+                        help='password for new users whose row has none')
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+    parser.add_argument('--workers', type=int, help='password hashing threads (default: CPU count + 4, max 32); hashing runs at about 4 new accounts per second per CPU core')
+    parser.add_argument('--errors', help='write every reported row error to this CSV file')
+    parser.add_argument('--json', action='store_true', help='print the report as JSON')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.csv_file):
+        print(f"[ERROR] File not found: {args.csv_file}")
+        sys.exit(1)
+    options = {}
+    if args.kind == 'users':
+        options = {'default_password': args.default_password, 'hash_workers': args.workers}
+
+    app = create_app()
+    with app.app_context():
+        if not args.json:
+            print("=" * 60)
+            print(f"Bulk Import: {args.kind}")
+            print("=" * 60)
+            print(f"[INFO] Reading {args.csv_file} in batches of {args.batch_size}")
+
+        start = time.perf_counter()
+        try:
+            report = import_file(args.kind, args.csv_file, args.batch_size, **options)
+        except ValueError as e:
+            print(f"[ERROR] {e}")
+            sys.exit(1)
+        seconds = time.perf_counter() - start
+
+    result = dict(report.as_dict(), seconds=round(seconds, 2))
+    if args.errors:
+        with open(args.errors, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['line', 'error'])
+            writer.writerows(report.errors)
+
+    if args.json:
+        print(json.dumps(result))
+    else:
+        print(f"[INFO] {report.rows} rows in {seconds:.1f}s: {report.inserted} inserted, "
+              f"{report.updated} updated, {report.unchanged} unchanged, {report.failed} failed")
+        for line, message in report.errors[:20]:
+            print(f"[ERROR] line {line}: {message}")
+        if report.failed > 20:
+            print(f"[ERROR] ... and {report.failed - 20} more" + (f" (see {args.errors})" if args.errors else ""))
+        if not report.failed:
+            print("\n[SUCCESS] Import complete")
+        print("=" * 60)
+    sys.exit(1 if report.failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+"""
+Migration script to add the denormalized comment_count column to forum_posts
+and backfill it from forum_comments.
+Safe to re-run: the backfill always recomputes counts from scratch.
+"""
+from app import create_app
+from models import db
+from sqlalchemy import text, inspect
+
+app = create_app()
+
+with app.app_context():
+    print("=" * 60)
+    print("Forum Comment Count Migration")
+    print("=" * 60)
+    
+    try:
+        columns = [c['name'] for c in inspect(db.engine).get_columns('forum_posts')]
+        
+        if 'comment_count' not in columns:
+            db.session.execute(text("ALTER TABLE forum_posts ADD COLUMN comment_count INTEGER DEFAULT 0 NOT NULL"))
+            print("[SUCCESS] Added comment_count column to forum_posts")
+        else:
+            print("[INFO] comment_count column already exists in forum_posts")
+        
+        # Backfill from the comments table
+        result = db.session.execute(text("""
+            UPDATE forum_posts SET comment_count = (
+                SELECT COUNT(*) FROM forum_comments
+                WHERE forum_comments.post_id = forum_posts.id
+            )
+        """))
+        print(f"[SUCCESS] Backfilled comment_count for {result.rowcount} posts")
+        
+        db.session.commit()
+        print("\n[SUCCESS] Migration completed successfully!")
+        
+    except Exception as e:
+        print(f"[ERROR] Migration failed: {e}")
+        db.session.rollback()
+        import traceback
+        traceback.print_exc()
+    
+    print("=" * 60)
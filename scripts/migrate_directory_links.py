@@ -0,0 +1,59 @@
+"""
+Migration script to add the normalized link columns (and updated_at) to the
+club and student_chapter tables, then backfill them from contact/website.
+Safe to re-run: links are always recomputed from the source columns.
+"""
+from app import create_app
+from models import db, Club, StudentChapter
+from sqlalchemy import text, inspect
+
+app = create_app()
+
+NEW_COLUMNS = {
+    Club: [
+        ('instagram_url', 'VARCHAR(300)'),
+        ('youtube_url', 'VARCHAR(300)'),
+        ('contact_url', 'VARCHAR(300)'),
+        ('website_url', 'VARCHAR(300)'),
+        ('updated_at', 'TIMESTAMP'),
+    ],
+    StudentChapter: [
+        ('contact_url', 'VARCHAR(300)'),
+        ('updated_at', 'TIMESTAMP'),
+    ],
+}
+
+with app.app_context():
+    print("=" * 60)
+    print("Clubs / Chapters Directory Links Migration")
+    print("=" * 60)
+    
+    try:
+        for model, new_columns in NEW_COLUMNS.items():
+            table = model.__table__.name
+            columns = [c['name'] for c in inspect(db.engine).get_columns(table)]
+            for name, ddl_type in new_columns:
+                if name not in columns:
+                    db.session.execute(text(f'ALTER TABLE {table} ADD COLUMN {name} {ddl_type}'))
+                    print(f"[SUCCESS] Added {table}.{name}")
+                else:
+                    print(f"[INFO] {table}.{name} already exists")
+        db.session.commit()
+        
+        for model in NEW_COLUMNS:
+            rows = model.query.all()
+            for row in rows:
+                row.normalize_links()
+                row.updated_at = row.updated_at or row.created_at
+            print(f"[SUCCESS] Normalized links for {len(rows)} {model.__table__.name} rows")
+        
+        db.session.commit()
+        print("\n[SUCCESS] Migration completed successfully!")
+        
+    except Exception as e:
+        print(f"[ERROR] Migration failed: {e}")
+        db.session.rollback()
+        import traceback
+        traceback.print_exc()
+    
+    print("=" * 60)
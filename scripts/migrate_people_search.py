@@ -0,0 +1,42 @@
+"""
+Migration script for people search:
+1. Creates the skills / user_skills tables
+2. Backfills normalized skills from every user's free-text skills field
+3. On PostgreSQL, enables pg_trgm and adds trigram indexes on name/username
+Safe to re-run.
+"""
+from app import create_app
+from models import db, Skill, user_skills
+import people_search
+
+app = create_app()
+
+with app.app_context():
+    print("=" * 60)
+    print("People Search Migration")
+    print("=" * 60)
+    
+    try:
+        Skill.__table__.create(db.engine, checkfirst=True)
+        user_skills.create(db.engine, checkfirst=True)
+        print("[SUCCESS] skills tables created/verified")
+        
+        count = people_search.rebuild_skills()
+        print(f"[SUCCESS] Normalized skills for {count} users")
+        
+        indexes = people_search.create_indexes(db.session.connection())
+        if indexes:
+            print(f"[SUCCESS] Trigram indexes created/verified: {', '.join(indexes)}")
+        else:
+            print("[INFO] Not PostgreSQL — skipping trigram indexes")
+        
+        db.session.commit()
+        print("\n[SUCCESS] Migration completed successfully!")
+        
+    except Exception as e:
+        print(f"[ERROR] Migration failed: {e}")
+        db.session.rollback()
+        import traceback
+        traceback.print_exc()
+    
+    print("=" * 60)
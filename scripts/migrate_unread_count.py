@@ -0,0 +1,39 @@
+"""
+Migration script to add the denormalized unread_msg_count column to the
+user table and backfill it from direct_messages.
+Safe to re-run: the backfill always recomputes counts from scratch.
+"""
+from app import create_app
+from models import db, User
+from sqlalchemy import text, inspect
+
+app = create_app()
+
+with app.app_context():
+    print("=" * 60)
+    print("Unread Message Count Migration")
+    print("=" * 60)
+    
+    try:
+        columns = [c['name'] for c in inspect(db.engine).get_columns('user')]
+        
+        if 'unread_msg_count' not in columns:
+            # "user" is quoted: it's a reserved word on PostgreSQL
+            db.session.execute(text('ALTER TABLE "user" ADD COLUMN unread_msg_count INTEGER DEFAULT 0 NOT NULL'))
+            print("[SUCCESS] Added unread_msg_count column")
+        else:
+            print("[INFO] unread_msg_count column already exists")
+        
+        updated = User.recount_unread_messages()
+        print(f"[SUCCESS] Backfilled unread_msg_count for {updated} users")
+        
+        db.session.commit()
+        print("\n[SUCCESS] Migration completed successfully!")
+        
+    except Exception as e:
+        print(f"[ERROR] Migration failed: {e}")
+        db.session.rollback()
+        import traceback
+        traceback.print_exc()
+    
+    print("=" * 60)
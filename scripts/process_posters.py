@@ -0,0 +1,64 @@
+"""
+Builds the resized WebP/JPEG variants (see posters.py) for every poster
+already on disk: the images shipped in static/images and any event poster
+uploaded before the pipeline existed. Uploads still stored under
+static/images/posters are first moved to POSTER_ORIGINALS_FOLDER so their
+raw bytes stop being served. Runs synchronously; posters that already have
+a manifest are skipped unless --force is given.
+"""
+import os
+import sys
+
+from app import create_app
+from models import Event
+import posters
+
+SHIPPED_POSTERS = [
+    'wow-poster.png',
+    'gameexpo-poster.png',
+    'vj-hackathon-2025.png',
+    'software-hackathon-2025.png',
+]
+
+app = create_app()
+
+with app.app_context():
+    print("=" * 60)
+    print("Process Event Posters")
+    print("=" * 60)
+
+    if posters.pillow() is None:
+        print("[ERROR] Pillow is not installed (pip install Pillow)")
+        sys.exit(1)
+
+    force = '--force' in sys.argv
+    try:
+        names = SHIPPED_POSTERS + sorted({p for (p,) in Event.query.with_entities(Event.poster) if p})
+    except Exception as e:
+        print(f"[INFO] Could not read event posters ({e}); processing shipped images only")
+        names = SHIPPED_POSTERS
+
+    out_dir = os.path.join(posters.images_folder(), posters.POSTER_DIR)
+    done = failed = 0
+    for name in dict.fromkeys(names):
+        if posters.move_legacy_original(name):
+            print(f"[INFO] Moved original out of static/: {name}")
+        source = posters.source_path(name)
+        if not os.path.exists(source):
+            print(f"[INFO] Missing on disk, skipped: {name}")
+            continue
+        if not force and os.path.exists(posters.manifest_path(source)):
+            continue
+        try:
+            manifest = posters.process_poster(source, out_dir)
+            before = os.path.getsize(source) // 1024
+            smallest = min(os.path.getsize(os.path.join(posters.images_folder(), v['file']))
+                           for v in manifest['variants']) // 1024
+            print(f"[SUCCESS] {name}: {len(manifest['variants'])} variants ({before} KB -> card {smallest} KB)")
+            done += 1
+        except Exception as e:
+            print(f"[ERROR] {name}: {e}")
+            failed += 1
+
+    print(f"\n[INFO] Processed {done} posters, {failed} failed")
+    print("=" * 60)
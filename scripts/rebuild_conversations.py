@@ -0,0 +1,28 @@
+"""
+Rebuilds the conversations summary table (DM inbox) from direct_messages.
+Creates the table if it doesn't exist yet. Safe to re-run at any time,
+e.g. after restoring a backup or if inbox counters look wrong.
+"""
+from app import create_app
+from models import db, Conversation
+
+app = create_app()
+
+with app.app_context():
+    print("=" * 60)
+    print("Rebuild Conversation Summaries")
+    print("=" * 60)
+
+    try:
+        Conversation.__table__.create(db.engine, checkfirst=True)
+        count = Conversation.rebuild()
+        db.session.commit()
+        print(f"[SUCCESS] Rebuilt {count} conversations from direct_messages")
+
+    except Exception as e:
+        print(f"[ERROR] Rebuild failed: {e}")
+        db.session.rollback()
+        import traceback
+        traceback.print_exc()
+
+    print("=" * 60)
@@ -0,0 +1,42 @@
+"""
+Creates the leaderboard tables if needed, seeds the default platforms and
+rebuilds the materialized leaderboard (scores, totals and ranks) from
+platform_scores. Safe to re-run; use it after bulk score imports or if
+ranks ever drift.
+"""
+from app import create_app
+from models import db, Platform, PlatformScore, LeaderboardEntry
+
+DEFAULT_PLATFORMS = [
+    ('hackerrank', 'HackerRank'),
+    ('codechef', 'CodeChef'),
+    ('leetcode', 'LeetCode'),
+]
+
+app = create_app()
+
+with app.app_context():
+    print("=" * 60)
+    print("Rebuild Leaderboard")
+    print("=" * 60)
+
+    try:
+        for model in (Platform, PlatformScore, LeaderboardEntry):
+            model.__table__.create(db.engine, checkfirst=True)
+
+        for slug, name in DEFAULT_PLATFORMS:
+            if not Platform.query.filter_by(slug=slug).first():
+                db.session.add(Platform(slug=slug, name=name))
+                print(f"[SUCCESS] Added platform {name}")
+
+        count = LeaderboardEntry.rebuild()
+        db.session.commit()
+        print(f"[SUCCESS] Ranked {count} users")
+
+    except Exception as e:
+        print(f"[ERROR] Rebuild failed: {e}")
+        db.session.rollback()
+        import traceback
+        traceback.print_exc()
+
+    print("=" * 60)
@@ -0,0 +1,32 @@
+"""
+Recounts the admin dashboard counters (EntityStats) from the tables, fixing
+drift from bulk writes that bypass the session. The dashboard also does this
+by itself every STATS_RECONCILE_SECONDS; run it from cron for a tighter bound
+or after bulk changes. Safe to re-run.
+"""
+from app import create_app
+from models import db, EntityStats
+
+app = create_app()
+
+with app.app_context():
+    print("=" * 60)
+    print("Reconcile Dashboard Counters")
+    print("=" * 60)
+
+    try:
+        EntityStats.__table__.create(db.engine, checkfirst=True)
+        stats = EntityStats.reconcile()
+        db.session.commit()
+        for name in EntityStats.COUNTED:
+            weekly = f" (+{stats.this_week(name)} this week)" if name in EntityStats.WEEKLY else ""
+            print(f"[INFO] {name:<10} {getattr(stats, name)}{weekly}")
+        print("[SUCCESS] Counters recounted")
+
+    except Exception as e:
+        print(f"[ERROR] Reconcile failed: {e}")
+        db.session.rollback()
+        import traceback
+        traceback.print_exc()
+
+    print("=" * 60)
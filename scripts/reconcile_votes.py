@@ -0,0 +1,26 @@
+"""
+Recomputes upvotes, downvotes and score on every forum post and comment from
+the forum_votes table, fixing any counter drift. Safe to re-run.
+"""
+from app import create_app
+from models import db, ForumVote
+
+app = create_app()
+
+with app.app_context():
+    print("=" * 60)
+    print("Reconcile Forum Vote Counters")
+    print("=" * 60)
+
+    try:
+        posts, comments = ForumVote.reconcile()
+        db.session.commit()
+        print(f"[SUCCESS] Fixed counters on {posts} posts and {comments} comments")
+
+    except Exception as e:
+        print(f"[ERROR] Reconcile failed: {e}")
+        db.session.rollback()
+        import traceback
+        traceback.print_exc()
+
+    print("=" * 60)
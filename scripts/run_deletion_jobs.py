@@ -0,0 +1,32 @@
+"""
+Runs background user deletions (UserDeletionJob) in this process: jobs that
+are pending, failed, or stopped making progress because their worker died.
+Where background threads don't outlive the request (serverless), schedule
+this from cron. Each job continues where it left off; safe to re-run.
+"""
+from app import create_app
+from models import db, UserDeletionJob
+import user_deletion
+
+app = create_app()
+
+with app.app_context():
+    print("=" * 60)
+    print("Run User Deletion Jobs")
+    print("=" * 60)
+
+    UserDeletionJob.__table__.create(db.engine, checkfirst=True)
+    jobs = [job for job in UserDeletionJob.query.filter(UserDeletionJob.status != 'done')
+            .order_by(UserDeletionJob.id) if job.resumable]
+    if not jobs:
+        print("[INFO] No jobs to run")
+
+    for job in jobs:
+        print(f"[INFO] Deleting {job.username} (#{job.user_id}): {job.rows_done}/{job.rows_total} rows so far")
+        job = user_deletion.run_job(job.id)
+        if job.status == 'done':
+            print(f"[SUCCESS] {job.username} deleted ({job.rows_done} rows)")
+        else:
+            print(f"[ERROR] {job.username}: {job.error}")
+
+    print("=" * 60)
@@ -0,0 +1,186 @@
+"""
+Upload storage.
+
+Uploaded files (resumes, certificates) are stored as content-addressed blobs:
+
+    blobs/<first 2 hex chars>/<sha256>.<ext>
+
+The upload is streamed in chunks into a temporary file while it is hashed,
+so memory use doesn't grow with file size, and a blob that already exists
+(the same certificate uploaded twice) is not stored again. The blob key is
+what goes into User.resume_filename / certificates_filename. Older rows hold
+a bare filename saved before blobs existed; storage_for() sends those to
+UPLOAD_FOLDER whichever backend is configured.
+
+Backends, chosen by UPLOAD_STORAGE:
+- 'local': files under UPLOAD_FOLDER, served by /uploads/<key>
+- 's3':    any S3-compatible bucket (AWS, R2, MinIO); /uploads/<key>
+           redirects to a short-lived presigned URL. Needs boto3.
+"""
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+
+from flask import current_app, redirect, send_from_directory
+
+CHUNK_SIZE = 64 * 1024
+BLOB_PREFIX = 'blobs/'
+
+CONTENT_TYPES = {
+    'pdf': 'application/pdf',
+    'png': 'image/png',
+    'jpg': 'image/jpeg',
+    'jpeg': 'image/jpeg',
+}
+
+
+class StorageError(Exception):
+    """The backend could not store or find a blob."""
+
+
+class LocalStorage:
+    """Blobs as files under a root directory."""
+    name = 'local'
+
+    def __init__(self, root):
+        self.root = root
+
+    def _path(self, key):
+        path = os.path.abspath(os.path.join(self.root, key))
+        if not path.startswith(os.path.abspath(self.root) + os.sep):
+            raise StorageError(f"Invalid key: {key}")
+        return path
+
+    def exists(self, key):
+        return os.path.isfile(self._path(key))
+
+    def save(self, key, fileobj, content_type=None):
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{os.getpid()}-{threading.get_ident()}.tmp"  # unique per writer thread
+            with open(tmp, 'wb') as out:
+                shutil.copyfileobj(fileobj, out, CHUNK_SIZE)
+            os.replace(tmp, path)
+        except OSError as e:
+            raise StorageError(f"Could not write {key}: {e}") from e
+
+    def delete(self, key):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def response(self, key):
+        return send_from_directory(self.root, key, as_attachment=False)
+
+
+class S3Storage:
+    """Blobs as objects in an S3-compatible bucket, served via presigned URLs."""
+    name = 's3'
+
+    def __init__(self, bucket, prefix='', client=None, url_expires=300, **client_options):
+        # boto3 is imported here rather than at module level: it is only needed
+        # for this backend and adds noticeably to cold-start time
+        try:
+            from botocore.exceptions import BotoCoreError, ClientError
+        except ImportError:
+            BotoCoreError = ClientError = Exception
+        if client is None:
+            try:
+                import boto3
+            except ImportError:
+                raise StorageError("UPLOAD_STORAGE='s3' needs boto3 (pip install boto3)")
+            client = boto3.client('s3', **client_options)
+        # service errors and connection/credential failures alike surface as StorageError
+        self.client_error = (ClientError, BotoCoreError)
+        self.client = client
+        self.bucket = bucket
+        self.prefix = prefix
+        self.url_expires = url_expires
+
+    def _key(self, key):
+        return self.prefix + key
+
+    def exists(self, key):
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self._key(key))
+            return True
+        except self.client_error as e:
+            if getattr(e, 'response', {}).get('Error', {}).get('Code') in ('404', 'NoSuchKey', 'NotFound'):
+                return False
+            raise StorageError(f"Could not look up {key}: {e}") from e
+
+    def save(self, key, fileobj, content_type=None):
+        extra = {'ContentType': content_type} if content_type else {}
+        try:
+            # upload_fileobj reads in parts (multipart above 8 MB); nothing is buffered whole
+            self.client.upload_fileobj(fileobj, self.bucket, self._key(key), ExtraArgs=extra)
+        except self.client_error as e:
+            raise StorageError(f"Could not upload {key}: {e}") from e
+
+    def delete(self, key):
+        try:
+            self.client.delete_object(Bucket=self.bucket, Key=self._key(key))
+        except self.client_error as e:
+            raise StorageError(f"Could not delete {key}: {e}") from e
+
+    def response(self, key):
+        url = self.client.generate_presigned_url(
+            'get_object', Params={'Bucket': self.bucket, 'Key': self._key(key)}, ExpiresIn=self.url_expires
+        )
+        return redirect(url)
+
+
+def create_storage(config):
+    """Build the backend described by the app config."""
+    backend = config.get('UPLOAD_STORAGE', 'local')
+    if backend == 'local':
+        return LocalStorage(config['UPLOAD_FOLDER'])
+    if backend == 's3':
+        options = {k: v for k, v in {
+            'endpoint_url': config.get('UPLOAD_S3_ENDPOINT_URL'),
+            'region_name': config.get('UPLOAD_S3_REGION'),
+        }.items() if v}
+        return S3Storage(config['UPLOAD_S3_BUCKET'], prefix=config.get('UPLOAD_S3_PREFIX', ''),
+                         url_expires=config.get('UPLOAD_URL_EXPIRES', 300), **options)
+    raise StorageError(f"Unknown UPLOAD_STORAGE: {backend}")
+
+
+def get_storage():
+    """The current app's upload backend, created on first use."""
+    backends = current_app.extensions
+    if 'upload_storage' not in backends:
+        backends['upload_storage'] = create_storage(current_app.config)
+    return backends['upload_storage']
+
+
+def storage_for(key):
+    """The backend holding key: blobs in the configured one, legacy bare filenames locally."""
+    if key.startswith(BLOB_PREFIX):
+        return get_storage()
+    backends = current_app.extensions
+    if 'legacy_upload_storage' not in backends:
+        backends['legacy_upload_storage'] = LocalStorage(current_app.config['UPLOAD_FOLDER'])
+    return backends['legacy_upload_storage']
+
+
+def store_upload(storage, file_storage):
+    """
+    Stream an uploaded file into storage under its content hash and return
+    the blob key. Identical content is only stored once.
+    """
+    ext = file_storage.filename.rsplit('.', 1)[-1].lower() if '.' in file_storage.filename else 'bin'
+    digest = hashlib.sha256()
+    with tempfile.TemporaryFile() as tmp:
+        for chunk in iter(lambda: file_storage.stream.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+            tmp.write(chunk)
+        hexdigest = digest.hexdigest()
+        key = f"{BLOB_PREFIX}{hexdigest[:2]}/{hexdigest}.{ext}"
+        if not storage.exists(key):
+            tmp.seek(0)
+            storage.save(key, tmp, CONTENT_TYPES.get(ext))
+    return key
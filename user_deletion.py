@@ -0,0 +1,279 @@
+"""
+Deleting a user and everything that depends on them.
+
+delete_user() removes the account with set-based statements over every
+dependent table, inside the caller's transaction:
+
+- direct messages and conversations, team messages
+- forum votes, comments (the user's, and all comments on the user's posts)
+  and posts, with the votes on them
+- projects, registrations, team invites and join requests
+- team memberships; teams the user led pass to their lowest-id remaining
+  member, or are deleted if nobody else is in them
+- skill tags, platform scores and the leaderboard row
+
+The denormalized counters that point at those rows are corrected in the
+same transaction: partners' unread_msg_count, posts' comment_count, vote
+tallies, leaderboard ranks, the forum search index and EntityStats.
+
+Users with more than USER_DELETE_SYNC_LIMIT rows of content are deleted by
+a UserDeletionJob instead, so one admin click doesn't hold locks for
+seconds. The account is locked first; a background thread then deletes the
+bulky content USER_DELETE_CHUNK_SIZE rows per transaction, recording
+progress on the job row, and finally runs delete_user() for what is left.
+Each chunk is "the next N rows of this user's X", so an interrupted job
+simply carries on when it is run again (the admin jobs page, or
+scripts/run_deletion_jobs.py where background threads don't survive the
+request, e.g. on serverless).
+"""
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from flask import current_app
+from sqlalchemy import or_
+
+import forum_search
+import storage
+from models import (
+    db, user_skills, team_members, User, Project, Event, Registration, Team, TeamInvite, TeamJoinRequest,
+    TeamMessage, ForumPost, ForumComment, ForumVote, DirectMessage, Conversation, PlatformScore,
+    LeaderboardEntry, EntityStats, UserDeletionJob
+)
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='user-deletion')
+
+
+class Purge:
+    """What a deletion transaction touched that lives outside the database."""
+
+    def __init__(self):
+        self.blobs = set()         # upload keys the deleted user referenced
+
+    def committed(self):
+        """Drop uploads nobody references any more; call after the commit."""
+        if not self.blobs:
+            return
+        referenced = {key for row in db.session.query(User.resume_filename, User.certificates_filename)
+                      .filter(or_(User.resume_filename.in_(self.blobs), User.certificates_filename.in_(self.blobs)))
+                      for key in row}
+        for key in self.blobs - referenced:
+            try:
+                storage.storage_for(key).delete(key)
+            except storage.StorageError as e:
+                current_app.logger.warning("Could not delete upload %s: %s", key, e)
+
+
+# -------------------------
+# Bulky content, deleted in chunks by jobs
+# -------------------------
+def _delete_direct_messages(ids, user_id, purge):
+    # conversations point at their last message, so they go first
+    Conversation.query.filter(or_(Conversation.user_a_id == user_id, Conversation.user_b_id == user_id))\
+        .delete(synchronize_session=False)
+    chunk = DirectMessage.id.in_(ids)
+    # messages the user sent that are still unread count in the receivers' navbar badge
+    unsent = (chunk, DirectMessage.sender_id == user_id, DirectMessage.is_read == False)  # noqa: E712
+    receivers = {r for (r,) in db.session.query(DirectMessage.receiver_id).filter(*unsent).distinct()}
+    if receivers:
+        unread = db.select(db.func.count(DirectMessage.id))\
+            .where(*unsent, DirectMessage.receiver_id == User.id).scalar_subquery()
+        User.query.filter(User.id.in_(receivers))\
+            .update({User.unread_msg_count: User.unread_msg_count - unread}, synchronize_session=False)
+    DirectMessage.query.filter(chunk).delete(synchronize_session=False)
+
+
+def _delete_team_messages(ids, user_id, purge):
+    TeamMessage.query.filter(TeamMessage.id.in_(ids)).delete(synchronize_session=False)
+
+
+def _delete_votes(ids, user_id, purge):
+    targets = db.session.query(ForumVote.post_id, ForumVote.comment_id).filter(ForumVote.id.in_(ids)).all()
+    ForumVote.query.filter(ForumVote.id.in_(ids)).delete(synchronize_session=False)
+    ForumVote.reconcile(post_ids={p for p, _ in targets if p is not None},
+                        comment_ids={c for _, c in targets if c is not None})
+
+
+def _delete_comments(ids, user_id, purge):
+    chunk = ForumComment.id.in_(ids)
+    post_ids = {p for (p,) in db.session.query(ForumComment.post_id).filter(chunk).distinct()}
+    ForumVote.query.filter(ForumVote.comment_id.in_(ids)).delete(synchronize_session=False)
+    # other people's replies stay, as top-level comments
+    ForumComment.query.filter(ForumComment.parent_id.in_(ids), ~chunk)\
+        .update({ForumComment.parent_id: None}, synchronize_session=False)
+    removed = db.select(db.func.count(ForumComment.id))\
+        .where(chunk, ForumComment.post_id == ForumPost.id).scalar_subquery()
+    ForumPost.query.filter(ForumPost.id.in_(post_ids))\
+        .update({ForumPost.comment_count: ForumPost.comment_count - removed}, synchronize_session=False)
+    ForumComment.query.filter(chunk).delete(synchronize_session=False)
+    forum_search.update_index(db.session.connection(), removed_comments=ids)
+
+
+def _delete_posts(ids, user_id, purge):
+    # comments on these posts went in the comments step; this catches any written since
+    late = [c for (c,) in db.session.query(ForumComment.id).filter(ForumComment.post_id.in_(ids))]
+    ForumVote.query.filter(or_(ForumVote.post_id.in_(ids), ForumVote.comment_id.in_(late)))\
+        .delete(synchronize_session=False)
+    ForumComment.query.filter(ForumComment.post_id.in_(ids)).delete(synchronize_session=False)
+    ForumPost.query.filter(ForumPost.id.in_(ids)).delete(synchronize_session=False)
+    forum_search.update_index(db.session.connection(), removed_posts=ids, removed_comments=late)
+
+
+Step = namedtuple('Step', ['name', 'model', 'rows_of', 'delete'])
+
+# In order: votes before the comments and posts they may point at, comments before posts
+STEPS = [
+    Step('direct messages', DirectMessage,
+         lambda user_id: or_(DirectMessage.sender_id == user_id, DirectMessage.receiver_id == user_id),
+         _delete_direct_messages),
+    Step('team messages', TeamMessage, lambda user_id: TeamMessage.sender_id == user_id, _delete_team_messages),
+    Step('forum votes', ForumVote, lambda user_id: ForumVote.user_id == user_id, _delete_votes),
+    Step('forum comments', ForumComment,
+         lambda user_id: or_(ForumComment.author_id == user_id, ForumComment.post_id.in_(
+             db.select(ForumPost.id).where(ForumPost.author_id == user_id))),
+         _delete_comments),
+    Step('forum posts', ForumPost, lambda user_id: ForumPost.author_id == user_id, _delete_posts),
+]
+
+
+def _run_step(step, user_id, purge, limit=None):
+    """Delete the user's next `limit` rows for a step (all of them if limit is None); returns how many."""
+    query = db.session.query(step.model.id).filter(step.rows_of(user_id)).order_by(step.model.id)
+    if limit:
+        query = query.limit(limit)
+    ids = [row_id for (row_id,) in query]
+    if ids:
+        step.delete(ids, user_id, purge)
+    return len(ids)
+
+
+def footprint(user_id):
+    """{step name: rows} the chunked steps would delete, counted in one query."""
+    counts = [db.select(db.func.count()).select_from(step.model).where(step.rows_of(user_id))
+              .scalar_subquery().label(step.name) for step in STEPS]
+    return dict(db.session.execute(db.select(*counts)).one()._mapping)
+
+
+# -------------------------
+# Everything else
+# -------------------------
+def _leave_teams(user_id):
+    led = [team_id for (team_id,) in db.session.query(Team.id).filter(Team.leader_id == user_id)]
+    if led:
+        successor = db.select(db.func.min(team_members.c.user_id))\
+            .where(team_members.c.team_id == Team.id, team_members.c.user_id != user_id).scalar_subquery()
+        Team.query.filter(Team.id.in_(led)).update({Team.leader_id: successor}, synchronize_session=False)
+        empty = [team_id for (team_id,) in
+                 db.session.query(Team.id).filter(Team.id.in_(led), Team.leader_id.is_(None))]
+        if empty:
+            for model in (TeamMessage, TeamInvite, TeamJoinRequest):
+                model.query.filter(model.team_id.in_(empty)).delete(synchronize_session=False)
+            db.session.execute(team_members.delete().where(team_members.c.team_id.in_(empty)))
+            EntityStats.add(EntityStats.removal(Team, Team.id.in_(empty)))
+            Team.query.filter(Team.id.in_(empty)).delete(synchronize_session=False)
+    db.session.execute(team_members.delete().where(team_members.c.user_id == user_id))
+
+
+def delete_user(user_id):
+    """
+    Delete a user and every row that depends on them in the current
+    transaction. The caller commits, then calls committed() on the returned
+    Purge.
+    """
+    purge = Purge()
+    Conversation.query.filter(or_(Conversation.user_a_id == user_id, Conversation.user_b_id == user_id))\
+        .delete(synchronize_session=False)
+    for step in STEPS:
+        _run_step(step, user_id, purge)
+
+    EntityStats.add(EntityStats.removal(Project, Project.owner_id == user_id))
+    Project.query.filter_by(owner_id=user_id).delete(synchronize_session=False)
+    Registration.query.filter_by(user_id=user_id).delete(synchronize_session=False)
+    TeamInvite.query.filter(or_(TeamInvite.user_id == user_id, TeamInvite.sender_id == user_id))\
+        .delete(synchronize_session=False)
+    TeamJoinRequest.query.filter_by(sender_id=user_id).delete(synchronize_session=False)
+    _leave_teams(user_id)
+    Event.query.filter_by(created_by=user_id).update({Event.created_by: None}, synchronize_session=False)
+    db.session.execute(user_skills.delete().where(user_skills.c.user_id == user_id))
+
+    # everyone ranked below the user moves up one (competition ranking)
+    PlatformScore.query.filter_by(user_id=user_id).delete(synchronize_session=False)
+    total = db.session.query(LeaderboardEntry.total_score).filter_by(user_id=user_id).scalar()
+    if total is not None:
+        LeaderboardEntry.query.filter(LeaderboardEntry.total_score < total)\
+            .update({LeaderboardEntry.rank: LeaderboardEntry.rank - 1}, synchronize_session=False)
+        LeaderboardEntry.query.filter_by(user_id=user_id).delete(synchronize_session=False)
+
+    uploads = db.session.query(User.resume_filename, User.certificates_filename).filter_by(id=user_id).first()
+    purge.blobs = {key for key in uploads or () if key}
+    EntityStats.add(EntityStats.removal(User, User.id == user_id))
+    User.query.filter_by(id=user_id).delete(synchronize_session=False)
+    return purge
+
+
+# -------------------------
+# Background jobs
+# -------------------------
+def start_job(user, requested_by, counts=None):
+    """
+    Lock the account, record a UserDeletionJob and hand it to the background
+    worker. Commits; returns the job.
+    """
+    counts = counts if counts is not None else footprint(user.id)
+    job = UserDeletionJob(user_id=user.id, username=user.username, requested_by=requested_by,
+                          rows_total=sum(counts.values()))
+    user.is_banned = True
+    user.password_hash = User.LOCKED_PASSWORD
+    db.session.add(job)
+    db.session.commit()
+    submit(job.id)
+    return job
+
+
+def submit(job_id):
+    """Run a job on the background worker (one job at a time)."""
+    return _executor.submit(_run_in_app, current_app._get_current_object(), job_id)
+
+
+def _run_in_app(app, job_id):
+    with app.app_context():
+        try:
+            run_job(job_id)
+        finally:
+            db.session.remove()
+
+
+def run_job(job_id, chunk_size=None):
+    """
+    Work a job through to the end, committing after every chunk. Safe to call
+    again on a job that failed or was interrupted. Returns the job.
+    """
+    chunk_size = chunk_size or current_app.config.get('USER_DELETE_CHUNK_SIZE', 500)
+    job = db.session.get(UserDeletionJob, job_id)
+    if job is None or job.status == 'done':
+        return job
+    job.status, job.error = 'running', None
+    db.session.commit()
+    try:
+        for step in STEPS:
+            job.step = step.name
+            while True:
+                purge = Purge()
+                deleted = _run_step(step, job.user_id, purge, limit=chunk_size)
+                job.rows_done += deleted
+                db.session.commit()
+                purge.committed()
+                if deleted < chunk_size:
+                    break
+        job.step = 'account'
+        purge = delete_user(job.user_id)
+        job.status, job.step, job.finished_at = 'done', None, datetime.utcnow()
+        db.session.commit()
+        purge.committed()
+    except Exception as e:
+        step = job.step
+        db.session.rollback()
+        current_app.logger.exception("User deletion job %s failed", job_id)
+        job.status, job.step, job.error = 'failed', step, f"{type(e).__name__}: {e}"[:1000]
+        db.session.commit()
+    return job